@@ -0,0 +1,198 @@
+"""
+Content-addressed analysis cache for PaintMyPoem
+Keeps poem analyses in a bounded in-process LRU backed by a size-capped SQLite store
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from poem_analysis import ANALYZER_VERSION, PoemAnalysis
+from metrics import count
+
+# Per-user cache directory, so default caches never land in whatever directory the process starts in.
+CACHE_DIR = os.environ.get("PAINTMYPOEM_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "paintmypoem")
+DEFAULT_CACHE_PATH = os.environ.get("PAINTMYPOEM_ANALYSIS_CACHE") or os.path.join(CACHE_DIR, "analysis_cache.sqlite")
+# Disk hits whose access time is buffered before it is written, so reads do not commit one by one.
+TOUCH_BATCH = 256
+
+def normalize_poem(text: str) -> str:
+    """Normalize line endings and surrounding whitespace so trivially different copies share a key.
+    Args:
+        text (str): Poem text.
+    Returns:
+        str: Normalized text.
+    """
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+def poem_hash(text: str) -> str:
+    """Cache key for a poem: a hash of the analyzer version and the normalized text.
+    Args:
+        text (str): Poem text.
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.sha256(f"{ANALYZER_VERSION}\0{normalize_poem(text)}".encode("utf-8")).hexdigest()
+
+class AnalysisCache:
+    """Two-level poem analysis cache: in-memory LRU in front of an on-disk SQLite store"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """Open (or create) a cache.
+        Args:
+            path (str): SQLite file for the persistent store, or None for memory only. Its directory is created if needed.
+            max_entries (int): Capacity of the in-memory LRU.
+            max_bytes (int): Size budget of the on-disk store; oldest entries are evicted beyond it.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._db = None
+        self._disk_bytes = 0
+        self._touched = {}
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, data TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+            self._db.commit()
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+
+    def get_analysis(self, text: str) -> PoemAnalysis:
+        """Return the analysis for a poem, running NLP only on a cache miss.
+        Args:
+            text (str): Poem text.
+        Returns:
+            PoemAnalysis: Analysis of the poem.
+        """
+        key = poem_hash(text)
+        with self._lock:
+            snapshot = self._memory.get(key)
+            if snapshot is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                count("cache_lookups_total", cache="analysis", result="hit")
+                return PoemAnalysis.from_snapshot(text, snapshot)
+            snapshot = self._load(key)
+            if snapshot is not None:
+                self._counters["disk_hits"] += 1
+                count("cache_lookups_total", cache="analysis", result="disk_hit")
+                self._remember(key, snapshot)
+                return PoemAnalysis.from_snapshot(text, snapshot)
+            self._counters["misses"] += 1
+            count("cache_lookups_total", cache="analysis", result="miss")
+
+        analysis = PoemAnalysis(text)
+        snapshot = analysis.snapshot()
+        with self._lock:
+            self._remember(key, snapshot)
+            self._store(key, snapshot)
+        return analysis
+
+    def _remember(self, key: str, snapshot: dict) -> None:
+        self._memory[key] = snapshot
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> dict:
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT data FROM analyses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        # The in-memory LRU already absorbs repeat hits; disk hits only refresh eviction order, so
+        # their access times are written in batches and at most TOUCH_BATCH of them are lost on exit.
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            self._write_touches()
+            self._db.commit()
+        return json.loads(row[0])
+
+    def _write_touches(self) -> None:
+        if self._touched:
+            self._db.executemany("UPDATE analyses SET last_used = ? WHERE key = ?", [(used, key) for key, used in self._touched.items()])
+            self._touched.clear()
+
+    def _store(self, key: str, snapshot: dict) -> None:
+        if self._db is None:
+            return
+        data = json.dumps(snapshot)
+        size = len(key) + len(data)
+        self._write_touches()
+        cursor = self._db.execute("INSERT OR IGNORE INTO analyses (key, data, size, last_used) VALUES (?, ?, ?, ?)", (key, data, size, time.time()))
+        self._disk_bytes += size if cursor.rowcount else 0
+        self._db.commit()
+        if self._disk_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until the store is back under 90% of its budget."""
+        self._write_touches()
+        self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        while self._disk_bytes > target:
+            rows = self._db.execute("SELECT key, size FROM analyses ORDER BY last_used LIMIT 256").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM analyses WHERE key = ?", (key,))
+                self._disk_bytes -= size
+                self._counters["evictions"] += 1
+                if self._disk_bytes <= target:
+                    break
+        self._db.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current sizes.
+        Returns:
+            dict: Counters, 'hit_rate', 'memory_entries' and 'disk_bytes'.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_bytes
+            return stats
+
+    def clear(self) -> None:
+        """Remove every cached analysis from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM analyses")
+                self._db.commit()
+            self._disk_bytes = 0
+
+    def close(self) -> None:
+        """Write buffered access times and close the on-disk store."""
+        with self._lock:
+            if self._db is not None:
+                self._write_touches()
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+_default_cache = None
+
+def get_default_cache() -> AnalysisCache:
+    """Process-wide analysis cache stored at DEFAULT_CACHE_PATH.
+    Returns:
+        AnalysisCache: Shared cache instance.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AnalysisCache()
+    return _default_cache
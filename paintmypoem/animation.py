@@ -0,0 +1,293 @@
+"""
+Animated output for PaintMyPoem
+Particles drift and shapes pulse over a looping clip. The backdrop is drawn once; each frame only
+repaints the dirty rectangles around moving items, then the clip is written as a GIF, an APNG or
+a directory of PNG frames.
+
+Usage:
+    python animation.py poem.txt poem.gif --frames 60 --fps 30 --seed 7
+"""
+
+import argparse
+import math
+import os
+import random
+import struct
+import zlib
+
+import numpy as np
+import pygame
+from PIL import Image
+
+from art_generator import compose_scene, draw_backdrop, draw_foreground
+from image_renderer import surface_to_image
+from layout import length_to_pixels, scale_length, to_pixels
+from metrics import span, count
+from tiled_renderer import filter_rows_up, png_chunk
+
+ANIMATION_FORMATS = ["gif", "apng", "frames"]
+# Largest change of a shape's size during a pulse, as a fraction of its size.
+PULSE_AMOUNT = 0.06
+# Largest particle drift from its resting position, in design-canvas pixels.
+DRIFT_DISTANCE = 12
+# Frame directories are intermediate files for video tools, so they favor encode speed over size.
+FRAME_COMPRESS_LEVEL = 1
+
+def animation_format(output_path: str) -> str:
+    """Output format implied by a path: '.gif', '.png'/'.apng', or anything else for a frame directory."""
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension == ".gif":
+        return "gif"
+    if extension in (".png", ".apng"):
+        return "apng"
+    return "frames"
+
+def _wave(phase: float, t: float, cycles: int) -> float:
+    """Offset of a looping sine wave from its value at t = 0, so frame 0 is the still image."""
+    return math.sin(2 * math.pi * cycles * t + phase) - math.sin(phase)
+
+def _merge_rects(rects: list[pygame.Rect]) -> list[pygame.Rect]:
+    """Union overlapping rectangles until none overlap, so no pixel is repainted twice in a frame."""
+    merged = []
+    for rect in rects:
+        hits = rect.collidelistall(merged)
+        while hits:
+            for index in reversed(hits):
+                rect = rect.union(merged.pop(index))
+            hits = rect.collidelistall(merged)
+        merged.append(rect)
+    return merged
+
+class SceneAnimator:
+    """Frames of a looping animation of one composed scene, drawn incrementally with dirty rectangles"""
+
+    def __init__(self, scene: dict, frame_count: int = 60, rng=random):
+        """Pick the motion of every shape and particle and draw the static backdrop.
+        Args:
+            scene (dict): Result of art_generator.compose_scene.
+            frame_count (int): Frames in one loop of the animation.
+            rng (random.Random): Random source for pulse and drift phases.
+        """
+        if frame_count < 1:
+            raise ValueError("frame_count must be at least 1")
+        self.scene = scene
+        self.size = scene["size"]
+        self.frame_count = frame_count
+        self.pulses = [(rng.uniform(0, 2 * math.pi), rng.randint(1, 2)) for _ in scene["elements"]]
+        drift = scale_length(DRIFT_DISTANCE, self.size)
+        self.drifts = [(rng.uniform(0, 2 * math.pi), rng.uniform(0, 2 * math.pi), rng.randint(1, 2), drift)
+                       for _ in scene["particles"]]
+        self.backdrop = pygame.Surface(self.size, 0, 32)
+        draw_backdrop(self.backdrop, scene)
+        self._statics = self._static_rects()
+
+    def _static_rects(self) -> list[tuple[str, object, pygame.Rect]]:
+        """Text band, words and fog puffs with the canvas area each one covers."""
+        size, scene = self.size, self.scene
+        band_height, _ = scene["text_band"]
+        statics = [("band", None, pygame.Rect(0, size[1] - band_height, size[0], band_height))]
+        for word in scene["words"]:
+            statics.append(("word", word, pygame.Rect(0, word[2][1], size[0], size[1] - word[2][1])))
+        for puff in scene["fog"]:
+            x, y, radius = puff[:3]
+            statics.append(("fog", puff, pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)))
+        return statics
+
+    def frame_items(self, index: int) -> tuple[list[dict], list[tuple]]:
+        """Shapes and particles as they are placed in a frame.
+        Args:
+            index (int): Frame number; the motion loops every frame_count frames.
+        Returns:
+            tuple[list[dict], list[tuple]]: Plan elements with pulsed sizes and drifted particles.
+        """
+        t = index / self.frame_count
+        elements = [dict(element, size=element["size"] * (1 + PULSE_AMOUNT * _wave(phase, t, cycles)))
+                    for element, (phase, cycles) in zip(self.scene["elements"], self.pulses)]
+        particles = [(x + round(drift * _wave(phase_x, t, cycles)), y + round(drift * _wave(phase_y, t, cycles)), radius, color, alpha)
+                     for (x, y, radius, color, alpha), (phase_x, phase_y, cycles, drift) in zip(self.scene["particles"], self.drifts)]
+        return elements, particles
+
+    def _item_rects(self, elements: list[dict], particles: list[tuple]) -> list[pygame.Rect]:
+        rects = []
+        for element in elements:
+            x, y = to_pixels(element["position"], self.size)
+            radius = length_to_pixels(element["size"], self.size)
+            rects.append(pygame.Rect(x - radius, y - radius, radius * 2, radius * 2))
+        for x, y, radius, _, _ in particles:
+            rects.append(pygame.Rect(x - radius, y - radius, radius * 2, radius * 2))
+        return rects
+
+    def _frame_scene(self, elements: list[dict], particles: list[tuple]) -> dict:
+        return dict(self.scene, elements=elements, particles=particles)
+
+    def draw_full(self, surface: pygame.Surface, index: int) -> None:
+        """Redraw a whole frame from the backdrop up.
+        Args:
+            surface (pygame.Surface): Canvas-sized target.
+            index (int): Frame number.
+        """
+        elements, particles = self.frame_items(index)
+        surface.blit(self.backdrop, (0, 0))
+        draw_foreground(surface, self._frame_scene(elements, particles))
+
+    def frames(self, surface: pygame.Surface = None):
+        """Draw the frames of one loop into a single surface, repainting only what moved.
+        Each moving item marks the union of its old and new rectangles as dirty; every dirty rectangle is
+        restored from the backdrop and redrawn, clipped, with the items that touch it in their usual order,
+        so every frame matches draw_full pixel for pixel.
+        Args:
+            surface (pygame.Surface, optional): Canvas-sized target, created if omitted.
+        Yields:
+            tuple[pygame.Surface, list[pygame.Rect]]: The surface holding the frame and the rectangles
+            repainted for it (the whole canvas for frame 0).
+        """
+        if surface is None:
+            surface = pygame.Surface(self.size, 0, 32)
+        elements, particles = self.frame_items(0)
+        surface.blit(self.backdrop, (0, 0))
+        draw_foreground(surface, self._frame_scene(elements, particles))
+        previous = self._item_rects(elements, particles)
+        yield surface, [surface.get_rect()]
+        for index in range(1, self.frame_count):
+            elements, particles = self.frame_items(index)
+            current = self._item_rects(elements, particles)
+            dirty = _merge_rects([old.union(new) for old, new in zip(previous, current) if old != new])
+            with span("animate"):
+                for rect in dirty:
+                    self._repaint(surface, rect, elements, particles, current)
+                surface.set_clip(None)
+            previous = current
+            yield surface, dirty
+
+    def _repaint(self, surface: pygame.Surface, rect: pygame.Rect, elements: list[dict], particles: list[tuple], rects: list[pygame.Rect]) -> None:
+        surface.set_clip(rect)
+        surface.blit(self.backdrop, rect.topleft, rect)
+        shown_elements = [element for element, item_rect in zip(elements, rects) if item_rect.colliderect(rect)]
+        shown_particles = [particle for particle, item_rect in zip(particles, rects[len(elements):]) if item_rect.colliderect(rect)]
+        touched = [kind for kind, _, static_rect in self._statics if static_rect.colliderect(rect)]
+        words = [item for kind, item, static_rect in self._statics if kind == "word" and static_rect.colliderect(rect)]
+        fog = [item for kind, item, static_rect in self._statics if kind == "fog" and static_rect.colliderect(rect)]
+        scene = dict(self.scene, elements=shown_elements, particles=shown_particles, words=words, fog=fog)
+        if "band" not in touched:
+            scene["text_band"] = (0, 0)
+        draw_foreground(surface, scene)
+
+def write_apng(animator: SceneAnimator, output_path: str, duration: int, compress_level: int = 6) -> None:
+    """Stream an animation into an APNG, one frame at a time.
+    Each frame after the first covers only the bounding box of its dirty rectangles and is blended over
+    the previous frame, with pixels that did not change left transparent, so they compress to almost nothing.
+    Args:
+        animator (SceneAnimator): Animation to write.
+        output_path (str): APNG file.
+        duration (int): Frame duration in milliseconds.
+        compress_level (int): zlib level (0-9).
+    """
+    width, height = animator.size
+    shown = np.zeros((height, width, 3), dtype=np.uint8)
+    sequence = 0
+    with open(output_path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+        f.write(png_chunk(b"acTL", struct.pack(">II", animator.frame_count, 0)))
+        for index, (surface, dirty) in enumerate(animator.frames()):
+            box = dirty[0].unionall(dirty[1:]).clip(surface.get_rect()) if dirty else pygame.Rect(0, 0, 0, 0)
+            if not box.w or not box.h:
+                box = pygame.Rect(0, 0, 1, 1)
+            pixels = pygame.surfarray.array3d(surface.subsurface(box)).transpose(1, 0, 2)
+            region = shown[box.top:box.bottom, box.left:box.right]
+            changed = (pixels != region).any(axis=2) if index else np.ones(pixels.shape[:2], dtype=bool)
+            rgba = np.zeros((box.h, box.w, 4), dtype=np.uint8)
+            rgba[changed, :3] = pixels[changed]
+            rgba[changed, 3] = 255
+            region[...] = pixels
+            data = zlib.compress(filter_rows_up(rgba.reshape(box.h, -1), np.zeros(box.w * 4, dtype=np.uint8)), compress_level)
+            blend = 0 if index == 0 else 1
+            f.write(png_chunk(b"fcTL", struct.pack(">IIIIIHHBB", sequence, box.w, box.h, box.x, box.y, duration, 1000, 0, blend)))
+            sequence += 1
+            if index == 0:
+                f.write(png_chunk(b"IDAT", data))
+            else:
+                f.write(png_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                sequence += 1
+        f.write(png_chunk(b"IEND", b""))
+
+def save_animation(animator: SceneAnimator, output_path: str, fps: int = 30, fmt: str = None) -> str:
+    """Render every frame of an animator and write it as a GIF, an APNG or a frame directory.
+    APNGs and frame directories are written as frames are drawn. GIF frames share one adaptive palette
+    taken from the first frame, so colors do not flicker.
+    Args:
+        animator (SceneAnimator): Animation to write.
+        output_path (str): File for 'gif'/'apng', directory for 'frames'.
+        fps (int): Playback rate.
+        fmt (str, optional): One of ANIMATION_FORMATS, inferred from the path if omitted.
+    Returns:
+        str: The output path.
+    """
+    fmt = fmt or animation_format(output_path)
+    if fmt not in ANIMATION_FORMATS:
+        raise ValueError(f"Unknown animation format: {fmt}")
+    duration = round(1000 / fps)
+    with span("encode"):
+        if fmt == "apng":
+            write_apng(animator, output_path, duration)
+        elif fmt == "gif":
+            images = (surface_to_image(frame) for frame, _ in animator.frames())
+            palette = next(images).quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+            rest = (image.quantize(palette=palette, dither=Image.Dither.NONE) for image in images)
+            palette.save(output_path, "GIF", save_all=True, append_images=rest, duration=duration, loop=0)
+        else:
+            os.makedirs(output_path, exist_ok=True)
+            written = 0
+            for index, (frame, _) in enumerate(animator.frames()):
+                path = os.path.join(output_path, f"frame_{index:04d}.png")
+                surface_to_image(frame).save(path, compress_level=FRAME_COMPRESS_LEVEL)
+                written += os.path.getsize(path)
+            count("bytes_written_total", written, kind="animation")
+            return output_path
+    count("bytes_written_total", os.path.getsize(output_path), kind="animation")
+    return output_path
+
+def animate_art(visual_plan: dict, output_path: str, background_type: str = None, background_opacity: float = 0.4, size: tuple[int, int] = (800, 800), frame_count: int = 60, fps: int = 30, fmt: str = None, rng=random) -> str:
+    """Compose a plan once and write it as a looping animation whose first frame is the still render.
+    Args:
+        visual_plan (dict): Dictionary containing art elements, colors, and style.
+        output_path (str): File for 'gif'/'apng', directory for 'frames'.
+        background_type (str, optional): Type of background to use.
+        background_opacity (float): Opacity level for background (0.0 to 1.0).
+        size (tuple[int, int]): Dimensions of the artwork.
+        frame_count (int): Frames in one loop.
+        fps (int): Playback rate.
+        fmt (str, optional): One of ANIMATION_FORMATS, inferred from the path if omitted.
+        rng (random.Random): Random source, as for render_art, then for the motion.
+    Returns:
+        str: The output path.
+    """
+    scene = compose_scene(visual_plan, background_type, background_opacity, size, rng)
+    return save_animation(SceneAnimator(scene, frame_count, rng), output_path, fps, fmt)
+
+def main(argv: list[str] = None) -> int:
+    from styles import StylePresets
+    styles = [style_id for style_id, _, _ in StylePresets().get_available_styles()]
+    parser = argparse.ArgumentParser(description="Render a poem as a looping animation.")
+    parser.add_argument("poem", help="Poem text file")
+    parser.add_argument("output", help="Output .gif, .png (APNG) or frame directory")
+    parser.add_argument("--style", default="auto", choices=styles + ["auto"])
+    parser.add_argument("--background", default="none", choices=["none", "auto", "sky", "forest", "ocean", "mountains", "sunset"])
+    parser.add_argument("--size", type=int, default=800, help="Square canvas size in pixels")
+    parser.add_argument("--frames", type=int, default=60, help="Frames per loop")
+    parser.add_argument("--fps", type=int, default=30, help="Playback rate")
+    parser.add_argument("--seed", type=int, default=None, help="Render seed for a reproducible animation")
+    args = parser.parse_args(argv)
+
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+    pygame.font.init()
+    from pipeline import animate_poem
+    with open(args.poem, encoding="utf-8") as f:
+        poem = f.read()
+    background = None if args.background == "none" else args.background
+    summary = animate_poem(poem, args.output, args.style, background, (args.size, args.size), args.seed, args.frames, args.fps)
+    print(f"🎞️ {args.frames} frames in {summary['style']} style saved to {summary['output']}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
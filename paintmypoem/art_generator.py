@@ -1,241 +1,489 @@
 import random
+import logging
 import pygame
 import math
 import os
+from functools import lru_cache
+import numpy as np
 from background_manager import BackgroundManager
+from surface_cache import SurfaceCache
+from particles import scatter_particles, scatter_fog, particle_sprite
+from fonts import word_sprite
+from metrics import span, count
+from layout import canvas_scale, length_to_pixels, normalize_point, scale_length, to_pixels
 
-def draw_art(visual_plan: dict, background_type: str = None, background_opacity: float = 0.4, size: tuple[int, int] = (800, 800)) -> None:
-    """Draw poem art based on visual plan with optional background.
+logger = logging.getLogger(__name__)
+
+GRADIENT_VARIANTS = {
+    "joy": [(255, 248, 220), (255, 215, 0), (255, 165, 0)],
+    "happy": [(255, 248, 220), (255, 215, 0), (255, 165, 0)],
+    "sadness": [(25, 25, 112), (65, 105, 225), (30, 144, 255)],
+    "sad": [(25, 25, 112), (65, 105, 225), (30, 144, 255)],
+    "anger": [(139, 0, 0), (255, 69, 0), (255, 140, 0)],
+    "fear": [(72, 61, 139), (138, 43, 226), (147, 112, 219)],
+    "love": [(255, 240, 245), (255, 20, 147), (255, 105, 180)],
+    "neutral": [(47, 79, 79), (138, 43, 226), (30, 144, 255)]
+}
+
+def gradient_rows(emotion: str, complexity: int, height: int) -> np.ndarray:
+    """Compute the RGB value of every row of a vertical gradient.
+    Two-stop gradients (complexity 2) blend the first two colors; otherwise three stops meet halfway.
+    Args:
+        emotion (str): Emotion selecting the gradient colors.
+        complexity (int): Gradient complexity from the style.
+        height (int): Number of rows.
+    Returns:
+        np.ndarray: uint8 array of shape (height, 3).
+    """
+    colors = np.array(GRADIENT_VARIANTS.get(emotion, GRADIENT_VARIANTS["neutral"]), dtype=np.float64)
+    y = np.arange(height, dtype=np.float64)
+    if complexity == 2:
+        ratio = (y / height)[:, None]
+        rows = colors[0] + (colors[1] - colors[0]) * ratio
+    else:
+        half = height // 2
+        upper = y < half
+        ratio = np.where(upper, y / max(half, 1), (y - half) / max(half, 1))[:, None]
+        rows = np.where(upper[:, None], colors[0] + (colors[1] - colors[0]) * ratio, colors[1] + (colors[2] - colors[1]) * ratio)
+    return rows.astype(np.uint8)
+
+@lru_cache(maxsize=32)
+def gradient_surface(emotion: str, complexity: int, size: tuple[int, int]) -> pygame.Surface:
+    """Cached, ready-to-blit gradient background built from a one-pixel column of rows.
+    Callers must not draw on the returned surface.
+    Args:
+        emotion (str): Emotion selecting the gradient colors.
+        complexity (int): Gradient complexity from the style.
+        size (tuple[int, int]): Dimensions of the surface.
+    Returns:
+        pygame.Surface: Gradient surface.
+    """
+    column = pygame.surfarray.make_surface(gradient_rows(emotion, complexity, size[1])[None, :, :])
+    return pygame.transform.scale(column, size)
+
+@lru_cache(maxsize=32)
+def overlay_surface(color: tuple[int, int, int], size: tuple[int, int]) -> pygame.Surface:
+    """Cached tint overlay that fades from 30 alpha at the top to transparent at the bottom.
+    Args:
+        color (tuple[int, int, int]): Tint color.
+        size (tuple[int, int]): Dimensions of the surface.
+    Returns:
+        pygame.Surface: SRCALPHA overlay surface.
+    """
+    column = pygame.Surface((1, size[1]), pygame.SRCALPHA)
+    column.fill((*color, 0))
+    alphas = pygame.surfarray.pixels_alpha(column)
+    alphas[0, :] = (30 * (1 - np.arange(size[1], dtype=np.float64) / size[1])).astype(np.uint8)
+    del alphas
+    return pygame.transform.scale(column, size)
+
+def gradient_strip(emotion: str, complexity: int, size: tuple[int, int], top: int, height: int) -> pygame.Surface:
+    """Rows top..top+height of the gradient background of a canvas, without building the whole canvas.
+    Args:
+        emotion (str): Emotion selecting the gradient colors.
+        complexity (int): Gradient complexity from the style.
+        size (tuple[int, int]): Dimensions of the whole canvas.
+        top (int): First canvas row of the strip.
+        height (int): Rows in the strip.
+    Returns:
+        pygame.Surface: Strip of size (size[0], height); rows below the canvas stay black.
+    """
+    strip = pygame.Surface((size[0], height))
+    rows = gradient_rows(emotion, complexity, size[1])[top:top + height]
+    if len(rows):
+        column = pygame.surfarray.make_surface(rows[None, :, :])
+        strip.blit(pygame.transform.scale(column, (size[0], len(rows))), (0, 0))
+    return strip
+
+def overlay_strip(color: tuple[int, int, int], size: tuple[int, int], top: int, height: int) -> pygame.Surface:
+    """Rows top..top+height of overlay_surface(color, size).
+    Args:
+        color (tuple[int, int, int]): Tint color.
+        size (tuple[int, int]): Dimensions of the whole canvas.
+        top (int): First canvas row of the strip.
+        height (int): Rows in the strip.
+    Returns:
+        pygame.Surface: SRCALPHA strip of size (size[0], height).
+    """
+    column = pygame.Surface((1, height), pygame.SRCALPHA)
+    column.fill((*color, 0))
+    alphas = pygame.surfarray.pixels_alpha(column)
+    y = np.arange(top, top + height, dtype=np.float64)
+    alphas[0, :] = np.clip(30 * (1 - y / size[1]), 0, 255).astype(np.uint8)
+    del alphas
+    return pygame.transform.scale(column, (size[0], height))
+
+def draw_vibrant_gradient_background(screen: pygame.Surface, top_color: tuple[int, int, int], emotion: str, complexity: int = 3, size: tuple[int, int] = None) -> None:
+    """Create more colorful gradient backgrounds with variable complexity.
+    Args:
+        screen (pygame.Surface): Target surface.
+        top_color (tuple[int, int, int]): Plan background color (kept for compatibility).
+        emotion (str): Emotion selecting the gradient colors.
+        complexity (int): Gradient complexity from the style.
+        size (tuple[int, int], optional): Area to cover, defaults to the whole surface.
+    """
+    size = tuple(size) if size else screen.get_size()
+    screen.blit(gradient_surface(emotion, complexity, size), (0, 0))
+
+# Opaque photo backdrops with their tint overlay, for whole-canvas draws onto black; 800x800 is 2.5 MB.
+PHOTO_BACKDROPS = SurfaceCache("photo_backdrops", max_entries=16, max_bytes=32 * 1024 * 1024)
+
+def photo_backdrop(path: str, opacity: float, color: tuple[int, int, int], size: tuple[int, int]) -> pygame.Surface:
+    """Prepared background photo and tint overlay flattened onto black, cached in PHOTO_BACKDROPS.
+    Args:
+        path (str): Background image path.
+        opacity (float): Opacity level for the background (0.0 to 1.0).
+        color (tuple[int, int, int]): Tint color of the overlay.
+        size (tuple[int, int]): Dimensions of the canvas.
+    Returns:
+        pygame.Surface: Opaque 32-bit surface; blit it, never draw on it.
+    """
+    return PHOTO_BACKDROPS.get((path, opacity, tuple(color), tuple(size)), _flatten_photo, path, opacity, color, size)
+
+def _flatten_photo(path: str, opacity: float, color: tuple[int, int, int], size: tuple[int, int]) -> pygame.Surface:
+    backdrop = pygame.Surface(size, 0, 32)
+    backdrop.blit(BackgroundManager().prepare_background_surface(path, opacity, size), (0, 0))
+    backdrop.blit(overlay_surface(color, size), (0, 0))
+    return backdrop
+
+# Unit vertex tables, scaled by the sprite size at render time.
+HEXAGON_UNIT = [(0.7 * math.cos(i * math.pi / 3), 0.7 * math.sin(i * math.pi / 3)) for i in range(6)]
+STAR_UNIT = [((0.8 if i % 2 == 0 else 0.4) * math.cos(i * math.pi / 5 - math.pi / 2),
+              (0.8 if i % 2 == 0 else 0.4) * math.sin(i * math.pi / 5 - math.pi / 2)) for i in range(10)]
+
+SHAPE_SPRITES = SurfaceCache("shape_sprites", max_entries=2048)
+# Foreground sprites with their opacity folded in and alpha premultiplied, stamped with BLEND_PREMULTIPLIED.
+PREMULTIPLIED_SPRITES = SurfaceCache("premultiplied_sprites", max_entries=16384, max_bytes=32 * 1024 * 1024)
+FOREGROUND_LAYERS = ["shapes", "particles", "text", "fog"]
+
+def _scaled_points(unit_points: list[tuple[float, float]], size: int) -> list[tuple[float, float]]:
+    return [(size + size * ux, size + size * uy) for ux, uy in unit_points]
+
+def render_shape_sprite(shape: str, style_name: str, size: int, color: tuple[int, int, int], alpha: int, line_scale: float = 1.0) -> pygame.Surface:
+    """Rasterize one shape with its style effects onto a (size*2, size*2) transparent sprite.
+    Args:
+        shape (str): Shape type ('circle', 'square', 'triangle', 'hexagon', 'star').
+        style_name (str): Style controlling borders and highlights.
+        size (int): Shape size in pixels; the sprite is centered on (size, size).
+        color (tuple[int, int, int]): Fill color.
+        alpha (int): Fill alpha.
+        line_scale (float): Canvas scale applied to border widths and highlight insets.
+    Returns:
+        pygame.Surface: SRCALPHA sprite.
+    """
+    shape_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    line = lambda width: max(1, round(width * line_scale))
+
+    if style_name == "minimalist":
+        if shape == "circle":
+            pygame.draw.circle(shape_surface, (*color, alpha), (size, size), size)
+        elif shape == "square":
+            rect = pygame.Rect(size//2, size//2, size, size)
+            pygame.draw.rect(shape_surface, (*color, alpha), rect)
+    elif style_name == "bold":
+        if shape == "circle":
+            pygame.draw.circle(shape_surface, (*color, alpha), (size, size), size)
+            pygame.draw.circle(shape_surface, (255, 255, 255, alpha), (size, size), size, line(5))
+        elif shape == "square":
+            rect = pygame.Rect(size//2, size//2, size, size)
+            pygame.draw.rect(shape_surface, (*color, alpha), rect)
+            pygame.draw.rect(shape_surface, (255, 255, 255, alpha), rect, line(5))
+        elif shape == "triangle":
+            point1 = (size, size//2)
+            point2 = (size//2, size + size//2)
+            point3 = (size + size//2, size + size//2)
+            pygame.draw.polygon(shape_surface, (*color, alpha), [point1, point2, point3])
+            pygame.draw.polygon(shape_surface, (255, 255, 255, alpha), [point1, point2, point3], line(4))
+        elif shape == "hexagon":
+            points = _scaled_points(HEXAGON_UNIT, size)
+            pygame.draw.polygon(shape_surface, (*color, alpha), points)
+            pygame.draw.polygon(shape_surface, (255, 255, 255, alpha), points, line(4))
+    else:
+        if shape == "circle":
+            pygame.draw.circle(shape_surface, (*color, alpha), (size, size), size)
+            inner_size = max(size - line(10), line(5))
+            brighter_color = tuple(min(255, c + 30) for c in color)
+            pygame.draw.circle(shape_surface, (*brighter_color, alpha//2), (size, size), inner_size)
+        elif shape == "square":
+            rect = pygame.Rect(size//2, size//2, size, size)
+            pygame.draw.rect(shape_surface, (*color, alpha), rect)
+            pygame.draw.rect(shape_surface, (255, 255, 255, alpha//3), rect, line(3))
+        elif shape == "triangle":
+            point1 = (size, size//2)
+            point2 = (size//2, size + size//2)
+            point3 = (size + size//2, size + size//2)
+            pygame.draw.polygon(shape_surface, (*color, alpha), [point1, point2, point3])
+        elif shape == "hexagon":
+            pygame.draw.polygon(shape_surface, (*color, alpha), _scaled_points(HEXAGON_UNIT, size))
+        elif shape == "star":
+            pygame.draw.polygon(shape_surface, (*color, alpha), _scaled_points(STAR_UNIT, size))
+    return shape_surface
+
+def place_shape(element: dict, style_name: str, canvas_size: tuple[int, int]) -> tuple[tuple, tuple[int, int]]:
+    """Resolve a plan element to its sprite key and the canvas position of the sprite's top-left corner.
+    Args:
+        element (dict): Plan element with 'type', normalized 'position' and 'size', and 'color'.
+        style_name (str): Style controlling borders and highlights.
+        canvas_size (tuple[int, int]): Size of the whole canvas.
+    Returns:
+        tuple[tuple, tuple[int, int]]: Key for shape_sprite() and the sprite position.
+    """
+    x, y = to_pixels(element["position"], canvas_size)
+    size = length_to_pixels(element["size"], canvas_size)
+    return (element["type"], style_name, size, tuple(element["color"]), canvas_scale(canvas_size)), (x - size, y - size)
+
+def shape_sprite(key: tuple) -> pygame.Surface:
+    """Cached full-opacity sprite for a key from place_shape()."""
+    shape, style_name, size, color, line_scale = key
+    return SHAPE_SPRITES.get(key, render_shape_sprite, shape, style_name, size, color, 255, line_scale)
+
+def _premultiply(alpha: int, factory, *args) -> pygame.Surface:
+    sprite = factory(*args).copy()
+    if alpha < 255:
+        sprite.fill((255, 255, 255, alpha), None, pygame.BLEND_RGBA_MULT)
+    return sprite.premul_alpha()
+
+def premultiplied_sprite(key: tuple, alpha: int, factory, *args) -> pygame.Surface:
+    """Cached premultiplied copy of a sprite with an extra opacity folded into its alpha.
+    Args:
+        key (tuple): Everything the sprite is rendered from.
+        alpha (int): Opacity applied on top of the sprite's own alpha.
+        factory (callable): Returns the straight-alpha sprite, called only on a miss.
+        *args: Arguments passed to factory.
+    Returns:
+        pygame.Surface: Sprite for BLEND_PREMULTIPLIED blits; shared, so only blit it.
+    """
+    return PREMULTIPLIED_SPRITES.get((key, alpha), _premultiply, alpha, factory, *args)
+
+def layer_stamps(scene: dict, name: str) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+    """Sprites and canvas positions that draw one foreground layer of a composed scene.
+    Args:
+        scene (dict): Result of compose_scene.
+        name (str): One of FOREGROUND_LAYERS.
+    Returns:
+        list[tuple[pygame.Surface, tuple[int, int]]]: Premultiplied sprites with the canvas position of
+        their top-left corner, in drawing order.
+    """
+    size = scene["size"]
+    if name == "shapes":
+        stamps = []
+        for element in scene["elements"]:
+            key, position = place_shape(element, scene["style_name"], size)
+            stamps.append((premultiplied_sprite(("shape",) + key, element.get("alpha", 255), shape_sprite, key), position))
+        return stamps
+    if name in ("particles", "fog"):
+        sprites = {}
+        stamps = []
+        for x, y, radius, color, alpha in scene[name]:
+            key = ("particle", radius, color, alpha)
+            sprite = sprites.get(key)
+            if sprite is None:
+                sprite = sprites[key] = premultiplied_sprite(key, 255, particle_sprite, radius, color, alpha)
+            stamps.append((sprite, (x - radius, y - radius)))
+        return stamps
+    band_height, band_alpha = scene["text_band"]
+    stamps = [(premultiplied_sprite(("band", size[0], band_height, band_alpha), 255, text_band_surface, (size[0], band_height), band_alpha), (0, size[1] - band_height))]
+    font_size, shadow_offset = scene["font_size"], scene["shadow_offset"]
+    for word, color, (x, y) in scene["words"]:
+        if shadow_offset is not None:
+            shadow = premultiplied_sprite(("word", word, font_size, (0, 0, 0), True), 255, word_sprite, word, font_size, (0, 0, 0), True)
+            stamps.append((shadow, (x + shadow_offset, y + shadow_offset)))
+        stamps.append((premultiplied_sprite(("word", word, font_size, color, False), 255, word_sprite, word, font_size, color), (x, y)))
+    return stamps
+
+def stamp(surface: pygame.Surface, stamps: list, offset: tuple[int, int] = (0, 0)) -> None:
+    """Blit premultiplied sprites from layer_stamps onto a surface in one blits() call.
+    Args:
+        surface (pygame.Surface): Target surface.
+        stamps (list): (sprite, canvas position) pairs.
+        offset (tuple[int, int]): Canvas position of the surface's top-left corner.
+    """
+    ox, oy = offset
+    surface.blits([(sprite, (x - ox, y - oy), None, pygame.BLEND_PREMULTIPLIED) for sprite, (x, y) in stamps], doreturn=False)
+
+def compose_scene(visual_plan: dict, background_type: str = None, background_opacity: float = 0.4, size: tuple[int, int] = (800, 800), rng=random) -> dict:
+    """Make every random choice of a render up front: background file, particles, text colors and fog.
+    The resulting scene can be drawn whole or strip by strip (see draw_scene) with identical pixels.
+    Each of the four choices draws from its own generator seeded from rng, so changing the background
+    or the text of a seeded render leaves its particles and fog where they were.
     Args:
         visual_plan (dict): Dictionary containing art elements, colors, and style.
         background_type (str, optional): Type of background to use.
         background_opacity (float): Opacity level for background (0.0 to 1.0).
-        size (tuple[int, int]): Dimensions of the drawing surface.
+        size (tuple[int, int]): Dimensions of the artwork.
+        rng (random.Random): Random source for the background pick, particles, text colors and fog.
+    Returns:
+        dict: Scene description consumed by draw_scene.
     """
     if not visual_plan or "elements" not in visual_plan:
         raise ValueError("Invalid visual_plan: must contain 'elements' key")
-
-    screen = pygame.display.get_surface()  # Use the existing surface from main.py
-    if screen is None:
-        raise RuntimeError("No Pygame display surface available. Ensure Pygame is initialized.")
-
-    # Initialize background manager
-    bg_manager = BackgroundManager()
-
-    def draw_vibrant_gradient_background(screen, top_color, emotion, complexity=3):
-        """Create more colorful gradient backgrounds with variable complexity"""
-        gradient_variants = {
-            "joy": [(255, 248, 220), (255, 215, 0), (255, 165, 0)],
-            "happy": [(255, 248, 220), (255, 215, 0), (255, 165, 0)],
-            "sadness": [(25, 25, 112), (65, 105, 225), (30, 144, 255)],
-            "sad": [(25, 25, 112), (65, 105, 225), (30, 144, 255)],
-            "anger": [(139, 0, 0), (255, 69, 0), (255, 140, 0)],
-            "fear": [(72, 61, 139), (138, 43, 226), (147, 112, 219)],
-            "love": [(255, 240, 245), (255, 20, 147), (255, 105, 180)],
-            "neutral": [(47, 79, 79), (138, 43, 226), (30, 144, 255)]
-        }
-        
-        colors = gradient_variants.get(emotion, gradient_variants["neutral"])
-        
-        if complexity == 2:
-            for y in range(size[1]):
-                ratio = y / size[1]
-                r = int(colors[0][0] + (colors[1][0] - colors[0][0]) * ratio)
-                g = int(colors[0][1] + (colors[1][1] - colors[0][1]) * ratio)
-                b = int(colors[0][2] + (colors[1][2] - colors[0][2]) * ratio)
-                pygame.draw.line(screen, (r, g, b), (0, y), (size[0], y))
-        else:
-            for y in range(size[1]):
-                if y < size[1] // 2:
-                    ratio = y / (size[1] // 2)
-                    r = int(colors[0][0] + (colors[1][0] - colors[0][0]) * ratio)
-                    g = int(colors[0][1] + (colors[1][1] - colors[0][1]) * ratio)
-                    b = int(colors[0][2] + (colors[1][2] - colors[0][2]) * ratio)
-                else:
-                    ratio = (y - size[1] // 2) / (size[1] // 2)
-                    r = int(colors[1][0] + (colors[2][0] - colors[1][0]) * ratio)
-                    g = int(colors[1][1] + (colors[2][1] - colors[1][1]) * ratio)
-                    b = int(colors[1][2] + (colors[2][2] - colors[1][2]) * ratio)
-                pygame.draw.line(screen, (r, g, b), (0, y), (size[0], y))
-
-    def draw_enhanced_shape(screen, element, style_name="vibrant"):
-        """Draw shapes with enhanced visual effects based on style"""
-        shape = element["type"]
-        pos = element["position"]
-        size = element["size"]
-        color = element["color"]
-        alpha = element.get("alpha", 255)
-        
-        shape_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        
-        if style_name == "minimalist":
-            if shape == "circle":
-                pygame.draw.circle(shape_surface, (*color, alpha), (size, size), size)
-            elif shape == "square":
-                rect = pygame.Rect(size//2, size//2, size, size)
-                pygame.draw.rect(shape_surface, (*color, alpha), rect)
-        elif style_name == "bold":
-            if shape == "circle":
-                pygame.draw.circle(shape_surface, (*color, alpha), (size, size), size)
-                pygame.draw.circle(shape_surface, (255, 255, 255, alpha), (size, size), size, 5)
-            elif shape == "square":
-                rect = pygame.Rect(size//2, size//2, size, size)
-                pygame.draw.rect(shape_surface, (*color, alpha), rect)
-                pygame.draw.rect(shape_surface, (255, 255, 255, alpha), rect, 5)
-            elif shape == "triangle":
-                point1 = (size, size//2)
-                point2 = (size//2, size + size//2)
-                point3 = (size + size//2, size + size//2)
-                pygame.draw.polygon(shape_surface, (*color, alpha), [point1, point2, point3])
-                pygame.draw.polygon(shape_surface, (255, 255, 255, alpha), [point1, point2, point3], 4)
-            elif shape == "hexagon":
-                points = []
-                for i in range(6):
-                    angle = i * math.pi / 3
-                    x = size + size * 0.7 * math.cos(angle)
-                    y = size + size * 0.7 * math.sin(angle)
-                    points.append((x, y))
-                pygame.draw.polygon(shape_surface, (*color, alpha), points)
-                pygame.draw.polygon(shape_surface, (255, 255, 255, alpha), points, 4)
-        else:
-            if shape == "circle":
-                pygame.draw.circle(shape_surface, (*color, alpha), (size, size), size)
-                inner_size = max(size - 10, 5)
-                brighter_color = tuple(min(255, c + 30) for c in color)
-                pygame.draw.circle(shape_surface, (*brighter_color, alpha//2), (size, size), inner_size)
-            elif shape == "square":
-                rect = pygame.Rect(size//2, size//2, size, size)
-                pygame.draw.rect(shape_surface, (*color, alpha), rect)
-                pygame.draw.rect(shape_surface, (255, 255, 255, alpha//3), rect, 3)
-            elif shape == "triangle":
-                point1 = (size, size//2)
-                point2 = (size//2, size + size//2)
-                point3 = (size + size//2, size + size//2)
-                pygame.draw.polygon(shape_surface, (*color, alpha), [point1, point2, point3])
-            elif shape == "hexagon":
-                points = []
-                for i in range(6):
-                    angle = i * math.pi / 3
-                    x = size + size * 0.7 * math.cos(angle)
-                    y = size + size * 0.7 * math.sin(angle)
-                    points.append((x, y))
-                pygame.draw.polygon(shape_surface, (*color, alpha), points)
-            elif shape == "star":
-                points = []
-                for i in range(10):
-                    angle = i * math.pi / 5
-                    if i % 2 == 0:
-                        radius = size * 0.8
-                    else:
-                        radius = size * 0.4
-                    x = size + radius * math.cos(angle - math.pi/2)
-                    y = size + radius * math.sin(angle - math.pi/2)
-                    points.append((x, y))
-                pygame.draw.polygon(shape_surface, (*color, alpha), points)
-        
-        screen.blit(shape_surface, (pos[0] - size, pos[1] - size))
-
-    emotion = visual_plan.get("emotion", "neutral")
-    gradient_complexity = visual_plan.get("gradient_complexity", 3)
-    
-    if background_type:
-        print(f"🌄 Adding {background_type} background with {background_opacity*100}% opacity...")
-        bg_path = bg_manager.get_background_image(background_type)
-        if bg_path:
-            bg_surface = bg_manager.prepare_background_surface(bg_path, background_opacity, size)
-            screen.blit(bg_surface, (0, 0))
-            overlay = pygame.Surface(size, pygame.SRCALPHA)
-            bg_color = visual_plan.get("background_color", (47, 79, 79))
-            for y in range(size[1]):
-                alpha = int(30 * (1 - y/size[1]))
-                color = (*bg_color, alpha)
-                pygame.draw.line(overlay, color, (0, y), (size[0], y))
-            screen.blit(overlay, (0, 0))
-        else:
-            print("⚠️ Background image failed, using gradient fallback")
-            draw_vibrant_gradient_background(screen, visual_plan.get("background_color", (47, 79, 79)), emotion, gradient_complexity)
-    else:
-        bg_color = visual_plan.get("background_color", (47, 79, 79))
-        draw_vibrant_gradient_background(screen, bg_color, emotion, gradient_complexity)
+    size = tuple(size)
+    background_rng, particle_rng, text_rng, fog_rng = (random.Random(rng.getrandbits(64)) for _ in range(4))
+    background_path = None
+    with span("background"):
+        if background_type:
+            logger.info("🌄 Adding %s background with %s%% opacity...", background_type, background_opacity * 100)
+            background_path = BackgroundManager().get_background_image(background_type, rng=background_rng)
+            if not background_path:
+                logger.warning("⚠️ Background image failed, using gradient fallback")
 
     palette = visual_plan.get("palette", [(255, 255, 255)])
     accent_colors = visual_plan.get("accent_colors", palette)
     style_name = visual_plan.get("style_name", "vibrant")
     particle_count = visual_plan.get("particle_count", 30)
+    particles = scatter_particles(particle_count, size, palette + accent_colors, style_name, particle_rng) if style_name != "minimalist" else []
 
-    for element in visual_plan["elements"]:
-        draw_enhanced_shape(screen, element, style_name)
-
-    if style_name != "minimalist":
-        for _ in range(particle_count):
-            x = random.randint(0, size[0])
-            y = random.randint(0, size[1] - 200)
-            radius = random.randint(2, 8)
-            color = random.choice(palette + accent_colors)
-            if style_name == "ethereal":
-                alpha = random.randint(60, 120)
-            elif style_name == "bold":
-                alpha = random.randint(180, 255)
-            else:
-                alpha = random.randint(100, 200)
-            particle_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, (*color, alpha), (radius, radius), radius)
-            screen.blit(particle_surface, (x - radius, y - radius))
-
-    font_size = 28 if style_name != "minimalist" else 24
-    font = pygame.font.SysFont("Georgia", font_size, bold=True)
-    shadow_font = pygame.font.SysFont("Georgia", font_size, bold=True)
-    
-    text_bg = pygame.Surface((size[0], 100), pygame.SRCALPHA)
-    bg_alpha = 100 if style_name != "minimalist" else 50
-    text_bg.fill((0, 0, 0, bg_alpha))
-    screen.blit(text_bg, (0, size[1] - 100))
-    
+    font_size = scale_length(28 if style_name != "minimalist" else 24, size)
+    band_height = scale_length(100, size)
+    shadow_offset = scale_length(2, size) if style_name != "minimalist" else None
+    words = []
     for i, word in enumerate(visual_plan.get("text", [])):
         if style_name == "minimalist":
-            text_color = random.choice([(100, 100, 100), (150, 150, 150), (80, 80, 80)])
+            text_color = text_rng.choice([(100, 100, 100), (150, 150, 150), (80, 80, 80)])
         elif style_name == "bold":
-            text_color = random.choice([(255, 255, 255), (0, 0, 0)] + list(palette[:2]))
+            text_color = text_rng.choice([(255, 255, 255), (0, 0, 0)] + list(palette[:2]))
         else:
-            text_color = random.choice(palette)
-        
+            text_color = text_rng.choice(palette)
+
         if style_name != "minimalist":
             enhanced_color = tuple(min(255, c + 50) for c in text_color)
         else:
             enhanced_color = text_color
-        
-        if style_name != "minimalist":
-            shadow_text = shadow_font.render(word, True, (0, 0, 0))
-            main_text = font.render(word, True, enhanced_color)
-            x = 40 + (i % 4) * 180
-            y = size[1] - 80 + (i // 4) * 35
-            screen.blit(shadow_text, (x + 2, y + 2))
-            screen.blit(main_text, (x, y))
+
+        x = to_pixels(normalize_point(40 + (i % 4) * 180, 0), size)[0]
+        y = size[1] - scale_length(80, size) + scale_length((i // 4) * 35, size, minimum=0)
+        words.append((word, enhanced_color, (x, y)))
+
+    fog = scatter_fog(style_name, size, fog_rng) if visual_plan.get("fog", False) and style_name in ["ethereal", "organic"] else []
+
+    return {
+        "size": size,
+        "emotion": visual_plan.get("emotion", "neutral"),
+        "gradient_complexity": visual_plan.get("gradient_complexity", 3),
+        "background_color": tuple(visual_plan.get("background_color", (47, 79, 79))),
+        "background_path": background_path,
+        "background_opacity": background_opacity,
+        "style_name": style_name,
+        "elements": visual_plan["elements"],
+        "particles": particles,
+        "text_band": (band_height, 100 if style_name != "minimalist" else 50),
+        "font_size": font_size,
+        "shadow_offset": shadow_offset,
+        "words": words,
+        "fog": fog
+    }
+
+@lru_cache(maxsize=32)
+def text_band_surface(size: tuple[int, int], alpha: int) -> pygame.Surface:
+    """Cached translucent black band behind the keywords.
+    Args:
+        size (tuple[int, int]): Band dimensions.
+        alpha (int): Band alpha.
+    Returns:
+        pygame.Surface: SRCALPHA band surface.
+    """
+    band = pygame.Surface(size, pygame.SRCALPHA)
+    band.fill((0, 0, 0, alpha))
+    return band
+
+def draw_backdrop(surface: pygame.Surface, scene: dict, offset: tuple[int, int] = (0, 0)) -> None:
+    """Draw the background photo or gradient and its tint overlay of a composed scene.
+    Whole-canvas draws blit one cached full-size backdrop and assume the surface starts out black, as
+    render_art leaves it; strips build only their own rows.
+    Args:
+        surface (pygame.Surface): Target surface covering the whole canvas or a strip of it.
+        scene (dict): Result of compose_scene.
+        offset (tuple[int, int]): Canvas position of the surface's top-left corner.
+    """
+    size = scene["size"]
+    top, height = offset[1], surface.get_height()
+    whole = surface.get_size() == size and tuple(offset) == (0, 0)
+    emotion, complexity = scene["emotion"], scene["gradient_complexity"]
+    with span("backdrop"):
+        if scene["background_path"]:
+            if whole:
+                surface.blit(photo_backdrop(scene["background_path"], scene["background_opacity"], scene["background_color"], size), (0, 0))
+            else:
+                surface.blit(BackgroundManager().prepare_background_strip(scene["background_path"], scene["background_opacity"], size, top, height), (0, 0))
+                surface.blit(overlay_strip(scene["background_color"], size, top, height), (0, 0))
+        elif whole:
+            draw_vibrant_gradient_background(surface, scene["background_color"], emotion, complexity, size)
         else:
-            main_text = font.render(word, True, enhanced_color)
-            x = 40 + (i % 4) * 180
-            y = size[1] - 80 + (i // 4) * 35
-            screen.blit(main_text, (x, y))
-
-    if visual_plan.get("fog", False) and style_name in ["ethereal", "organic"]:
-        fog_intensity = 15 if style_name == "ethereal" else 8
-        for _ in range(fog_intensity):
-            x = random.randint(0, size[0])
-            y = random.randint(0, size[1])
-            radius = random.randint(15, 35)
-            particle = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            alpha = random.randint(5, 15)
-            white = (255, 255, 255, alpha)
-            pygame.draw.circle(particle, white, (radius, radius), radius)
-            screen.blit(particle, (x - radius, y - radius))
+            surface.blit(gradient_strip(emotion, complexity, size, top, height), (0, 0))
 
-    pygame.display.flip()
+def draw_foreground(surface: pygame.Surface, scene: dict, offset: tuple[int, int] = (0, 0)) -> None:
+    """Draw the shapes, particles, text band and fog of a composed scene over its backdrop.
+    Every item is stamped from a cached premultiplied sprite (see layer_stamps). Each pixel depends
+    only on the items covering it, so drawing under a clip rect gives the same pixels as a full draw
+    inside that rect.
+    Args:
+        surface (pygame.Surface): Target surface covering the whole canvas or a strip of it.
+        scene (dict): Result of compose_scene.
+        offset (tuple[int, int]): Canvas position of the surface's top-left corner.
+    """
+    for name in FOREGROUND_LAYERS:
+        if name in ("particles", "fog") and not scene[name]:
+            continue
+        with span(name):
+            stamp(surface, layer_stamps(scene, name), offset)
+
+def draw_scene(surface: pygame.Surface, scene: dict, offset: tuple[int, int] = (0, 0)) -> None:
+    """Draw a composed scene, or the part of it that falls on a strip of the canvas.
+    Args:
+        surface (pygame.Surface): Target surface covering the whole canvas or a strip of it.
+        scene (dict): Result of compose_scene.
+        offset (tuple[int, int]): Canvas position of the surface's top-left corner.
+    """
+    draw_backdrop(surface, scene, offset)
+    draw_foreground(surface, scene, offset)
 
-    try:
-        pygame.image.save(screen, "poem_art.png")
-        print("✅ Stylized image saved successfully as 'poem_art.png'!")
-    except Exception as e:
-        print(f"❌ Failed to save image: {e}")
+def render_art(visual_plan: dict, background_type: str = None, background_opacity: float = 0.4, size: tuple[int, int] = (800, 800), surface: pygame.Surface = None, rng=random) -> pygame.Surface:
+    """Render poem art onto an offscreen surface, without touching the Pygame display.
+    Only pygame.font needs to be initialized, so any number of canvases can be rendered in one process.
+    For canvases too large to hold at once, see tiled_renderer.render_tiled.
+    Args:
+        visual_plan (dict): Dictionary containing art elements, colors, and style.
+        background_type (str, optional): Type of background to use.
+        background_opacity (float): Opacity level for background (0.0 to 1.0).
+        size (tuple[int, int]): Dimensions of the artwork.
+        surface (pygame.Surface, optional): Surface to draw into; it is cleared first. A new 32-bit surface is created if omitted.
+        rng (random.Random): Random source for the background pick, particles, text colors and fog.
+    Returns:
+        pygame.Surface: The rendered surface.
+    """
+    scene = compose_scene(visual_plan, background_type, background_opacity, size, rng)
+    if surface is None:
+        screen = pygame.Surface(size, 0, 32)
+    else:
+        screen = surface
+        screen.fill((0, 0, 0))
+    draw_scene(screen, scene)
+    return screen
+
+def draw_art(visual_plan: dict, background_type: str = None, background_opacity: float = 0.4, size: tuple[int, int] = (800, 800), save_path: str = "poem_art.png", rng=random) -> None:
+    """Draw poem art based on visual plan with optional background onto the Pygame display.
+    Args:
+        visual_plan (dict): Dictionary containing art elements, colors, and style.
+        background_type (str, optional): Type of background to use.
+        background_opacity (float): Opacity level for background (0.0 to 1.0).
+        size (tuple[int, int]): Dimensions of the drawing surface.
+        save_path (str, optional): Where to save the raw render, or None to skip saving.
+        rng (random.Random): Random source passed to render_art.
+    """
+    if not visual_plan or "elements" not in visual_plan:
+        raise ValueError("Invalid visual_plan: must contain 'elements' key")
+
+    screen = pygame.display.get_surface()  # Use the existing surface from main.py
+    if screen is None:
+        raise RuntimeError("No Pygame display surface available. Ensure Pygame is initialized.")
+
+    render_art(visual_plan, background_type, background_opacity, size, surface=screen, rng=rng)
+    pygame.display.flip()
 
-    bg_manager.cleanup_old_backgrounds()
-    
\ No newline at end of file
+    if save_path:
+        try:
+            pygame.image.save(screen, save_path)
+            count("bytes_written_total", os.path.getsize(save_path), kind="image")
+            print(f"✅ Stylized image saved successfully as '{save_path}'!")
+        except Exception as e:
+            print(f"❌ Failed to save image: {e}")
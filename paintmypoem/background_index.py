@@ -0,0 +1,196 @@
+"""
+Background image index for PaintMyPoem
+Tracks downloaded backgrounds in SQLite by type and source URL, with byte-budget LRU eviction
+"""
+
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+INDEX_FILENAME = "index.sqlite"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# Entries used this recently are never evicted, so a render in another process keeps its file.
+EVICTION_GRACE_SECONDS = 300
+# Reads refresh last_used at most this often per entry, keeping lookups mostly read-only.
+TOUCH_INTERVAL_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+def background_filename(bg_type: str, url: str) -> str:
+    """Stable, collision-free file name for an image downloaded from a URL.
+    Args:
+        bg_type (str): Type of background.
+        url (str): Source URL.
+    Returns:
+        str: File name such as 'sky_3f2a9c0d1e4b5a6f.jpg'.
+    """
+    return f"{bg_type}_{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.jpg"
+
+class BackgroundIndex:
+    """SQLite index of cached background files shared by every process using a directory"""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Open (or create) the index of a background directory.
+        Images already in the directory when the index is created are adopted into it.
+        Args:
+            directory (str): Background directory; the index lives in it as INDEX_FILENAME.
+            max_bytes (int): Size budget of indexed files; least recently used files are evicted beyond it.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._evicting = False
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, INDEX_FILENAME), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS backgrounds (bg_type TEXT NOT NULL, url TEXT NOT NULL, path TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL, PRIMARY KEY (bg_type, url))")
+        self._db.execute("CREATE INDEX IF NOT EXISTS backgrounds_last_used ON backgrounds (last_used)")
+        self._db.commit()
+        if self._db.execute("SELECT COUNT(*) FROM backgrounds").fetchone()[0] == 0:
+            self._adopt_existing()
+
+    def _adopt_existing(self) -> None:
+        now = time.time()
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                name = entry.name
+                if not entry.is_file() or name.startswith((".", "fallback_")) or not name.endswith((".jpg", ".png")):
+                    continue
+                bg_type = name.split("_", 1)[0]
+                self._db.execute("INSERT OR IGNORE INTO backgrounds VALUES (?, ?, ?, ?, ?)",
+                                 (bg_type, f"file:{name}", entry.path, entry.stat().st_size, now))
+            self._db.commit()
+
+    def paths(self, bg_type: str) -> list[str]:
+        """Indexed files of a background type.
+        Args:
+            bg_type (str): Type of background.
+        Returns:
+            list[str]: File paths.
+        """
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT path FROM backgrounds WHERE bg_type = ?", (bg_type,))]
+
+    def choose(self, bg_type: str, rng=random) -> str:
+        """Pick a random cached file of a type and mark it as used.
+        Candidates are ordered by path, so a seeded rng picks the same file for the same cache contents.
+        Entries whose file has disappeared are dropped from the index.
+        Args:
+            bg_type (str): Type of background.
+            rng (random.Random): Random source for the pick.
+        Returns:
+            str: File path, or None if nothing of that type is cached.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute("SELECT url, path, last_used FROM backgrounds WHERE bg_type = ? ORDER BY path", (bg_type,)).fetchall()
+            while rows:
+                url, path, last_used = row = rows[rng.randrange(len(rows))]
+                if os.path.exists(path):
+                    break
+                rows.remove(row)
+                self._db.execute("DELETE FROM backgrounds WHERE bg_type = ? AND url = ?", (bg_type, url))
+                self._db.commit()
+            else:
+                return None
+            if now - last_used > TOUCH_INTERVAL_SECONDS:
+                self._db.execute("UPDATE backgrounds SET last_used = ? WHERE bg_type = ? AND url = ?", (now, bg_type, url))
+                self._db.commit()
+        return path
+
+    def add(self, bg_type: str, url: str, path: str) -> None:
+        """Record a downloaded file and start background eviction if the budget is exceeded.
+        Args:
+            bg_type (str): Type of background.
+            url (str): Source URL.
+            path (str): File the image was written to.
+        """
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO backgrounds VALUES (?, ?, ?, ?, ?)",
+                             (bg_type, url, path, os.path.getsize(path), time.time()))
+            self._db.commit()
+            over_budget = self.total_bytes() > self.max_bytes
+        if over_budget:
+            self.evict_in_background()
+
+    def total_bytes(self) -> int:
+        """Combined size of all indexed files."""
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM backgrounds").fetchone()[0]
+
+    def evict(self, max_bytes: int = None, keep: int = 0) -> int:
+        """Delete least recently used files until the index fits a byte budget.
+        Entries used within EVICTION_GRACE_SECONDS are kept even if that leaves the index over budget.
+        Args:
+            max_bytes (int, optional): Budget to enforce, defaulting to the index budget.
+            keep (int): Number of most recently used entries that are never evicted.
+        Returns:
+            int: Number of files evicted.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        cutoff = time.time() - EVICTION_GRACE_SECONDS
+        evicted = []
+        with self._lock:
+            total = self.total_bytes()
+            rows = self._db.execute("SELECT bg_type, url, path, size FROM backgrounds WHERE last_used < ? ORDER BY last_used", (cutoff,)).fetchall()
+            recent = self._db.execute("SELECT bg_type, url FROM backgrounds ORDER BY last_used DESC LIMIT ?", (keep,)).fetchall()
+            protected = set(recent)
+            for bg_type, url, path, size in rows:
+                if total <= max_bytes:
+                    break
+                if (bg_type, url) in protected:
+                    continue
+                self._db.execute("DELETE FROM backgrounds WHERE bg_type = ? AND url = ?", (bg_type, url))
+                total -= size
+                evicted.append(path)
+            self._db.commit()
+        for path in evicted:
+            try:
+                os.remove(path)
+                logger.info("🗑️ Cleaned up old background: %s", os.path.basename(path))
+            except OSError:
+                pass
+        return len(evicted)
+
+    def evict_in_background(self) -> None:
+        """Run evict() on a daemon thread unless one is already running."""
+        with self._lock:
+            if self._evicting:
+                return
+            self._evicting = True
+
+        def run():
+            try:
+                self.evict()
+            except Exception as e:
+                logger.warning("⚠️ Error during background eviction: %s", e)
+            finally:
+                self._evicting = False
+
+        threading.Thread(target=run, name="bg-evict", daemon=True).start()
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_index(directory: str) -> BackgroundIndex:
+    """Process-wide index for a background directory, reopened after a fork.
+    Args:
+        directory (str): Background directory.
+    Returns:
+        BackgroundIndex: Shared index.
+    """
+    key = os.path.abspath(directory)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.pid != os.getpid():
+            index = _indexes[key] = BackgroundIndex(directory)
+        return index
@@ -1,26 +1,104 @@
 import pygame
 import os
 import random
+import numpy as np
 from PIL import Image, ImageEnhance
-import requests
-from io import BytesIO
+import threading
 import time
+import logging
+from background_index import get_index, background_filename
+from surface_cache import SurfaceCache
+from metrics import count
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_DIR = "backgrounds"
+
+DEFAULT_BACKGROUND_TYPES = {
+    "sky": {"urls": ["https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1419242902214-272b3f66ee7a?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1517685352821-92cf88aee5a5?w=800&h=800&fit=crop"], "fallback_color": (135, 206, 235)},
+    "forest": {"urls": ["https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1518837695005-2083093ee35b?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1574263867128-a3d5c1b1deaa?w=800&h=800&fit=crop"], "fallback_color": (34, 139, 34)},
+    "ocean": {"urls": ["https://images.unsplash.com/photo-1439066615861-d1af74d74000?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1483683804023-6ccdb62f86ef?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1505142468610-359e7d316be0?w=800&h=800&fit=crop"], "fallback_color": (0, 119, 190)},
+    "mountains": {"urls": ["https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1464822759844-d150ba4ba2b8?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1506197603052-3cc9c3a201bd?w=800&h=800&fit=crop"], "fallback_color": (139, 137, 137)},
+    "sunset": {"urls": ["https://images.unsplash.com/photo-1495616811223-4d98c6e9c869?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1519904981063-b0cf448d479e?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=800&fit=crop"], "fallback_color": (255, 94, 77)}
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session(pool_size: int = 8) -> "requests.Session":
+    """Process-wide HTTP session so background downloads reuse pooled keep-alive connections.
+    requests is imported here, so renders that never download do not pay for it.
+    Args:
+        pool_size (int): Connections kept per host when the session is first created.
+    Returns:
+        requests.Session: Shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Exponential backoff with full jitter, so parallel retries do not hit the server in lockstep.
+    Args:
+        attempt (int): Zero-based number of the attempt that just failed.
+        base (float): Delay ceiling after the first failure, in seconds.
+        cap (float): Largest possible delay, in seconds.
+    Returns:
+        float: Seconds to wait before the next attempt.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+# Ready-to-blit backgrounds keyed by (path, size, opacity bucket); opacity is snapped to OPACITY_STEP.
+PREPARED_BACKGROUNDS = SurfaceCache("prepared_backgrounds", max_entries=32, max_bytes=96 * 1024 * 1024)
+OPACITY_STEP = 0.05
+
+# In-memory fallback gradients keyed by (bg_type, size), and the file path each was written to.
+_fallback_images = {}
+_fallback_paths = {}
+
+def build_fallback_image(base_color: tuple[int, int, int], size: tuple[int, int]) -> Image.Image:
+    """Build a vertical gradient that darkens the base color by up to 30% towards the bottom.
+    Rows are computed with NumPy into a one-pixel column that is stretched to the full width.
+    Args:
+        base_color (tuple[int, int, int]): Color of the top row.
+        size (tuple[int, int]): Dimensions of the image.
+    Returns:
+        Image.Image: RGB gradient image.
+    """
+    ratio = np.arange(size[1], dtype=np.float64) / size[1]
+    rows = np.array(base_color, dtype=np.float64)[None, :] * (1 - ratio * 0.3)[:, None]
+    rows = np.clip(rows.astype(np.int64), 0, 255).astype(np.uint8)
+    column = Image.fromarray(np.ascontiguousarray(rows[:, None, :]), 'RGB')
+    return column.resize(size, Image.Resampling.NEAREST)
 
 class BackgroundManager:
-    def __init__(self):
-        self.background_types = {
-            "sky": {"urls": ["https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1419242902214-272b3f66ee7a?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1517685352821-92cf88aee5a5?w=800&h=800&fit=crop"], "fallback_color": (135, 206, 235)},
-            "forest": {"urls": ["https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1518837695005-2083093ee35b?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1574263867128-a3d5c1b1deaa?w=800&h=800&fit=crop"], "fallback_color": (34, 139, 34)},
-            "ocean": {"urls": ["https://images.unsplash.com/photo-1439066615861-d1af74d74000?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1483683804023-6ccdb62f86ef?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1505142468610-359e7d316be0?w=800&h=800&fit=crop"], "fallback_color": (0, 119, 190)},
-            "mountains": {"urls": ["https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1464822759844-d150ba4ba2b8?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1506197603052-3cc9c3a201bd?w=800&h=800&fit=crop"], "fallback_color": (139, 137, 137)},
-            "sunset": {"urls": ["https://images.unsplash.com/photo-1495616811223-4d98c6e9c869?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1519904981063-b0cf448d479e?w=800&h=800&fit=crop", "https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=800&fit=crop"], "fallback_color": (255, 94, 77)}
-        }
-        os.makedirs("backgrounds", exist_ok=True)
+    def __init__(self, directory: str = BACKGROUND_DIR, background_types: dict = None):
+        """Set up a manager that caches images in a directory.
+        Args:
+            directory (str): Folder for downloaded and fallback backgrounds.
+            background_types (dict, optional): Background type to {'urls', 'fallback_color'}, defaulting to DEFAULT_BACKGROUND_TYPES.
+        """
+        self.directory = directory
+        self.background_types = background_types or DEFAULT_BACKGROUND_TYPES
+        os.makedirs(directory, exist_ok=True)
+        self.index = get_index(directory)
 
-    def download_background(self, bg_type: str) -> str:
+    def download_background(self, bg_type: str, retries: int = 3, backoff: float = 0.5, timeout: float = 10, rng=random) -> str:
         """Download a random background image of the specified type with retry logic.
+        Uses the shared pooled session and waits with jittered exponential backoff between attempts.
         Args:
             bg_type (str): Type of background to download.
+            retries (int): Number of attempts.
+            backoff (float): Base delay for the backoff, in seconds.
+            timeout (float): Per-request timeout, in seconds.
+            rng (random.Random): Random source for the URL pick.
         Returns:
             str: Path to downloaded file or None if failed.
         """
@@ -28,26 +106,37 @@ class BackgroundManager:
             return None
             
         bg_info = self.background_types[bg_type]
-        for attempt in range(3):
-            url = random.choice(bg_info["urls"])
+        session = get_session()
+        for attempt in range(retries):
+            url = rng.choice(bg_info["urls"])
             try:
-                print(f"🌅 Downloading {bg_type} background (attempt {attempt + 1}/3)...")
-                response = requests.get(url, timeout=10)
+                logger.info("🌅 Downloading %s background (attempt %d/%d)...", bg_type, attempt + 1, retries)
+                response = session.get(url, timeout=timeout)
                 if response.status_code == 200:
-                    filename = f"backgrounds/{bg_type}_{random.randint(1000, 9999)}.jpg"
-                    with open(filename, 'wb') as f:
+                    filename = os.path.join(self.directory, background_filename(bg_type, url))
+                    temp_path = os.path.join(self.directory, f".{os.path.basename(filename)}.{os.getpid()}.part")
+                    with open(temp_path, 'wb') as f:
                         f.write(response.content)
-                    print(f"✅ Background saved as {filename}")
+                    os.replace(temp_path, filename)
+                    self.index.add(bg_type, url, filename)
+                    count("background_downloads_total", result="ok")
+                    count("bytes_written_total", len(response.content), kind="background")
+                    logger.info("✅ Background saved as %s", filename)
                     return filename
                 else:
-                    print(f"❌ Failed to download background: HTTP {response.status_code}")
+                    count("background_downloads_total", result="http_error")
+                    logger.warning("❌ Failed to download background: HTTP %s", response.status_code)
             except Exception as e:
-                print(f"❌ Error downloading background: {e}")
-            time.sleep(1)  # Wait before retry
+                count("background_downloads_total", result="error")
+                logger.warning("❌ Error downloading background: %s", e)
+            if attempt + 1 < retries:
+                time.sleep(backoff_delay(attempt, backoff))
         return None
 
     def create_fallback_background(self, bg_type: str, size: tuple[int, int] = (800, 800)) -> str:
         """Create a simple gradient background if download fails.
+        The gradient is built once per (bg_type, size), kept in memory, and only written to disk
+        when its file is missing.
         Args:
             bg_type (str): Type of background.
             size (tuple[int, int]): Dimensions of the background.
@@ -56,41 +145,54 @@ class BackgroundManager:
         """
         if bg_type not in self.background_types:
             bg_type = "sky"
-            
-        base_color = self.background_types[bg_type]["fallback_color"]
-        with Image.new('RGB', size, base_color) as img:
-            for y in range(size[1]):
-                ratio = y / size[1]
-                new_color = tuple(max(0, min(255, int(c * (1 - ratio * 0.3)))) for c in base_color)
-                for x in range(size[0]):
-                    img.putpixel((x, y), new_color)
-            filename = f"backgrounds/fallback_{bg_type}.jpg"
+
+        key = (bg_type, tuple(size))
+        img = _fallback_images.get(key)
+        if img is None:
+            img = build_fallback_image(self.background_types[bg_type]["fallback_color"], key[1])
+            _fallback_images[key] = img
+            logger.info("🎨 Created fallback %s background", bg_type)
+        filename = os.path.join(self.directory, f"fallback_{bg_type}_{size[0]}x{size[1]}.jpg")
+        if not os.path.exists(filename):
             img.save(filename)
-            print(f"🎨 Created fallback {bg_type} background")
-            return filename
+        _fallback_paths[filename] = key
+        return filename
 
-    def get_background_image(self, bg_type: str = "sky", use_cache: bool = True) -> str:
+    def cached_backgrounds(self, bg_type: str) -> list[str]:
+        """Paths of downloaded images of a type that are already on disk.
+        Args:
+            bg_type (str): Type of background.
+        Returns:
+            list[str]: Cached file paths.
+        """
+        return self.index.paths(bg_type)
+
+    def get_background_image(self, bg_type: str = "sky", use_cache: bool = True, download: bool = True, rng=random) -> str:
         """Get a background image, either from cache or download new one.
         Args:
             bg_type (str): Type of background.
             use_cache (bool): Whether to use cached images.
+            download (bool): Whether a cache miss may download; otherwise the fallback is used right away.
+            rng (random.Random): Random source for picking among cached or downloadable images.
         Returns:
             str: Path to background file.
         """
         if use_cache:
-            cache_files = [f for f in os.listdir("backgrounds") if f.startswith(bg_type)]
-            if cache_files:
-                cached_file = f"backgrounds/{random.choice(cache_files)}"
-                print(f"📁 Using cached {bg_type} background: {cached_file}")
+            cached_file = self.index.choose(bg_type, rng)
+            count("cache_lookups_total", cache="backgrounds", result="hit" if cached_file else "miss")
+            if cached_file:
+                logger.info("📁 Using cached %s background: %s", bg_type, cached_file)
                 return cached_file
         
-        downloaded = self.download_background(bg_type)
+        downloaded = self.download_background(bg_type, rng=rng) if download else None
         if downloaded:
             return downloaded
         return self.create_fallback_background(bg_type)
 
     def prepare_background_surface(self, bg_path: str, opacity: float = 0.6, size: tuple[int, int] = (800, 800)) -> pygame.Surface:
         """Convert background image to pygame surface with opacity.
+        Prepared surfaces are cached in PREPARED_BACKGROUNDS with the opacity rounded to OPACITY_STEP,
+        so repeated renders skip decoding, resizing and blending. The returned surface is shared and must only be blitted.
         Args:
             bg_path (str): Path to background image.
             opacity (float): Opacity level (0.0 to 1.0).
@@ -99,28 +201,74 @@ class BackgroundManager:
             pygame.Surface: Prepared background surface.
         """
         try:
-            with Image.open(bg_path) as pil_img:
-                pil_img = pil_img.resize(size, Image.Resampling.LANCZOS)
-                if pil_img.mode != 'RGBA':
-                    pil_img = pil_img.convert('RGBA')
-                enhancer = ImageEnhance.Brightness(pil_img)
-                pil_img = enhancer.enhance(0.7)
-                img_string = pil_img.tobytes()
-                pygame_surface = pygame.image.fromstring(img_string, size, 'RGBA')
-                opacity_surface = pygame.Surface(size, pygame.SRCALPHA)
-                opacity_surface.fill((255, 255, 255, int(255 * opacity)))
-                pygame_surface.blit(opacity_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                return pygame_surface
+            opacity = round(round(opacity / OPACITY_STEP) * OPACITY_STEP, 4)
+            return PREPARED_BACKGROUNDS.get((bg_path, tuple(size), opacity), self._prepare_surface, bg_path, opacity, tuple(size))
         except Exception as e:
-            print(f"❌ Error preparing background surface: {e}")
+            logger.error("❌ Error preparing background surface: %s", e)
             fallback_surface = pygame.Surface(size)
             fallback_surface.fill((100, 100, 150))
             return fallback_surface
 
-    def get_recommended_background(self, emotion: str) -> str:
+    def _prepare_surface(self, bg_path: str, opacity: float, size: tuple[int, int]) -> pygame.Surface:
+        if opacity < 1.0:
+            # Reuse the resized, darkened image across opacities; multiplying by 255 alpha is exact,
+            # so this matches preparing the image at this opacity directly.
+            return self._apply_opacity(PREPARED_BACKGROUNDS.get((bg_path, size, 1.0), self._prepare_surface, bg_path, 1.0, size).copy(), opacity)
+        fallback_key = _fallback_paths.get(bg_path)
+        if fallback_key:
+            return self._surface_from_image(_fallback_images[fallback_key], opacity, size)
+        with Image.open(bg_path) as pil_img:
+            return self._surface_from_image(pil_img, opacity, size)
+
+    def prepare_background_strip(self, bg_path: str, opacity: float, size: tuple[int, int], top: int, height: int) -> pygame.Surface:
+        """Rows top..top+height of prepare_background_surface(bg_path, opacity, size), built on their own.
+        Only the matching band of the source image is resampled, so tiled renders never hold a full-size copy.
+        Args:
+            bg_path (str): Path to background image.
+            opacity (float): Opacity level (0.0 to 1.0).
+            size (tuple[int, int]): Dimensions of the whole canvas.
+            top (int): First canvas row of the strip.
+            height (int): Rows in the strip.
+        Returns:
+            pygame.Surface: Strip of size (size[0], height).
+        """
+        opacity = round(round(opacity / OPACITY_STEP) * OPACITY_STEP, 4)
+        height = max(0, min(height, size[1] - top))
+        fallback_key = _fallback_paths.get(bg_path)
+        if fallback_key:
+            return self._surface_from_image(_fallback_images[fallback_key], opacity, size, top, height)
+        with Image.open(bg_path) as pil_img:
+            return self._surface_from_image(pil_img, opacity, size, top, height)
+
+    def _surface_from_image(self, pil_img: Image.Image, opacity: float, size: tuple[int, int], top: int = 0, height: int = None) -> pygame.Surface:
+        height = size[1] if height is None else height
+        if top == 0 and height == size[1]:
+            pil_img = pil_img.resize(size, Image.Resampling.LANCZOS)
+        else:
+            scale = pil_img.height / size[1]
+            box = (0, top * scale, pil_img.width, (top + height) * scale)
+            pil_img = pil_img.resize((size[0], height), Image.Resampling.LANCZOS, box=box)
+            size = (size[0], height)
+        if pil_img.mode != 'RGBA':
+            pil_img = pil_img.convert('RGBA')
+        enhancer = ImageEnhance.Brightness(pil_img)
+        pil_img = enhancer.enhance(0.7)
+        # BGRA matches pygame's native SRCALPHA layout, so blitting the result needs no per-pixel conversion.
+        img_string = pil_img.tobytes('raw', 'BGRA')
+        return self._apply_opacity(pygame.image.fromstring(img_string, size, 'BGRA'), opacity)
+
+    def _apply_opacity(self, surface: pygame.Surface, opacity: float) -> pygame.Surface:
+        # Same rounding as a BLEND_RGBA_MULT blit of a (255, 255, 255, alpha) fill, but touching only the alpha channel.
+        alphas = pygame.surfarray.pixels_alpha(surface)
+        alphas[...] = (alphas.astype(np.uint16) * int(255 * opacity) + 255) >> 8
+        del alphas
+        return surface
+
+    def get_recommended_background(self, emotion: str, rng=random) -> str:
         """Suggest background type based on detected emotion.
         Args:
             emotion (str): Detected emotion.
+            rng (random.Random): Random source for the pick.
         Returns:
             str: Recommended background type.
         """
@@ -135,22 +283,17 @@ class BackgroundManager:
             "neutral": ["sky", "forest", "ocean", "mountains"]
         }
         recommended = emotion_backgrounds.get(emotion, ["sky", "forest", "ocean"])
-        return random.choice(recommended)
+        return rng.choice(recommended)
 
     def cleanup_old_backgrounds(self, keep_recent: int = 5) -> None:
         """Clean up old background files to save space.
+        Renders no longer call this; the index evicts on its own once its byte budget is exceeded.
         Args:
-            keep_recent (int): Number of recent files to keep.
+            keep_recent (int): Number of most recently used files to keep.
         """
         try:
-            bg_files = [(os.path.join("backgrounds", f), os.path.getctime(os.path.join("backgrounds", f))) 
-                       for f in os.listdir("backgrounds") if f.endswith(('.jpg', '.png'))]
-            bg_files.sort(key=lambda x: x[1], reverse=True)
-            for filepath, _ in bg_files[keep_recent:]:
-                os.remove(filepath)
-                print(f"🗑️ Cleaned up old background: {os.path.basename(filepath)}")
+            self.index.evict(max_bytes=0, keep=keep_recent)
         except PermissionError as e:
-            print(f"⚠️ Permission denied during cleanup: {e}")
+            logger.warning("⚠️ Permission denied during cleanup: %s", e)
         except Exception as e:
-            print(f"⚠️ Error during cleanup: {e}")
-            
\ No newline at end of file
+            logger.warning("⚠️ Error during cleanup: %s", e)
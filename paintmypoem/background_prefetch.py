@@ -0,0 +1,107 @@
+"""
+Background prefetcher for PaintMyPoem
+Warms the background image cache on a small thread pool so renders never wait on the network
+
+Usage:
+    python background_prefetch.py                # every background type
+    python background_prefetch.py sky ocean --workers 2
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from background_manager import BackgroundManager, get_session
+
+class BackgroundPrefetcher:
+    """Downloads one image for every background type that has nothing cached yet"""
+
+    def __init__(self, manager: BackgroundManager = None, max_workers: int = 4, retries: int = 3, backoff: float = 0.5, timeout: float = 10):
+        """Create a prefetcher.
+        Args:
+            manager (BackgroundManager, optional): Manager whose directory and URLs are used.
+            max_workers (int): Maximum concurrent downloads.
+            retries (int): Attempts per background type.
+            backoff (float): Base delay of the jittered exponential backoff, in seconds.
+            timeout (float): Per-request timeout, in seconds.
+        """
+        self.manager = manager or BackgroundManager()
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._pool = None
+        self._futures = {}
+
+    def missing_types(self, bg_types: list[str] = None) -> list[str]:
+        """Background types without a cached image.
+        Args:
+            bg_types (list[str], optional): Types to check, defaulting to all known types.
+        Returns:
+            list[str]: Types that would need a download.
+        """
+        bg_types = bg_types or list(self.manager.background_types)
+        return [bg_type for bg_type in bg_types if not self.manager.cached_backgrounds(bg_type)]
+
+    def _fetch(self, bg_type: str) -> str:
+        return self.manager.download_background(bg_type, self.retries, self.backoff, self.timeout)
+
+    def start(self, bg_types: list[str] = None) -> dict[str, Future]:
+        """Start downloading missing background types in the background and return immediately.
+        Args:
+            bg_types (list[str], optional): Types to warm, defaulting to all known types.
+        Returns:
+            dict[str, Future]: Pending download per type; each resolves to a path or None.
+        """
+        missing = [bg_type for bg_type in self.missing_types(bg_types) if bg_type not in self._futures]
+        if missing and self._pool is None:
+            get_session(self.max_workers)
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bg-prefetch")
+        for bg_type in missing:
+            self._futures[bg_type] = self._pool.submit(self._fetch, bg_type)
+        return dict(self._futures)
+
+    def wait(self, timeout: float = None) -> dict[str, str]:
+        """Wait for started downloads and shut the pool down.
+        Args:
+            timeout (float, optional): Seconds to wait per download before giving up on it.
+        Returns:
+            dict[str, str]: Downloaded path per type, or None where the download failed or timed out.
+        """
+        results = {}
+        for bg_type, future in self._futures.items():
+            try:
+                results[bg_type] = future.result(timeout)
+            except Exception:
+                results[bg_type] = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._futures = {}
+        return results
+
+    def prefetch(self, bg_types: list[str] = None) -> dict[str, str]:
+        """Download every missing background type and wait for the results.
+        Args:
+            bg_types (list[str], optional): Types to warm, defaulting to all known types.
+        Returns:
+            dict[str, str]: Downloaded path per type that was missing.
+        """
+        self.start(bg_types)
+        return self.wait()
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm the background image cache.")
+    parser.add_argument("types", nargs="*", help="Background types to fetch (default: all)")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent downloads")
+    parser.add_argument("--retries", type=int, default=3, help="Attempts per background type")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = BackgroundPrefetcher(max_workers=args.workers, retries=args.retries).prefetch(args.types or None)
+    failed = [bg_type for bg_type, path in results.items() if path is None]
+    print(f"🌄 Prefetched {len(results) - len(failed)}/{len(results)} backgrounds in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
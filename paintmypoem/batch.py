@@ -0,0 +1,148 @@
+"""
+Batch rendering for PaintMyPoem
+Renders every poem in a directory on a process pool and writes a result manifest
+
+Usage:
+    python batch.py "../sample poems" --out out --style auto --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from styles import StylePresets
+from metrics import REGISTRY, trace, write_prometheus
+
+def init_worker() -> None:
+    """Initialize the Pygame font module once per worker process; rendering is offscreen, so no display is opened."""
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+    import pygame
+    pygame.font.init()
+
+def render_file(poem_path: str, out_dir: str, style: str = "auto", background: str = None, size: tuple[int, int] = (800, 800), seed: int = None, renditions: list[str] = None) -> dict:
+    """Render one poem file inside a worker and describe the outcome.
+    Args:
+        poem_path (str): Path to the poem text file.
+        out_dir (str): Directory for the rendered image.
+        style (str): Style name or 'auto'.
+        background (str, optional): Background type, 'auto', or None.
+        size (tuple[int, int]): Dimensions of the artwork.
+        seed (int, optional): Render seed for reproducible output.
+        renditions (list[str], optional): Extra renditions to export next to the image.
+    Returns:
+        dict: Manifest record with status, timings and analysis summary, plus the worker's 'trace'.
+    """
+    from pipeline import render_poem
+    start = time.perf_counter()
+    stem = os.path.splitext(os.path.basename(poem_path))[0]
+    record = {"poem": poem_path, "pid": os.getpid()}
+    try:
+        with open(poem_path, encoding="utf-8") as f:
+            poem = f.read()
+        output_path = os.path.join(out_dir, f"{stem}.png")
+        with trace() as current:
+            record.update(render_poem(poem, output_path, style, background, size, seed, renditions))
+        record["status"] = "ok"
+        record["trace"] = current
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+def find_poems(poem_dir: str) -> list[str]:
+    """List poem files in a directory in a stable order.
+    Args:
+        poem_dir (str): Directory containing .txt poems.
+    Returns:
+        list[str]: Sorted poem file paths.
+    """
+    if not os.path.isdir(poem_dir):
+        raise ValueError(f"Not a directory: {poem_dir}")
+    return sorted(os.path.join(poem_dir, name) for name in os.listdir(poem_dir) if name.endswith(".txt"))
+
+def run_batch(poem_dir: str, out_dir: str, style: str = "auto", background: str = None, workers: int = None, size: tuple[int, int] = (800, 800), seed: int = None, renditions: list[str] = None) -> dict:
+    """Render all poems in a directory on a process pool.
+    Missing backgrounds are downloaded once up front so workers never hit the network.
+    Results are appended to 'manifest.jsonl' in the output directory as they complete, each with its
+    per-stage timings, and the merged stage histograms and counters are written to 'metrics.prom'.
+    Args:
+        poem_dir (str): Directory containing .txt poems.
+        out_dir (str): Directory for images and the manifest.
+        style (str): Style name or 'auto'.
+        background (str, optional): Background type, 'auto', or None.
+        workers (int, optional): Number of worker processes (defaults to the CPU count).
+        size (tuple[int, int]): Dimensions of the artwork.
+        seed (int, optional): Render seed shared by every poem, making the batch reproducible.
+        renditions (list[str], optional): Names from image_renderer.RENDITIONS to export for every poem.
+    Returns:
+        dict: Summary with counts, elapsed time and throughput.
+    """
+    poems = find_poems(poem_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    if background:
+        from background_prefetch import BackgroundPrefetcher
+        BackgroundPrefetcher().prefetch(None if background == "auto" else [background])
+    workers = workers or os.cpu_count() or 1
+    manifest_path = os.path.join(out_dir, "manifest.jsonl")
+    succeeded = failed = 0
+    start = time.perf_counter()
+    with open(manifest_path, "w", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = [pool.submit(render_file, path, out_dir, style, background, size, seed, renditions) for path in poems]
+        for future in as_completed(futures):
+            record = future.result()
+            current = record.pop("trace", None)
+            if current is not None:
+                REGISTRY.merge(current)
+                record.update(current.to_json())
+            manifest.write(json.dumps(record) + "\n")
+            if record["status"] == "ok":
+                succeeded += 1
+            else:
+                failed += 1
+    elapsed = time.perf_counter() - start
+    metrics_path = os.path.join(out_dir, "metrics.prom")
+    write_prometheus(metrics_path)
+    return {
+        "poems": len(poems),
+        "succeeded": succeeded,
+        "failed": failed,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "poems_per_second": round(len(poems) / elapsed, 3) if elapsed > 0 else 0.0,
+        "manifest": manifest_path,
+        "metrics": metrics_path
+    }
+
+def main(argv: list[str] = None) -> int:
+    styles = [style_id for style_id, _, _ in StylePresets().get_available_styles()]
+    parser = argparse.ArgumentParser(description="Render a directory of poems without prompts.")
+    parser.add_argument("poem_dir", help="Directory containing .txt poems")
+    parser.add_argument("--out", default="output", help="Output directory for images and manifest")
+    parser.add_argument("--style", default="auto", choices=styles + ["auto"])
+    parser.add_argument("--background", default="none", choices=["none", "auto", "sky", "forest", "ocean", "mountains", "sunset"])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--size", type=int, default=800, help="Square canvas size in pixels")
+    parser.add_argument("--seed", type=int, default=None, help="Render seed for reproducible images")
+    parser.add_argument("--renditions", default="", help="Comma-separated extra renditions, e.g. share,webp,thumb_256")
+    args = parser.parse_args(argv)
+
+    background = None if args.background == "none" else args.background
+    renditions = [name.strip() for name in args.renditions.split(",") if name.strip()]
+    if renditions:
+        from image_renderer import RENDITIONS
+        unknown = [name for name in renditions if name not in RENDITIONS]
+        if unknown:
+            parser.error(f"unknown renditions {unknown}; choose from {', '.join(RENDITIONS)}")
+    summary = run_batch(args.poem_dir, args.out, args.style, background, args.workers, (args.size, args.size), args.seed, renditions)
+    print(f"🎨 Rendered {summary['succeeded']}/{summary['poems']} poems with {summary['workers']} workers "
+          f"in {summary['seconds']:.2f}s ({summary['poems_per_second']:.2f} poems/sec)")
+    if summary["failed"]:
+        print(f"⚠️ {summary['failed']} poems failed, see {summary['manifest']}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
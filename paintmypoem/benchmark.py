@@ -0,0 +1,599 @@
+"""
+Micro-benchmarks for PaintMyPoem
+Compares hot paths against the implementations they replaced
+
+Usage:
+    python benchmark.py matcher
+    python benchmark.py fallback
+    python benchmark.py handoff
+    python benchmark.py export
+    python benchmark.py animation
+    python benchmark.py layers
+    python benchmark.py stages --save-baseline benchmark_baseline.json
+    python benchmark.py stages --baseline benchmark_baseline.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import copy
+import glob
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+
+SAMPLE_POEMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample poems")
+
+CHORUS = ("Oh baby baby, the sun is gonna shine tonight\n"
+          "Dancing in the rain, holding on so tight\n"
+          "Your heart is a fire and my love is a flame\n"
+          "Sunday morning, nothing's ever gonna be the same\n")
+
+def load_sample_poems() -> list[str]:
+    """Read the bundled sample poems.
+    Returns:
+        list[str]: Poem texts, in file name order.
+    """
+    paths = sorted(glob.glob(os.path.join(SAMPLE_POEMS_DIR, "*.txt")))
+    poems = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            poems.append(f.read())
+    return poems
+
+def synthetic_inputs() -> dict[str, str]:
+    """Build long inputs that stress text analysis.
+    Returns:
+        dict[str, str]: Input name mapped to text.
+    """
+    poems = load_sample_poems()
+    return {
+        "sample_poem": poems[0],
+        "epic_50_pages": "\n\n".join(poems) * 100,
+        "lyrics_dump_1mb": CHORUS * (1_000_000 // len(CHORUS))
+    }
+
+def time_call(func, repeat: int = 5, setup=None) -> float:
+    """Best-of-N wall-clock time of a call in milliseconds.
+    Args:
+        func (callable): Zero-argument callable to time.
+        repeat (int): Number of runs.
+        setup (callable, optional): Zero-argument callable run untimed before each run.
+    Returns:
+        float: Fastest run in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def _legacy_substring_hits(text: str) -> set:
+    """Vocabulary scan as done before the compiled matcher: one substring search per word per view."""
+    from poem_analysis import EMOTION_CUES, MOOD_KEYWORDS, VISUAL_WORD_CATEGORIES, THEMES, MOOD_DESCRIPTORS
+    text_lower = text.lower()
+    hits = set()
+    for vocabularies in (EMOTION_CUES, MOOD_KEYWORDS, VISUAL_WORD_CATEGORIES, THEMES, MOOD_DESCRIPTORS):
+        for words in vocabularies.values():
+            for word in words:
+                if word in text_lower:
+                    hits.add(word)
+    return hits
+
+def bench_keyword_matcher(repeat: int = 5) -> list[dict]:
+    """Compare the compiled keyword matcher with per-word substring scans.
+    Args:
+        repeat (int): Runs per measurement.
+    Returns:
+        list[dict]: One row per input with timings in milliseconds.
+    """
+    from poem_analysis import MATCHER
+    rows = []
+    for name, text in synthetic_inputs().items():
+        text_lower = text.lower()
+        legacy_ms = time_call(lambda: _legacy_substring_hits(text), repeat)
+        matcher_ms = time_call(lambda: MATCHER.find(text_lower), repeat)
+        rows.append({
+            "input": name,
+            "chars": len(text),
+            "legacy_ms": round(legacy_ms, 3),
+            "matcher_ms": round(matcher_ms, 3),
+            "speedup": round(legacy_ms / matcher_ms, 2) if matcher_ms else None,
+            "legacy_hits": len(_legacy_substring_hits(text)),
+            "matcher_hits": len(MATCHER.find(text_lower))
+        })
+    return rows
+
+def _legacy_putpixel_fallback(base_color: tuple[int, int, int], size: tuple[int, int]):
+    """Fallback background as built before vectorization: one putpixel call per pixel."""
+    from PIL import Image
+    img = Image.new('RGB', size, base_color)
+    for y in range(size[1]):
+        ratio = y / size[1]
+        new_color = tuple(max(0, min(255, int(c * (1 - ratio * 0.3)))) for c in base_color)
+        for x in range(size[0]):
+            img.putpixel((x, y), new_color)
+    return img
+
+def bench_fallback_background(repeat: int = 5) -> list[dict]:
+    """Compare per-pixel fallback generation with the vectorized and memoized versions.
+    Args:
+        repeat (int): Runs per measurement.
+    Returns:
+        list[dict]: One row per canvas size with per-image timings in milliseconds.
+    """
+    from background_manager import BackgroundManager, build_fallback_image
+    rows = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            manager = BackgroundManager()
+            base_color = manager.background_types["sky"]["fallback_color"]
+            for size in [(400, 400), (800, 800), (1080, 1080)]:
+                legacy_ms = time_call(lambda: _legacy_putpixel_fallback(base_color, size), max(1, repeat // 2))
+                vectorized_ms = time_call(lambda: build_fallback_image(base_color, size), repeat)
+                manager.create_fallback_background("sky", size)
+                memoized_ms = time_call(lambda: manager.create_fallback_background("sky", size), repeat)
+                rows.append({
+                    "size": f"{size[0]}x{size[1]}",
+                    "putpixel_ms": round(legacy_ms, 3),
+                    "vectorized_ms": round(vectorized_ms, 3),
+                    "memoized_ms": round(memoized_ms, 4),
+                    "speedup": round(legacy_ms / vectorized_ms, 1) if vectorized_ms else None
+                })
+        finally:
+            os.chdir(cwd)
+    return rows
+
+def _legacy_png_handoff(surface) -> tuple:
+    """Surface to PIL image as done before the in-memory bridge: PNG encode to a temp file and decode."""
+    from PIL import Image
+    import pygame
+    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
+        pygame.image.save(surface, temp_file.name)
+        temp_bytes = os.path.getsize(temp_file.name)
+        with Image.open(temp_file.name) as img:
+            img.load()
+    os.remove(temp_file.name)
+    return img, temp_bytes
+
+def _sample_art_surface(size: tuple[int, int]):
+    """Render representative art on an offscreen surface for post-processing benchmarks."""
+    import pygame
+    from art_generator import draw_vibrant_gradient_background
+    from particles import scatter_particles, draw_particles
+    surface = pygame.Surface(size)
+    draw_vibrant_gradient_background(surface, (255, 215, 0), "joy", 3, size)
+    draw_particles(surface, scatter_particles(2000, size, [(255, 105, 180), (30, 144, 255), (255, 255, 255)], "vibrant"))
+    return surface
+
+def bench_image_handoff(repeat: int = 5) -> list[dict]:
+    """Compare the temp-PNG handoff to Pillow with the in-memory surface_to_image bridge.
+    Args:
+        repeat (int): Runs per measurement.
+    Returns:
+        list[dict]: One row per canvas size with handoff and full soften_image timings in milliseconds.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from image_renderer import surface_to_image, soften_image
+    pygame.init()
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        output_path = os.path.join(workdir, "out.png")
+        for size in [(800, 800), (1080, 1080), (2048, 2048)]:
+            surface = _sample_art_surface(size)
+            legacy_img, temp_bytes = _legacy_png_handoff(surface)
+            bridged_img = surface_to_image(surface)
+            legacy_ms = time_call(lambda: _legacy_png_handoff(surface), repeat)
+            bridge_ms = time_call(lambda: surface_to_image(surface), repeat)
+            soften_ms = time_call(lambda: soften_image(surface, output_path), repeat)
+            rows.append({
+                "size": f"{size[0]}x{size[1]}",
+                "png_handoff_ms": round(legacy_ms, 3),
+                "temp_file_bytes": temp_bytes,
+                "bridge_ms": round(bridge_ms, 3),
+                "speedup": round(legacy_ms / bridge_ms, 1) if bridge_ms else None,
+                "soften_total_ms": round(soften_ms, 3),
+                "identical": legacy_img.tobytes() == bridged_img.tobytes()
+            })
+    return rows
+
+def _legacy_export(surface, workdir: str) -> None:
+    """The old export flow: raw save, polished save, then each rendition decoded from the saved PNG."""
+    import pygame
+    from PIL import Image
+    from image_renderer import soften_image, optimize_for_sharing
+    pygame.image.save(surface, os.path.join(workdir, "poem_art.png"))
+    final_path = soften_image(surface, os.path.join(workdir, "legacy_final.png"))
+    optimize_for_sharing(final_path)
+    with Image.open(final_path) as img:
+        img.save(os.path.join(workdir, "legacy.webp"), "WEBP", quality=90, method=4)
+    for side in (512, 256):
+        with Image.open(final_path) as img:
+            img.thumbnail((side, side), Image.Resampling.LANCZOS)
+            img.save(os.path.join(workdir, f"legacy_{side}.jpg"), "JPEG", quality=80)
+
+def bench_export(repeat: int = 5) -> list[dict]:
+    """Compare the old save-then-reopen export flow with export_renditions on the in-memory image.
+    Both write the polished PNG, a 1080 px JPEG, a full-size WebP and 512/256 px thumbnails.
+    Args:
+        repeat (int): Runs per measurement.
+    Returns:
+        list[dict]: One row per canvas size with both timings in milliseconds.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from image_renderer import polish_image, export_renditions
+    pygame.init()
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in [(800, 800), (2048, 2048)]:
+            surface = _sample_art_surface(size)
+            legacy_ms = time_call(lambda: _legacy_export(surface, workdir), repeat)
+            export_ms = time_call(lambda: export_renditions(polish_image(surface), os.path.join(workdir, "art"),
+                                                            ["share", "webp", "thumb_512", "thumb_256"],
+                                                            output_path=os.path.join(workdir, "final.png")), repeat)
+            rows.append({
+                "size": f"{size[0]}x{size[1]}",
+                "legacy_ms": round(legacy_ms, 3),
+                "export_ms": round(export_ms, 3),
+                "speedup": round(legacy_ms / export_ms, 2) if export_ms else None
+            })
+    return rows
+
+def bench_animation(repeat: int = 3) -> list[dict]:
+    """Frames per second of SceneAnimator's dirty-rect frames against redrawing every frame with draw_scene.
+    Uses the 'all_samples' plan with a synthetic sky background, as the stage suite does.
+    Args:
+        repeat (int): Runs per measurement.
+    Returns:
+        list[dict]: One row per style, canvas size and frame count with both rates, the mean share of the
+        canvas repainted per frame and whether the last frames match.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from emotion_detector import detect_emotion
+    from keyword_extractor import extract_visual_keywords
+    from visual_mapper import map_to_visuals
+    from styles import StylePresets
+    from art_generator import compose_scene, draw_scene
+    from animation import SceneAnimator
+    from background_manager import build_fallback_image
+    pygame.font.init()
+
+    text = _stage_inputs()["all_samples"]
+    plan = map_to_visuals(detect_emotion(text), extract_visual_keywords(text), random.Random(STAGE_SEED))
+    rows = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            os.makedirs("backgrounds")
+            build_fallback_image((135, 206, 235), (800, 800)).save(os.path.join("backgrounds", "sky_benchmark.jpg"))
+            for style in ("vibrant", "minimalist"):
+                styled = StylePresets().modify_visual_plan(copy.deepcopy(plan), style, random.Random(STAGE_SEED))
+                for size in [(800, 800), (1080, 1080)]:
+                    for frame_count in (60, 120):
+                        rng = random.Random(STAGE_SEED)
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            animator = SceneAnimator(compose_scene(styled, "sky", 0.4, size, rng), frame_count, rng)
+                        surface = pygame.Surface(size, 0, 32)
+                        full = pygame.Surface(size, 0, 32)
+
+                        def naive():
+                            for index in range(frame_count):
+                                elements, particles = animator.frame_items(index)
+                                full.fill((0, 0, 0))
+                                draw_scene(full, dict(animator.scene, elements=elements, particles=particles))
+
+                        repainted = []
+                        def incremental():
+                            repainted.clear()
+                            for _, dirty in animator.frames(surface):
+                                repainted.append(sum(rect.w * rect.h for rect in dirty))
+
+                        naive_ms = time_call(naive, repeat)
+                        incremental_ms = time_call(incremental, repeat)
+                        rows.append({
+                            "style": style,
+                            "size": f"{size[0]}x{size[1]}",
+                            "frames": frame_count,
+                            "naive_fps": round(frame_count * 1000 / naive_ms, 1),
+                            "incremental_fps": round(frame_count * 1000 / incremental_ms, 1),
+                            "speedup": round(naive_ms / incremental_ms, 2),
+                            "dirty_share": round(sum(repainted[1:]) / (len(repainted) - 1) / (size[0] * size[1]), 3) if len(repainted) > 1 else 0.0,
+                            "identical": pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(full, "RGB")
+                        })
+        finally:
+            os.chdir(cwd)
+    return rows
+
+# Edits an interactive session makes, in order: (step, style, background type, opacity, text reversed).
+LAYER_EDITS = [
+    ("first build", "vibrant", "sky", 0.4, False),
+    ("style change", "minimalist", "sky", 0.4, False),
+    ("style change", "ethereal", "sky", 0.4, False),
+    ("opacity change", "ethereal", "sky", 0.7, False),
+    ("text change", "ethereal", "sky", 0.7, True),
+    ("background change", "ethereal", None, 0.7, True),
+    ("style flip back", "vibrant", "sky", 0.4, False),
+    ("style flip back", "minimalist", "sky", 0.4, False)
+]
+
+def bench_layers(repeat: int = 3) -> list[dict]:
+    """Time LayeredCanvas re-renders through a session of style, opacity, text and background edits against full redraws.
+    Every run starts with a new canvas, so the first build and first visit of each style are cold, and
+    times each edit and the matching render_art back to back so both see the same cache and memory state.
+    Args:
+        repeat (int): Runs of the whole session.
+    Returns:
+        list[dict]: One row per canvas size and edit with both times, the changed and rebuilt layers and
+        the largest channel difference between the two results.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import numpy as np
+    import pygame
+    from emotion_detector import detect_emotion
+    from keyword_extractor import extract_visual_keywords
+    from visual_mapper import map_to_visuals
+    from styles import StylePresets
+    from art_generator import compose_scene, render_art
+    from compositor import LayeredCanvas
+    from background_manager import build_fallback_image
+    pygame.font.init()
+
+    text = _stage_inputs()["all_samples"]
+    plan = map_to_visuals(detect_emotion(text), extract_visual_keywords(text), random.Random(STAGE_SEED))
+    styled = {style: StylePresets().modify_visual_plan(copy.deepcopy(plan), style, random.Random(STAGE_SEED)) for style in {edit[1] for edit in LAYER_EDITS}}
+    rows = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            os.makedirs("backgrounds")
+            build_fallback_image((135, 206, 235), (800, 800)).save(os.path.join("backgrounds", "sky_benchmark.jpg"))
+            for size in [(800, 800), (1600, 1600)]:
+                layered_ms = [float("inf")] * len(LAYER_EDITS)
+                full_ms = [float("inf")] * len(LAYER_EDITS)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for run in range(repeat):
+                        canvas = LayeredCanvas(size)
+                        for index, (step, style, background, opacity, reverse) in enumerate(LAYER_EDITS):
+                            visual_plan = dict(styled[style], text=styled[style].get("text", [])[::-1]) if reverse else styled[style]
+                            start = time.perf_counter()
+                            canvas.render(compose_scene(visual_plan, background, opacity, size, random.Random(STAGE_SEED)))
+                            layered_ms[index] = min(layered_ms[index], (time.perf_counter() - start) * 1000)
+                            start = time.perf_counter()
+                            full = render_art(visual_plan, background, opacity, size, rng=random.Random(STAGE_SEED))
+                            full_ms[index] = min(full_ms[index], (time.perf_counter() - start) * 1000)
+                            if run < repeat - 1:
+                                continue
+                            difference = np.abs(pygame.surfarray.array3d(canvas.surface).astype(np.int16) - pygame.surfarray.array3d(full)).max()
+                            rows.append({
+                                "size": f"{size[0]}x{size[1]}",
+                                "step": step,
+                                "style": style,
+                                "background": background or "gradient",
+                                "opacity": opacity,
+                                "full_ms": round(full_ms[index], 2),
+                                "layered_ms": round(layered_ms[index], 2),
+                                "speedup": round(full_ms[index] / layered_ms[index], 2),
+                                "changed": ",".join(canvas.changed) or "-",
+                                "rebuilt": ",".join(canvas.rebuilt) or "-",
+                                "max_diff": int(difference)
+                            })
+        finally:
+            os.chdir(cwd)
+    return rows
+
+STAGE_SIZES = [(800, 800), (1600, 1600)]
+# Print sizes, drawn strip by strip and encoded straight to a PNG by render_tiled.
+TILED_STAGE_SIZES = [(4096, 4096)]
+STAGE_SEED = 1234
+
+def _stage_inputs() -> dict[str, str]:
+    """Sample poems by file name plus scaled-up concatenations of all of them."""
+    paths = sorted(glob.glob(os.path.join(SAMPLE_POEMS_DIR, "*.txt")))
+    inputs = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            inputs[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    combined = "\n\n".join(inputs.values())
+    inputs["all_samples"] = combined
+    inputs["all_samples_x10"] = "\n\n".join([combined] * 10)
+    return inputs
+
+def bench_stages(repeat: int = 5) -> list[dict]:
+    """Time each pipeline stage on its own, over the sample poems and scaled-up inputs.
+    Analysis stages run with the analysis memo cleared, so they measure real work. Plans are built from
+    a fixed seed, and backgrounds come from a synthetic image in a scratch directory, so runs are
+    reproducible and never touch the network. render_art is the drawing half of draw_art, without the
+    display flip and file save.
+    Args:
+        repeat (int): Runs per measurement.
+    Returns:
+        list[dict]: One row per stage and input with 'stage', 'input' and 'ms' (fastest run).
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+    import pygame
+    from poem_analysis import get_analysis
+    from emotion_detector import analyze_poem_mood, detect_emotion
+    from keyword_extractor import extract_visual_keywords, analyze_poem_themes
+    from visual_mapper import map_to_visuals
+    from styles import StylePresets
+    from art_generator import render_art
+    from image_renderer import soften_image, create_image_variants, polish_image, export_renditions
+    from tiled_renderer import render_tiled
+    from background_manager import build_fallback_image
+    pygame.font.init()
+
+    rows = []
+    def record(stage: str, input_name: str, func, setup=None) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ms = time_call(func, repeat, setup)
+        rows.append({"stage": stage, "input": input_name, "ms": round(ms, 3)})
+
+    inputs = _stage_inputs()
+    for name, text in inputs.items():
+        record("analyze_poem_mood", name, lambda: analyze_poem_mood(text), get_analysis.cache_clear)
+        record("extract_visual_keywords", name, lambda: extract_visual_keywords(text), get_analysis.cache_clear)
+        record("analyze_poem_themes", name, lambda: analyze_poem_themes(text), get_analysis.cache_clear)
+
+    plans = {}
+    for name, text in inputs.items():
+        emotion, keywords = detect_emotion(text), extract_visual_keywords(text)
+        record("map_to_visuals", name, lambda: map_to_visuals(emotion, keywords, random.Random(STAGE_SEED)))
+        plans[name] = map_to_visuals(emotion, keywords, random.Random(STAGE_SEED))
+
+    presets = StylePresets()
+    styles = [style_id for style_id, _, _ in presets.get_available_styles()]
+    # modify_visual_plan edits the plan it is given, so every call styles its own copy of this one;
+    # copies for the timed calls are made untimed in setup.
+    plan = plans["all_samples"]
+    fresh = []
+    for style in styles:
+        record("modify_visual_plan", style, lambda: presets.modify_visual_plan(fresh.pop(), style, random.Random(STAGE_SEED)),
+               lambda: fresh.append(copy.deepcopy(plan)))
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            os.makedirs("backgrounds")
+            build_fallback_image((135, 206, 235), (800, 800)).save(os.path.join("backgrounds", "sky_benchmark.jpg"))
+            for size in STAGE_SIZES:
+                label = f"{size[0]}x{size[1]}"
+                for style in styles:
+                    styled = presets.modify_visual_plan(copy.deepcopy(plan), style, random.Random(STAGE_SEED))
+                    for background in (None, "sky"):
+                        record("render_art", f"{style}/{background or 'gradient'}/{label}",
+                               lambda: render_art(styled, background, 0.4, size, rng=random.Random(STAGE_SEED)))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    surface = render_art(plan, "sky", 0.4, size, rng=random.Random(STAGE_SEED))
+                record("soften_image", label, lambda: soften_image(surface, os.path.join(workdir, "soft.png")))
+                record("create_image_variants", label, lambda: create_image_variants(surface, os.path.join(workdir, "variant")))
+                polished = polish_image(surface)
+                record("export_renditions", label, lambda: export_renditions(polished, os.path.join(workdir, "rendition")))
+            for size in TILED_STAGE_SIZES:
+                record("render_tiled", f"{size[0]}x{size[1]}",
+                       lambda: render_tiled(plan, os.path.join(workdir, "tiled.png"), "sky", 0.4, size, rng=random.Random(STAGE_SEED)))
+        finally:
+            os.chdir(cwd)
+    return rows
+
+def stage_results(rows: list[dict], repeat: int) -> dict:
+    """Wrap stage rows with enough environment detail to judge whether two runs are comparable.
+    Args:
+        rows (list[dict]): Output of bench_stages().
+        repeat (int): Runs per measurement.
+    Returns:
+        dict: 'environment' and 'results' (stage/input key mapped to milliseconds).
+    """
+    import pygame
+    from PIL import __version__ as pillow_version
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "pygame": pygame.version.ver,
+            "pillow": pillow_version,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": {f"{row['stage']}[{row['input']}]": row["ms"] for row in rows}
+    }
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float = 0.25, min_delta_ms: float = 1.0) -> list[dict]:
+    """Compare stage timings with a stored baseline.
+    A stage regresses when it is more than threshold slower relatively and min_delta_ms slower in
+    absolute terms; the absolute floor keeps sub-millisecond stages from flagging on timer noise.
+    Args:
+        results (dict): Output of stage_results().
+        baseline (dict): A previously saved stage_results() output.
+        threshold (float): Allowed relative slowdown, e.g. 0.25 for 25%.
+        min_delta_ms (float): Smallest absolute slowdown that can count as a regression.
+    Returns:
+        list[dict]: One row per stage present in both runs, with 'ratio' and 'regressed'.
+    """
+    rows = []
+    for key, baseline_ms in baseline["results"].items():
+        current_ms = results["results"].get(key)
+        if current_ms is None:
+            continue
+        ratio = current_ms / baseline_ms if baseline_ms else float("inf")
+        rows.append({
+            "stage": key,
+            "baseline_ms": baseline_ms,
+            "current_ms": current_ms,
+            "ratio": round(ratio, 2),
+            "regressed": ratio > 1 + threshold and current_ms - baseline_ms > min_delta_ms
+        })
+    return rows
+
+BENCHMARKS = {
+    "matcher": bench_keyword_matcher,
+    "fallback": bench_fallback_background,
+    "handoff": bench_image_handoff,
+    "export": bench_export,
+    "animation": bench_animation,
+    "layers": bench_layers,
+    "stages": bench_stages
+}
+
+def print_rows(rows: list[dict]) -> None:
+    """Print benchmark rows as an aligned table."""
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(row.get(c, ""))) for row in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run PaintMyPoem micro-benchmarks.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS), help="Benchmark to run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    parser.add_argument("--json", default=None, help="stages: write results to this JSON file")
+    parser.add_argument("--save-baseline", default=None, help="stages: write results as the new baseline")
+    parser.add_argument("--baseline", default=None, help="stages: compare with this baseline and exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.25, help="stages: allowed relative slowdown (default 0.25)")
+    args = parser.parse_args(argv)
+    if args.benchmark != "stages" and (args.json or args.save_baseline or args.baseline):
+        parser.error("--json, --save-baseline and --baseline only apply to the stages benchmark")
+
+    rows = BENCHMARKS[args.benchmark](args.repeat)
+    print_rows(rows)
+    if args.benchmark != "stages":
+        return 0
+    results = stage_results(rows, args.repeat)
+    for path in filter(None, [args.json, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Saved stage timings to {path}")
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    comparison = compare_to_baseline(results, baseline, args.threshold)
+    regressions = [row for row in comparison if row["regressed"]]
+    print()
+    print_rows(regressions or comparison)
+    if regressions:
+        print(f"❌ {len(regressions)} of {len(comparison)} stages regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"✅ No stage regressed by more than {args.threshold:.0%} ({len(comparison)} compared)")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+Layered compositing for PaintMyPoem
+Splits a scene into background, overlay, shapes, particles, text and fog layers keyed by the scene
+fields each one depends on, and re-renders only what a change touches: the backdrop is one opaque
+blit of art_generator's cached photo or gradient surface and foreground layers are lists of cached
+premultiplied sprites, rebuilt only when their key changes. Layers are drawn with the same stamps as
+art_generator.draw_foreground and match render_art exactly.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from art_generator import FOREGROUND_LAYERS, PHOTO_BACKDROPS, draw_backdrop, layer_stamps, stamp
+from metrics import span, count
+
+LAYER_ORDER = ["background", "overlay"] + FOREGROUND_LAYERS
+
+# Foreground layers whose sprite lists each canvas keeps.
+STAMP_LISTS = 32
+
+def layer_keys(scene: dict) -> dict[str, tuple]:
+    """Inputs of every layer of a scene; a layer is rebuilt only when its key changes.
+    Args:
+        scene (dict): Result of art_generator.compose_scene.
+    Returns:
+        dict[str, tuple]: Layer name mapped to its key, or None for layers with nothing to draw.
+    """
+    size = scene["size"]
+    if scene["background_path"]:
+        background = ("background", size, scene["background_path"], scene["background_opacity"])
+        overlay = ("overlay", size, scene["background_color"])
+    else:
+        background = ("gradient", size, scene["background_color"], scene["emotion"], scene["gradient_complexity"])
+        overlay = None
+    elements = tuple((e["type"], tuple(e["position"]), e["size"], tuple(e["color"]), e.get("alpha", 255)) for e in scene["elements"])
+    return {
+        "background": background,
+        "overlay": overlay,
+        "shapes": ("shapes", size, scene["style_name"], elements) if elements else None,
+        "particles": ("particles", size, tuple(scene["particles"])) if scene["particles"] else None,
+        "text": ("text", size, scene["text_band"], scene["font_size"], scene["shadow_offset"], tuple(scene["words"])),
+        "fog": ("fog", size, tuple(scene["fog"])) if scene["fog"] else None
+    }
+
+class LayeredCanvas:
+    """A canvas re-rendered layer by layer, reusing every layer whose inputs did not change"""
+
+    def __init__(self, size: tuple[int, int] = (800, 800), surface: pygame.Surface = None):
+        """Create the canvas.
+        Args:
+            size (tuple[int, int]): Dimensions of the artwork.
+            surface (pygame.Surface, optional): Surface to composite into, e.g. the display. A new 32-bit surface is created if omitted.
+        """
+        self.size = tuple(size)
+        self.surface = surface if surface is not None else pygame.Surface(self.size, 0, 32)
+        self.keys = {}
+        self.changed = []
+        self.rebuilt = []
+        self._stamps = OrderedDict()
+
+    def render(self, scene: dict) -> pygame.Surface:
+        """Bring the canvas up to date with a scene.
+        Recent sprite lists are cached by layer key, so flipping back to an earlier style rebuilds nothing.
+        Afterwards self.changed names the layers whose keys changed and self.rebuilt the ones among them
+        that had to be built rather than taken from a cache. Backdrops are one opaque blit of the photo or
+        gradient surface art_generator caches for every whole-canvas draw; a photo backdrop is listed only
+        when that cache had to flatten it, a gradient never.
+        Args:
+            scene (dict): Result of art_generator.compose_scene for this canvas size.
+        Returns:
+            pygame.Surface: The composited canvas.
+        """
+        if tuple(scene["size"]) != self.size:
+            raise ValueError(f"Scene size {scene['size']} does not match canvas size {self.size}")
+        keys = layer_keys(scene)
+        self.changed = [name for name in LAYER_ORDER if keys[name] != self.keys.get(name)]
+        self.rebuilt = []
+        if not self.changed:
+            return self.surface
+        with span("composite"):
+            misses = PHOTO_BACKDROPS.misses
+            draw_backdrop(self.surface, scene)
+            if PHOTO_BACKDROPS.misses > misses:
+                self.rebuilt += ["background", "overlay"]
+            for name in FOREGROUND_LAYERS:
+                if keys[name] is not None:
+                    stamp(self.surface, self._layer_stamps(name, keys[name], scene))
+        count("layer_rebuilds_total", len(self.rebuilt))
+        self.keys = keys
+        return self.surface
+
+    def _layer_stamps(self, name: str, key: tuple, scene: dict) -> list:
+        stamps = self._stamps.get(key)
+        if stamps is None:
+            self.rebuilt.append(name)
+            with span("layers"):
+                stamps = self._stamps[key] = layer_stamps(scene, name)
+            if len(self._stamps) > STAMP_LISTS:
+                self._stamps.popitem(last=False)
+        else:
+            self._stamps.move_to_end(key)
+        return stamps
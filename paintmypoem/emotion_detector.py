@@ -1,6 +1,11 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import random
+from poem_analysis import get_analysis, get_analyzer
 
-analyzer = SentimentIntensityAnalyzer()
+def __getattr__(name: str):
+    # The VADER analyzer used to be built here at import; it is now created on first access.
+    if name == "analyzer":
+        return get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def detect_emotion(poem_text: str) -> str:
     """Detect emotion from poem text using VADER sentiment analysis.
@@ -12,28 +17,7 @@ def detect_emotion(poem_text: str) -> str:
     """
     if not poem_text or not isinstance(poem_text, str):
         raise ValueError("Invalid poem text")
-    scores = analyzer.polarity_scores(poem_text)
-    compound = scores["compound"]
-    positive = scores["pos"]
-    negative = scores["neg"]
-    if compound >= 0.6:
-        if "love" in poem_text.lower() or "heart" in poem_text.lower() or "dear" in poem_text.lower():
-            return "love"
-        else:
-            return "joy"
-    elif compound >= 0.2:
-        return "joy"
-    elif compound <= -0.6:
-        if "angry" in poem_text.lower() or "rage" in poem_text.lower() or "mad" in poem_text.lower():
-            return "anger"
-        elif "scared" in poem_text.lower() or "afraid" in poem_text.lower() or "fear" in poem_text.lower():
-            return "fear"
-        else:
-            return "sadness"
-    elif compound <= -0.2:
-        return "sadness"
-    else:
-        return "neutral"
+    return get_analysis(poem_text).emotion
 
 def get_emotion_intensity(poem_text: str) -> float:
     """Get the intensity of the detected emotion (0.0 to 1.0).
@@ -45,8 +29,7 @@ def get_emotion_intensity(poem_text: str) -> float:
     """
     if not poem_text or not isinstance(poem_text, str):
         raise ValueError("Invalid poem text")
-    scores = analyzer.polarity_scores(poem_text)
-    return abs(scores["compound"])
+    return get_analysis(poem_text).intensity
 
 def analyze_poem_mood(poem_text: str) -> dict:
     """Comprehensive poem analysis returning emotion, intensity, and keywords.
@@ -57,29 +40,14 @@ def analyze_poem_mood(poem_text: str) -> dict:
     """
     if not poem_text or not isinstance(poem_text, str):
         raise ValueError("Invalid poem text")
-    emotion = detect_emotion(poem_text)
-    intensity = get_emotion_intensity(poem_text)
-    mood_keywords = {
-        "joy": ["happy", "bright", "sun", "smile", "laugh", "dance", "celebration"],
-        "love": ["love", "heart", "dear", "beloved", "kiss", "embrace", "romance"],
-        "sadness": ["sad", "cry", "tear", "lonely", "dark", "rain", "sorrow"],
-        "anger": ["angry", "rage", "mad", "fury", "storm", "fire", "hate"],
-        "fear": ["fear", "scared", "afraid", "dark", "shadow", "nightmare", "worry"],
-        "neutral": []
-    }
-    found_keywords = [kw for kw in mood_keywords.get(emotion, []) if kw in poem_text.lower()]
-    return {
-        "emotion": emotion,
-        "intensity": intensity,
-        "mood_keywords": found_keywords,
-        "raw_scores": analyzer.polarity_scores(poem_text)
-    }
+    return get_analysis(poem_text).mood()
 
-def get_recommended_background_type(emotion: str) -> str:
+def get_recommended_background_type(emotion: str, rng=random) -> str:
     """Get recommended background type based on detected emotion.
     This integrates with the BackgroundManager system.
     Args:
         emotion (str): Detected emotion.
+        rng (random.Random): Random source for the pick.
     Returns:
         str: Recommended background type.
     """
@@ -93,7 +61,6 @@ def get_recommended_background_type(emotion: str) -> str:
         "love": ["sunset", "sky", "ocean"],
         "neutral": ["sky", "forest", "ocean", "mountains"]
     }
-    import random
     recommended = emotion_backgrounds.get(emotion, ["sky", "forest", "ocean"])
-    return random.choice(recommended)
+    return rng.choice(recommended)
     
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Font registry for PaintMyPoem
+Resolves system fonts once per process and keeps rendered words in a bounded cache
+"""
+
+import threading
+import pygame
+from surface_cache import SurfaceCache
+
+TEXT_FONT = "Georgia"
+SHADOW_COLOR = (0, 0, 0)
+
+WORD_SPRITES = SurfaceCache("word_sprites", max_entries=4096, max_bytes=32 * 1024 * 1024)
+
+_fonts = {}
+_fonts_lock = threading.Lock()
+
+def _clear_fonts() -> None:
+    with _fonts_lock:
+        _fonts.clear()
+    WORD_SPRITES.clear()
+
+def get_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    """Resolve a system font once and reuse it for the rest of the process.
+    Initializes pygame.font if needed. The registry is emptied when pygame quits, since fonts are invalid afterwards.
+    Args:
+        name (str): System font name.
+        size (int): Point size.
+        bold (bool): Whether to use the bold face.
+    Returns:
+        pygame.font.Font: Loaded font.
+    """
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        with _fonts_lock:
+            font = _fonts.get(key)
+            if font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                if not _fonts:
+                    pygame.register_quit(_clear_fonts)
+                font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+def _render_word(word: str, size: int, color: tuple[int, int, int]) -> pygame.Surface:
+    return get_font(TEXT_FONT, size, bold=True).render(word, True, color)
+
+def word_sprite(word: str, size: int, color: tuple[int, int, int], shadow: bool = False) -> pygame.Surface:
+    """Cached anti-aliased rendering of a word in the art text font.
+    Args:
+        word (str): Word to render.
+        size (int): Font size.
+        color (tuple[int, int, int]): Text color; ignored for shadows.
+        shadow (bool): Render the drop shadow instead of the word itself.
+    Returns:
+        pygame.Surface: Rendered word, shared between callers.
+    """
+    if shadow:
+        color = SHADOW_COLOR
+    return WORD_SPRITES.get((word, size, color, shadow), _render_word, word, size, color)
@@ -1,7 +1,36 @@
 from PIL import Image, ImageFilter, ImageEnhance
 import pygame
 import os
-import tempfile
+import time
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from metrics import span, count
+
+logger = logging.getLogger(__name__)
+
+def surface_to_image(pygame_surface: pygame.Surface) -> Image.Image:
+    """Copy a surface's pixels straight into a PIL image, without a PNG encode or temp file.
+    Args:
+        pygame_surface (pygame.Surface): Surface to convert.
+    Returns:
+        Image.Image: RGBA image for per-pixel alpha surfaces, RGB otherwise (as pygame.image.save writes them).
+    """
+    mode = "RGBA" if pygame_surface.get_flags() & pygame.SRCALPHA else "RGB"
+    return Image.frombytes(mode, pygame_surface.get_size(), pygame.image.tobytes(pygame_surface, mode))
+
+def polish_image(pygame_surface: pygame.Surface) -> Image.Image:
+    """Smooth the artwork and lift its colors slightly, returning the result in memory.
+    Args:
+        pygame_surface (pygame.Surface): Surface to process.
+    Returns:
+        Image.Image: Polished image.
+    """
+    with span("postprocess"):
+        img = surface_to_image(pygame_surface)
+        img = img.filter(ImageFilter.SMOOTH_MORE)
+        enhancer = ImageEnhance.Color(img)
+        return enhancer.enhance(1.1)
 
 def soften_image(pygame_surface: pygame.Surface, output_path: str = 'poem_art_final.png') -> str:
     """Apply post-processing effects to the generated artwork.
@@ -14,67 +43,167 @@ def soften_image(pygame_surface: pygame.Surface, output_path: str = 'poem_art_fi
     if pygame_surface is None:
         raise ValueError("Invalid pygame_surface")
     try:
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-            pygame.image.save(pygame_surface, temp_file.name)
-            with Image.open(temp_file.name) as img:
-                img = img.filter(ImageFilter.SMOOTH_MORE)
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.1)
-                img.save(output_path, quality=95)
-                print(f"🖼️ Final polished image saved as '{output_path}'")
-        os.remove(temp_file.name)
+        img = polish_image(pygame_surface)
+        with span("encode"):
+            img.save(output_path, quality=95)
+        count("bytes_written_total", os.path.getsize(output_path), kind="image")
+        logger.info("🖼️ Final polished image saved as '%s'", output_path)
         return output_path
     except Exception as e:
-        print(f"❌ Error in image post-processing: {e}")
+        logger.error("❌ Error in image post-processing: %s", e)
         pygame.image.save(pygame_surface, output_path)
-        print(f"🖼️ Image saved as '{output_path}' (without post-processing)")
+        logger.info("🖼️ Image saved as '%s' (without post-processing)", output_path)
         return output_path
 
-def create_image_variants(pygame_surface: pygame.Surface, base_name: str = 'poem_art') -> list[tuple[str, str]]:
+def _vintage(img: Image.Image) -> Image.Image:
+    vintage_img = ImageEnhance.Color(img.convert('RGB')).enhance(0.8)
+    return ImageEnhance.Contrast(vintage_img).enhance(1.1)
+
+IMAGE_VARIANTS = {
+    "Original": lambda img: img,
+    "Soft": lambda img: img.filter(ImageFilter.SMOOTH_MORE),
+    "Vibrant": lambda img: ImageEnhance.Color(img).enhance(1.3),
+    "Vintage": _vintage
+}
+
+DEFAULT_VARIANTS = ["Original", "Soft", "Vibrant", "Vintage"]
+
+def _save_variant(img: Image.Image, name: str, path: str) -> float:
+    start = time.perf_counter()
+    IMAGE_VARIANTS[name](img).save(path)
+    count("bytes_written_total", os.path.getsize(path), kind="variant")
+    return time.perf_counter() - start
+
+def create_image_variants(pygame_surface: pygame.Surface, base_name: str = 'poem_art', variant_names: list[str] = None, max_workers: int = None) -> list[tuple[str, str]]:
     """Create multiple versions of the artwork with different effects.
+    Variants are filtered and PNG-encoded concurrently on a thread pool; Pillow releases the GIL for both.
     Args:
         pygame_surface (pygame.Surface): Surface to process.
         base_name (str): Base name for variant files.
+        variant_names (list[str], optional): Names from IMAGE_VARIANTS to create, defaulting to DEFAULT_VARIANTS.
+        max_workers (int, optional): Encoder threads, defaulting to one per variant.
     Returns:
-        list[tuple[str, str]]: List of (name, path) pairs for variants.
+        list[tuple[str, str]]: List of (name, path) pairs for variants, in the requested order.
     """
     if pygame_surface is None:
         raise ValueError("Invalid pygame_surface")
-    variants = []
+    variant_names = variant_names or DEFAULT_VARIANTS
+    unknown = [name for name in variant_names if name not in IMAGE_VARIANTS]
+    if unknown:
+        raise ValueError(f"Unknown image variants: {unknown}")
     try:
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-            pygame.image.save(pygame_surface, temp_file.name)
-            with Image.open(temp_file.name) as img:
-                original_path = f"{base_name}_original.png"
-                img.save(original_path)
-                variants.append(("Original", original_path))
-                
-                soft_img = img.filter(ImageFilter.SMOOTH_MORE)
-                soft_path = f"{base_name}_soft.png"
-                soft_img.save(soft_path)
-                variants.append(("Soft", soft_path))
-                
-                color_enhancer = ImageEnhance.Color(img)
-                vibrant_img = color_enhancer.enhance(1.3)
-                vibrant_path = f"{base_name}_vibrant.png"
-                vibrant_img.save(vibrant_path)
-                variants.append(("Vibrant", vibrant_path))
-                
-                vintage_img = img.convert('RGB')
-                vintage_enhancer = ImageEnhance.Color(vintage_img)
-                vintage_img = vintage_enhancer.enhance(0.8)
-                contrast_enhancer = ImageEnhance.Contrast(vintage_img)
-                vintage_img = contrast_enhancer.enhance(1.1)
-                vintage_path = f"{base_name}_vintage.png"
-                vintage_img.save(vintage_path)
-                variants.append(("Vintage", vintage_path))
-            print(f"✅ Created {len(variants)} image variants")
-        os.remove(temp_file.name)
+        start = time.perf_counter()
+        with span("variants"):
+            img = surface_to_image(pygame_surface)
+            variants = [(name, f"{base_name}_{name.lower()}.png") for name in variant_names]
+            with ThreadPoolExecutor(max_workers=max_workers or len(variants)) as pool:
+                futures = [pool.submit(contextvars.copy_context().run, _save_variant, img, name, path) for name, path in variants]
+                timings = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+        slowest = max(zip(timings, variant_names))
+        logger.info("✅ Created %d image variants in %.2fs (slowest: %s %.2fs)", len(variants), elapsed, slowest[1], slowest[0])
         return variants
     except Exception as e:
-        print(f"❌ Error creating image variants: {e}")
+        logger.error("❌ Error creating image variants: %s", e)
         return [("Original", "poem_art.png")]
 
+# Export renditions: format, longest side (None keeps the full size) and encoder options.
+RENDITIONS = {
+    "full": {"format": "PNG", "max_side": None, "options": {}},
+    "share": {"format": "JPEG", "max_side": 1080, "options": {"quality": 85, "optimize": True}},
+    "webp": {"format": "WEBP", "max_side": None, "options": {"quality": 90, "method": 4}},
+    "thumb_512": {"format": "JPEG", "max_side": 512, "options": {"quality": 80}},
+    "thumb_256": {"format": "JPEG", "max_side": 256, "options": {"quality": 80}}
+}
+
+DEFAULT_RENDITIONS = ["full", "share", "webp", "thumb_512", "thumb_256"]
+
+RENDITION_EXTENSIONS = {"PNG": "png", "JPEG": "jpg", "WEBP": "webp"}
+
+def fit_size(size: tuple[int, int], max_side: int = None) -> tuple[int, int]:
+    """Dimensions of an image scaled down to fit max_side, keeping the aspect ratio and never upscaling.
+    Args:
+        size (tuple[int, int]): Current dimensions.
+        max_side (int, optional): Longest allowed side, or None for no limit.
+    Returns:
+        tuple[int, int]: Target dimensions.
+    """
+    if max_side is None or max(size) <= max_side:
+        return tuple(size)
+    scale = max_side / max(size)
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """RGB copy of an image for formats without alpha, composited over white."""
+    if img.mode == "RGB":
+        return img
+    if img.mode == "P":
+        img = img.convert("RGBA")
+    if "A" not in img.mode:
+        return img.convert("RGB")
+    background = Image.new("RGB", img.size, (255, 255, 255))
+    background.paste(img, mask=img.split()[-1])
+    return background
+
+def _save_output(img: Image.Image, path: str) -> str:
+    img.save(path, quality=95)
+    count("bytes_written_total", os.path.getsize(path), kind="image")
+    return path
+
+def _encode(img: Image.Image, spec: dict, path: str) -> str:
+    image = _flatten(img) if spec["format"] != "PNG" else img
+    image.save(path, spec["format"], **spec["options"])
+    count("bytes_written_total", os.path.getsize(path), kind="rendition")
+    return path
+
+def export_renditions(img: Image.Image, base_name: str = "poem_art", rendition_names: list[str] = None, max_workers: int = None, output_path: str = None) -> list[tuple[str, str]]:
+    """Write a set of renditions of one in-memory image in a single pass.
+    Smaller sizes come from a downscale pyramid: each size is resized from the next larger one instead of
+    from the full image, and each level is handed to a thread-pool encoder as soon as it exists, so
+    encoding overlaps with resizing (Pillow releases the GIL in both). Encoders run in a copy of the
+    caller's context, so their byte counts reach the active metrics trace.
+    Args:
+        img (Image.Image): Final image, e.g. from polish_image().
+        base_name (str): Renditions are written as '{base_name}_{name}.{ext}'.
+        rendition_names (list[str], optional): Names from RENDITIONS, defaulting to DEFAULT_RENDITIONS.
+        max_workers (int, optional): Encoder threads, defaulting to one per file.
+        output_path (str, optional): Also write the full-size image here, in the format of its extension.
+            A '.png' output_path is also the 'full' rendition, which is then not encoded a second time.
+    Returns:
+        list[tuple[str, str]]: (name, path) pairs in the requested order, with ('output', output_path) first if given.
+    """
+    rendition_names = DEFAULT_RENDITIONS if rendition_names is None else rendition_names
+    unknown = [name for name in rendition_names if name not in RENDITIONS]
+    if unknown:
+        raise ValueError(f"Unknown renditions: {unknown}")
+    shared = "full" if output_path and output_path.lower().endswith(".png") else None
+    jobs = [(name, RENDITIONS[name], f"{base_name}_{name}.{RENDITION_EXTENSIONS[RENDITIONS[name]['format']]}")
+            for name in rendition_names if name != shared]
+    by_size = {}
+    for name, spec, path in jobs:
+        by_size.setdefault(fit_size(img.size, spec["max_side"]), []).append((name, spec, path))
+
+    start = time.perf_counter()
+    results = {}
+    with span("export"):
+        with ThreadPoolExecutor(max_workers=max_workers or max(1, len(jobs) + bool(output_path))) as pool:
+            futures = {}
+            if output_path:
+                futures["output"] = pool.submit(contextvars.copy_context().run, _save_output, img, output_path)
+            level = img
+            for target in sorted(by_size, key=lambda dims: dims[0] * dims[1], reverse=True):
+                if level.size != target:
+                    level = level.resize(target, Image.Resampling.LANCZOS, reducing_gap=2.0)
+                for name, spec, path in by_size[target]:
+                    futures[name] = pool.submit(contextvars.copy_context().run, _encode, level, spec, path)
+            for name, future in futures.items():
+                results[name] = future.result()
+    if shared:
+        results[shared] = output_path
+    logger.info("📦 Exported %d renditions of '%s' in %.2fs", len(jobs), base_name, time.perf_counter() - start)
+    exported = [("output", output_path)] if output_path else []
+    return exported + [(name, results[name]) for name in rendition_names]
+
 def apply_background_blend(pygame_surface: pygame.Surface, background_path: str, blend_mode: str = 'overlay', opacity: float = 0.3) -> str:
     """Blend the generated art with a background image using different blend modes.
     Args:
@@ -88,30 +217,29 @@ def apply_background_blend(pygame_surface: pygame.Surface, background_path: str,
     if pygame_surface is None:
         raise ValueError("Invalid pygame_surface")
     try:
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_art_file:
-            pygame.image.save(pygame_surface, temp_art_file.name)
-            with Image.open(temp_art_file.name).convert('RGBA') as art_img, Image.open(background_path).convert('RGBA') as bg_img:
-                bg_img = bg_img.resize(art_img.size, Image.Resampling.LANCZOS)
-                bg_alpha = Image.new('RGBA', bg_img.size, (255, 255, 255, int(255 * opacity)))
-                bg_img = Image.alpha_composite(bg_img, bg_alpha)
-                if blend_mode == 'overlay':
-                    blended = Image.alpha_composite(bg_img, art_img)
-                elif blend_mode == 'multiply':
-                    blended = Image.blend(bg_img.convert('RGB'), art_img.convert('RGB'), 0.7)
-                    blended = blended.convert('RGBA')
-                else:
-                    blended = Image.alpha_composite(bg_img, art_img)
-                output_path = "poem_art_blended.png"
-                blended.save(output_path)
-                print(f"🎨 Blended artwork saved as '{output_path}'")
-        os.remove(temp_art_file.name)
+        art_img = surface_to_image(pygame_surface).convert('RGBA')
+        with Image.open(background_path).convert('RGBA') as bg_img:
+            bg_img = bg_img.resize(art_img.size, Image.Resampling.LANCZOS)
+            bg_alpha = Image.new('RGBA', bg_img.size, (255, 255, 255, int(255 * opacity)))
+            bg_img = Image.alpha_composite(bg_img, bg_alpha)
+            if blend_mode == 'overlay':
+                blended = Image.alpha_composite(bg_img, art_img)
+            elif blend_mode == 'multiply':
+                blended = Image.blend(bg_img.convert('RGB'), art_img.convert('RGB'), 0.7)
+                blended = blended.convert('RGBA')
+            else:
+                blended = Image.alpha_composite(bg_img, art_img)
+            output_path = "poem_art_blended.png"
+            blended.save(output_path)
+            logger.info("🎨 Blended artwork saved as '%s'", output_path)
         return output_path
     except Exception as e:
-        print(f"❌ Error in background blending: {e}")
+        logger.error("❌ Error in background blending: %s", e)
         return None
 
 def optimize_for_sharing(image_path: str, max_size: tuple[int, int] = (1080, 1080), quality: int = 85) -> str:
-    """Optimize image for social media sharing.
+    """Optimize a saved image for social media sharing.
+    For images still in memory, export_renditions(img, base_name, ["share"]) avoids decoding the file again.
     Args:
         image_path (str): Path to the image.
         max_size (tuple[int, int]): Maximum dimensions.
@@ -122,17 +250,12 @@ def optimize_for_sharing(image_path: str, max_size: tuple[int, int] = (1080, 108
     try:
         with Image.open(image_path) as img:
             img.thumbnail(max_size, Image.Resampling.LANCZOS)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if 'A' in img.mode else None)
-                img = background
+            img = _flatten(img)
             optimized_path = image_path.replace('.png', '_optimized.jpg')
             img.save(optimized_path, 'JPEG', quality=quality, optimize=True)
-            print(f"📱 Optimized for sharing: {optimized_path}")
+            logger.info("📱 Optimized for sharing: %s", optimized_path)
             return optimized_path
     except Exception as e:
-        print(f"❌ Error optimizing image: {e}")
+        logger.error("❌ Error optimizing image: %s", e)
         return image_path
         
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Compiled multi-keyword matcher for PaintMyPoem
+Finds every vocabulary word in a text in one pass using a trie-shaped regular expression
+"""
+
+import re
+
+SIBILANT_ENDINGS = ("s", "x", "z", "ch", "sh")
+VOWELS = "aeiou"
+
+def plural(word: str) -> str:
+    """Regular English plural (or third-person singular) of a word.
+    Args:
+        word (str): Lower-case vocabulary word.
+    Returns:
+        str: "star" -> "stars", "kiss" -> "kisses", "sky" -> "skies", "go" -> "goes".
+    """
+    if word.endswith(SIBILANT_ENDINGS):
+        return word + "es"
+    if len(word) > 1 and word[-2] not in VOWELS:
+        if word[-1] == "y":
+            return word[:-1] + "ies"
+        if word[-1] == "o":
+            return word + "es"
+    return word + "s"
+
+def _trie_pattern(words: list[str]) -> str:
+    """Build a regex alternation that shares common prefixes, like a keyword trie.
+    Args:
+        words (list[str]): Vocabulary words.
+    Returns:
+        str: Regex source matching exactly one of the words.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Word-boundary-aware matcher over a fixed vocabulary, compiled once"""
+
+    def __init__(self, vocabulary):
+        words = {word.lower() for word in vocabulary if word}
+        if not words:
+            raise ValueError("Vocabulary must contain at least one word")
+        self.vocabulary = frozenset(words)
+        # Each word matches itself and its own plural only, so "wines" never counts as "win".
+        self.forms = {word: word for word in words}
+        for word in words:
+            self.forms.setdefault(plural(word), word)
+        self.pattern = re.compile(r"\b(" + _trie_pattern(sorted(self.forms)) + r")\b")
+
+    def find(self, text_lower: str) -> frozenset:
+        """Return the vocabulary words that occur as whole words, or as their regular plural, in the text.
+        "sun" matches "sun" and "suns" but not "sunday" or "sunlight"; "win" does not match "wines".
+        Args:
+            text_lower (str): Lower-cased text to scan.
+        Returns:
+            frozenset: Matched vocabulary words.
+        """
+        return frozenset(self.forms[form] for form in self.pattern.findall(text_lower))
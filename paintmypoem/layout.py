@@ -0,0 +1,58 @@
+"""
+Canvas layout for PaintMyPoem
+Visual plans store positions as fractions of the canvas and lengths as fractions of its shorter side,
+so one plan renders at any resolution. Layout is designed on an 800x800 canvas, where every length
+maps back to the pixel value it was designed with.
+"""
+
+DESIGN_SIZE = 800
+
+def normalize_point(x: float, y: float) -> tuple[float, float]:
+    """Convert a point on the design canvas to canvas fractions.
+    Args:
+        x (float): Design-canvas x in pixels.
+        y (float): Design-canvas y in pixels.
+    Returns:
+        tuple[float, float]: Fractions of the canvas width and height.
+    """
+    return (x / DESIGN_SIZE, y / DESIGN_SIZE)
+
+def normalize_length(length: float) -> float:
+    """Convert a design-canvas length in pixels to a fraction of the canvas's shorter side."""
+    return length / DESIGN_SIZE
+
+def canvas_scale(size: tuple[int, int]) -> float:
+    """Pixels per design pixel for lengths on a canvas (based on its shorter side)."""
+    return min(size) / DESIGN_SIZE
+
+def to_pixels(point: tuple[float, float], size: tuple[int, int]) -> tuple[int, int]:
+    """Convert a point in canvas fractions to pixel coordinates.
+    Args:
+        point (tuple[float, float]): Fractions of the canvas width and height.
+        size (tuple[int, int]): Canvas dimensions.
+    Returns:
+        tuple[int, int]: Pixel coordinates.
+    """
+    return (round(point[0] * size[0]), round(point[1] * size[1]))
+
+def length_to_pixels(length: float, size: tuple[int, int], minimum: int = 1) -> int:
+    """Convert a length in fractions of the shorter side to whole pixels, at least minimum.
+    Args:
+        length (float): Fraction of the canvas's shorter side.
+        size (tuple[int, int]): Canvas dimensions.
+        minimum (int): Smallest result.
+    Returns:
+        int: Length in pixels.
+    """
+    return max(minimum, round(length * min(size)))
+
+def scale_length(design_pixels: float, size: tuple[int, int], minimum: int = 1) -> int:
+    """Scale a fixed design-canvas length (a border width, a margin) to a canvas.
+    Args:
+        design_pixels (float): Length in pixels on the design canvas.
+        size (tuple[int, int]): Canvas dimensions.
+        minimum (int): Smallest result.
+    Returns:
+        int: Length in pixels.
+    """
+    return max(minimum, round(design_pixels * canvas_scale(size)))
@@ -1,26 +1,37 @@
 import os
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
 import logging
-from emotion_detector import detect_emotion, get_recommended_background_type, analyze_poem_mood
-from keyword_extractor import extract_keywords, extract_visual_keywords, analyze_poem_themes
+from emotion_detector import get_recommended_background_type
+from analysis_cache import get_default_cache
 from visual_mapper import map_to_visuals
-from art_generator import draw_art
-from image_renderer import soften_image, create_image_variants
 from styles import get_style_menu, auto_select_style, StylePresets
+import copy
 import random
-import pygame
+import threading
+import time
 
 logging.basicConfig(level=logging.INFO, filename='paintmypoem.log')
 
+BACKGROUND_CHOICES = ['sky', 'forest', 'ocean', 'mountains', 'sunset']
+
 def initialize_pygame(size=(800, 800)):
     """Initialize Pygame with given size and return the display surface."""
+    import pygame
     pygame.init()
     return pygame.display.set_mode(size)
 
 def cleanup_pygame():
     """Clean up Pygame resources."""
+    import pygame
     pygame.quit()
 
+def start_background_prefetch() -> None:
+    """Warm missing backgrounds while the user types, loading the rendering stack off the main thread."""
+    def run():
+        from background_prefetch import BackgroundPrefetcher
+        BackgroundPrefetcher().start()
+    threading.Thread(target=run, name="bg-prefetch-start", daemon=True).start()
+
 def main():
     print("🎨 Welcome to PaintMyPoem! 🎨")
     print("Enter your poem (end with an empty line):")
@@ -42,7 +53,8 @@ def main():
     print("🔍 ANALYZING YOUR POEM...")
     print("="*50)
 
-    mood_analysis = analyze_poem_mood(poem)
+    analysis = get_default_cache().get_analysis(poem)
+    mood_analysis = analysis.mood()
     emotion = mood_analysis["emotion"]
     intensity = mood_analysis["intensity"]
     
@@ -50,8 +62,8 @@ def main():
     if mood_analysis["mood_keywords"]:
         print(f"🏷️  Mood Keywords: {', '.join(mood_analysis['mood_keywords'])}")
 
-    visual_keywords = extract_visual_keywords(poem, 5)
-    theme_analysis = analyze_poem_themes(poem)
+    visual_keywords = analysis.visual_keywords(5)
+    theme_analysis = analysis.themes
     
     print(f"📝 Visual Keywords: {visual_keywords}")
     print(f"🎯 Primary Theme: {theme_analysis['primary_theme'].title()}")
@@ -84,9 +96,9 @@ def main():
         background_type = recommended_bg
         print(f"🌅 Using {recommended_bg} background...")
     elif use_background == 'custom':
-        print("Available backgrounds: sky, forest, ocean, mountains, sunset")
+        print(f"Available backgrounds: {', '.join(BACKGROUND_CHOICES)}")
         custom_bg = input("Enter background type: ").lower().strip()
-        if custom_bg in ['sky', 'forest', 'ocean', 'mountains', 'sunset']:
+        if custom_bg in BACKGROUND_CHOICES:
             background_type = custom_bg
             print(f"🌅 Using {custom_bg} background...")
         else:
@@ -98,21 +110,76 @@ def main():
         background_opacity = max(0.2, 0.6 - (intensity * 0.3))
         print(f"🔧 Background opacity: {background_opacity:.1f}")
 
-    visual_plan = map_to_visuals(emotion, visual_keywords)
+    seed = random.randrange(2**32)
+    base_plan = map_to_visuals(emotion, visual_keywords)
     style_manager = StylePresets()
-    visual_plan = style_manager.modify_visual_plan(visual_plan, selected_style)
+
+    def styled_plan(style_name: str) -> dict:
+        # Styles are applied to a fresh copy of the same plan with the same seed, so switching back
+        # to a style brings back exactly the artwork it had.
+        plan = style_manager.modify_visual_plan(copy.deepcopy(base_plan), style_name, random.Random(seed))
+        if theme_analysis['primary_theme'] == 'nature':
+            plan['fog'] = True
+        return plan
+
+    visual_plan = styled_plan(selected_style)
     print(f"✨ Applied {selected_style.title()}")
-    
-    if theme_analysis['primary_theme'] == 'nature':
-        visual_plan['fog'] = True
-    
+
     print(f"🎨 Using Color Palette: {len(visual_plan['palette'])} colors")
     print(f"🔷 Generating {len(visual_plan['elements'])} visual elements...")
 
     try:
+        import pygame
+        from art_generator import compose_scene
+        from compositor import LayeredCanvas
+        from image_renderer import polish_image, export_renditions, create_image_variants
         screen = initialize_pygame()
-        draw_art(visual_plan, background_type, background_opacity, size=(800, 800))
+        canvas = LayeredCanvas(surface=screen)
+        canvas.render(compose_scene(visual_plan, background_type, background_opacity, (800, 800), random.Random(seed)))
+        pygame.display.flip()
         print("✅ Base artwork generated successfully!")
+
+        # Only the layers a change touches are redrawn, and every look tried so far stays cached.
+        print(f"\n🔁 Try other looks: styles {', '.join(style_manager.styles)}; backgrounds {', '.join(BACKGROUND_CHOICES)}, none; opacity 0.1-1.0")
+        while True:
+            change = input("Enter a style, background or opacity (or press Enter to keep this one): ").lower().strip()
+            if not change:
+                break
+            if change in style_manager.styles:
+                selected_style = change
+                visual_plan = styled_plan(selected_style)
+            elif change in BACKGROUND_CHOICES or change == 'none':
+                if background_type is None and change != 'none':
+                    background_opacity = max(0.2, 0.6 - (intensity * 0.3))
+                background_type = None if change == 'none' else change
+            else:
+                try:
+                    opacity = float(change)
+                except ValueError:
+                    opacity = None
+                if opacity is None or not 0.1 <= opacity <= 1.0:
+                    print("❌ Invalid choice. Enter a style, a background, 'none' or an opacity between 0.1 and 1.0.")
+                    continue
+                background_opacity = opacity
+            start = time.perf_counter()
+            canvas.render(compose_scene(visual_plan, background_type, background_opacity, (800, 800), random.Random(seed)))
+            pygame.display.flip()
+            print(f"🔄 {selected_style.title()} / {background_type or 'gradient'} / opacity {background_opacity:.2f} "
+                  f"in {(time.perf_counter() - start) * 1000:.1f} ms (redrawn: {', '.join(canvas.rebuilt) or 'nothing, all cached'})")
+
+        print_size = input("\nExport a print-resolution copy? Enter its width in pixels (e.g. 4096) or press Enter to skip: ").strip()
+        if print_size.isdigit() and int(print_size) > 0:
+            from tiled_renderer import render_tiled
+            side = int(print_size)
+            print_path, _ = render_tiled(visual_plan, f'poem_art_{selected_style}_{side}px.png', background_type,
+                                         background_opacity, size=(side, side), rng=random.Random(seed))
+            print(f"🖨️ Print artwork saved: {print_path}")
+
+        if input("\nSave a looping animation? (y/n): ").lower().strip() == 'y':
+            from animation import animate_art
+            animation_path = animate_art(visual_plan, f'poem_art_{selected_style}.gif', background_type, background_opacity,
+                                         size=(800, 800), rng=random.Random(seed))
+            print(f"🎞️ Animation saved: {animation_path}")
         
         create_variants = input("\nCreate multiple versions? (y/n): ").lower().strip() == 'y'
         
@@ -122,8 +189,11 @@ def main():
             for name, path in variants:
                 print(f"   📸 {name}: {path}")
         else:
-            final_path = soften_image(screen, f'poem_art_{selected_style}_final.png')
-            print(f"✅ Final artwork saved: {final_path}")
+            exported = export_renditions(polish_image(screen), f'poem_art_{selected_style}', ["share", "webp", "thumb_512", "thumb_256"],
+                                         output_path=f'poem_art_{selected_style}_final.png')
+            print(f"✅ Final artwork saved: {exported[0][1]}")
+            for name, path in exported[1:]:
+                print(f"   📸 {name}: {path}")
     except Exception as e:
         print(f"❌ Error generating artwork: {e}")
     finally:
@@ -134,10 +204,11 @@ def main():
     print("="*50)
     print(f"Your visual poem has been created in {selected_style.title()} style!")
     print("Files generated:")
-    print(f"  📄 poem_art.png - Main artwork")
-    print(f"  ✨ poem_art_{selected_style}_final.png - Polished version")
     if create_variants:
         print("  🎨 Multiple variants in different styles")
+    else:
+        print(f"  ✨ poem_art_{selected_style}_final.png - Polished version")
+        print("  📱 Sharing JPEG, WebP and thumbnails")
     print("\nThank you for using PaintMyPoem! 🎨✨")
 
 def interactive_demo():
@@ -165,15 +236,18 @@ def interactive_demo():
         print("-" * 40)
         lines = selected_poem['text'].split('\n')
         poem = '\n'.join(lines)
-        emotion = detect_emotion(poem)
-        visual_keywords = extract_visual_keywords(poem)
+        analysis = get_default_cache().get_analysis(poem)
+        emotion = analysis.emotion
+        visual_keywords = analysis.visual_keywords()
         selected_style = auto_select_style(emotion, visual_keywords)
         print(f"🤖 Auto-selected style for demo: {selected_style.title()}")
         visual_plan = map_to_visuals(emotion, visual_keywords)
         style_manager = StylePresets()
         visual_plan = style_manager.modify_visual_plan(visual_plan, selected_style)
+        from art_generator import draw_art
+        from image_renderer import soften_image
         screen = initialize_pygame()
-        draw_art(visual_plan, get_recommended_background_type(emotion), 0.4, size=(800, 800))
+        draw_art(visual_plan, get_recommended_background_type(emotion), 0.4, size=(800, 800), save_path=None)
         soften_image(screen, f"{selected_poem['title'].lower().replace(' ', '_')}_{selected_style}_art.png")
         cleanup_pygame()
         print(f"✅ Demo artwork created for '{selected_poem['title']}' in {selected_style.title()} style!")
@@ -185,6 +259,7 @@ def interactive_demo():
 if __name__ == "__main__":
     print("🎨 PaintMyPoem - Transform your poetry into visual art!")
     print()
+    start_background_prefetch()
     mode = input("Choose mode:\n1. Interactive (full features)\n2. Demo (sample poems)\nEnter choice (1-2): ").strip()
     if mode == '2':
         interactive_demo()
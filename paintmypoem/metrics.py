@@ -0,0 +1,188 @@
+"""
+Stage timing and counters for PaintMyPoem
+Spans and counters feed a process-wide registry (exported as JSON or Prometheus text) and, inside trace(),
+a per-render timing block. Recording is a perf_counter call and a dict update, cheap enough to leave on.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+PREFIX = "paintmypoem_"
+# Upper bounds in seconds of the stage duration histogram buckets.
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    "stage_seconds": "Time spent in each render stage.",
+    "renders_total": "Poems rendered.",
+    "cache_lookups_total": "Cache lookups by cache and result.",
+    "background_downloads_total": "Background download attempts by result.",
+    "bytes_written_total": "Bytes of images written or returned, by kind.",
+    "service_requests_total": "Render service requests by outcome.",
+    "layer_rebuilds_total": "Compositor layers drawn because no cached layer matched their inputs."
+}
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+def _format_labels(labels: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Trace:
+    """Stage durations and counts recorded while one render runs; picklable, so workers can return it"""
+
+    def __init__(self):
+        self.stages = {}
+        self.counts = {}
+
+    def to_json(self) -> dict:
+        """Timing block for responses and manifests.
+        Returns:
+            dict: 'stages_ms' (stage mapped to milliseconds) and 'counts' (Prometheus-style series mapped to value).
+        """
+        return {
+            "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in self.stages.items()},
+            "counts": {f"{name}{_format_labels(labels)}": value for (name, labels), value in self.counts.items()}
+        }
+
+_current_trace = ContextVar("paintmypoem_trace", default=None)
+
+class MetricsRegistry:
+    """Thread-safe counters and stage histograms of one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self.started = time.time()
+
+    def inc(self, name: str, value: float = 1, labels: tuple = ()) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [[0] * (len(STAGE_BUCKETS) + 1), 0.0, 0]
+            histogram[0][bisect_left(STAGE_BUCKETS, seconds)] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def merge(self, trace: Trace) -> None:
+        """Add a trace recorded in another process.
+        Args:
+            trace (Trace): Trace returned by a worker.
+        """
+        for stage, seconds in trace.stages.items():
+            self.observe(stage, seconds)
+        for (name, labels), value in trace.counts.items():
+            self.inc(name, value, labels)
+
+    def to_json(self) -> dict:
+        """Snapshot of every counter and stage summary.
+        Returns:
+            dict: 'uptime_seconds', 'counters' (series mapped to value) and 'stages'
+            (stage mapped to 'count', 'total_ms' and 'mean_ms').
+        """
+        with self._lock:
+            counters = {f"{name}{_format_labels(labels)}": value for (name, labels), value in sorted(self._counters.items())}
+            stages = {stage: {"count": count, "total_ms": round(total * 1000, 3), "mean_ms": round(total * 1000 / count, 3)}
+                      for stage, (_, total, count) in sorted(self._histograms.items())}
+        return {"uptime_seconds": round(time.time() - self.started, 3), "counters": counters, "stages": stages}
+
+    def to_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format.
+        Returns:
+            str: Exposition text.
+        """
+        lines = []
+        with self._lock:
+            if self._histograms:
+                metric = PREFIX + "stage_seconds"
+                lines += [f"# HELP {metric} {METRIC_HELP['stage_seconds']}", f"# TYPE {metric} histogram"]
+                for stage, (buckets, total, count) in sorted(self._histograms.items()):
+                    labels = (("stage", stage),)
+                    cumulative = 0
+                    for bound, bucket in zip(STAGE_BUCKETS + (float("inf"),), buckets):
+                        cumulative += bucket
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        bucket_labels = _format_labels(labels, f'le="{le}"')
+                        lines.append(f"{metric}_bucket{bucket_labels} {cumulative}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {total:.6f}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+            described = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = PREFIX + name
+                if name not in described:
+                    described.add(name)
+                    lines += [f"# HELP {metric} {METRIC_HELP.get(name, name)}", f"# TYPE {metric} counter"]
+                lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+REGISTRY = MetricsRegistry()
+
+@contextmanager
+def span(stage: str):
+    """Time a block as a render stage, in the registry and in the active trace.
+    Args:
+        stage (str): Stage name, e.g. 'analysis' or 'encode'.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        REGISTRY.observe(stage, seconds)
+        current = _current_trace.get()
+        if current is not None:
+            current.stages[stage] = current.stages.get(stage, 0.0) + seconds
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Increment a counter in the registry and in the active trace.
+    Args:
+        name (str): Counter name without the 'paintmypoem_' prefix, ending in '_total'.
+        value (float): Amount to add.
+        **labels: Label values, e.g. cache='render', result='hit'.
+    """
+    key = _label_key(labels)
+    REGISTRY.inc(name, value, key)
+    current = _current_trace.get()
+    if current is not None:
+        current.counts[(name, key)] = current.counts.get((name, key), 0) + value
+
+@contextmanager
+def trace():
+    """Collect the spans and counts of the enclosed render into a Trace.
+    Yields:
+        Trace: Filled in as the block runs.
+    """
+    current = Trace()
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+
+def write_prometheus(path: str, registry: MetricsRegistry = REGISTRY) -> None:
+    """Write the registry as a Prometheus text file, atomically (for node_exporter's textfile collector).
+    Args:
+        path (str): Destination, conventionally ending in '.prom'.
+        registry (MetricsRegistry): Registry to export.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(registry.to_prometheus())
+    os.replace(temp_path, path)
@@ -0,0 +1,100 @@
+"""
+Particle system for PaintMyPoem
+Scatters particles and fog puffs for a frame, then stamps them from cached sprites in one blit call
+"""
+
+import random
+import pygame
+from surface_cache import SurfaceCache
+from layout import DESIGN_SIZE, scale_length
+
+PARTICLE_SPRITES = SurfaceCache("particle_sprites", max_entries=16384, max_bytes=32 * 1024 * 1024)
+
+FOG_COLOR = (255, 255, 255)
+
+def particle_alpha_range(style_name: str) -> tuple[int, int]:
+    """Alpha range of particles for a style."""
+    if style_name == "ethereal":
+        return (60, 120)
+    elif style_name == "bold":
+        return (180, 255)
+    return (100, 200)
+
+def scatter_particles(count: int, size: tuple[int, int], colors: list[tuple[int, int, int]], style_name: str, rng=random) -> list[tuple[int, int, int, tuple[int, int, int], int]]:
+    """Pick positions, radii, colors and alphas for a frame's particles.
+    Particles stay above the text band at the bottom of the canvas. Positions and radii are drawn on the
+    design canvas and scaled, so a seeded rng scatters the same pattern at every resolution.
+    Args:
+        count (int): Number of particles.
+        size (tuple[int, int]): Canvas dimensions.
+        colors (list[tuple[int, int, int]]): Colors to choose from.
+        style_name (str): Style controlling particle alpha.
+        rng (random.Random): Random source.
+    Returns:
+        list[tuple]: (x, y, radius, color, alpha) per particle.
+    """
+    low, high = particle_alpha_range(style_name)
+    particles = []
+    sx, sy = size[0] / DESIGN_SIZE, size[1] / DESIGN_SIZE
+    for _ in range(count):
+        x = round(rng.randint(0, DESIGN_SIZE) * sx)
+        y = round(rng.randint(0, DESIGN_SIZE - 200) * sy)
+        radius = scale_length(rng.randint(2, 8), size)
+        color = tuple(rng.choice(colors))
+        alpha = rng.randint(low, high)
+        particles.append((x, y, radius, color, alpha))
+    return particles
+
+def scatter_fog(style_name: str, size: tuple[int, int], rng=random) -> list[tuple[int, int, int, tuple[int, int, int], int]]:
+    """Pick the faint white puffs that make up a style's fog.
+    Args:
+        style_name (str): 'ethereal' gets denser fog than other styles.
+        size (tuple[int, int]): Canvas dimensions.
+        rng (random.Random): Random source.
+    Returns:
+        list[tuple]: (x, y, radius, color, alpha) per puff.
+    """
+    fog_intensity = 15 if style_name == "ethereal" else 8
+    puffs = []
+    sx, sy = size[0] / DESIGN_SIZE, size[1] / DESIGN_SIZE
+    for _ in range(fog_intensity):
+        x = round(rng.randint(0, DESIGN_SIZE) * sx)
+        y = round(rng.randint(0, DESIGN_SIZE) * sy)
+        radius = scale_length(rng.randint(15, 35), size)
+        alpha = rng.randint(5, 15)
+        puffs.append((x, y, radius, FOG_COLOR, alpha))
+    return puffs
+
+def _render_particle(radius: int, color: tuple[int, int, int], alpha: int) -> pygame.Surface:
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+    return sprite
+
+def particle_sprite(radius: int, color: tuple[int, int, int], alpha: int) -> pygame.Surface:
+    """Cached transparent sprite holding one filled circle.
+    Args:
+        radius (int): Circle radius.
+        color (tuple[int, int, int]): Circle color.
+        alpha (int): Circle alpha.
+    Returns:
+        pygame.Surface: SRCALPHA sprite of size (radius*2, radius*2).
+    """
+    return PARTICLE_SPRITES.get((radius, color, alpha), _render_particle, radius, color, alpha)
+
+def draw_particles(surface: pygame.Surface, particles: list[tuple[int, int, int, tuple[int, int, int], int]], offset: tuple[int, int] = (0, 0)) -> None:
+    """Composite all particles onto a surface with a single blits() call.
+    Args:
+        surface (pygame.Surface): Target surface.
+        particles (list[tuple]): (x, y, radius, color, alpha) per particle.
+        offset (tuple[int, int]): Canvas position of the surface's top-left corner.
+    """
+    ox, oy = offset
+    sprites = {}
+    stamps = []
+    for x, y, radius, color, alpha in particles:
+        key = (radius, color, alpha)
+        sprite = sprites.get(key)
+        if sprite is None:
+            sprite = sprites[key] = PARTICLE_SPRITES.get(key, _render_particle, radius, color, alpha)
+        stamps.append((sprite, (x - radius - ox, y - radius - oy)))
+    surface.blits(stamps, doreturn=False)
@@ -0,0 +1,185 @@
+"""
+Headless rendering pipeline for PaintMyPoem
+Runs the full analysis -> plan -> style -> render chain without any prompts
+"""
+
+import io
+import os
+import random
+from emotion_detector import get_recommended_background_type
+from analysis_cache import get_default_cache
+from visual_mapper import map_to_visuals
+from art_generator import render_art
+from image_renderer import soften_image, polish_image, export_renditions, RENDITIONS
+from styles import auto_select_style, StylePresets
+from render_cache import RenderCache, render_key
+from metrics import span, count
+from tiled_renderer import render_tiled, TILED_MIN_PIXELS
+
+BACKGROUND_TYPES = ["sky", "forest", "ocean", "mountains", "sunset"]
+
+def plan_poem(poem: str, style: str = "auto", background: str = None, rng=random) -> tuple:
+    """Analyze a poem and build its styled visual plan, without drawing anything.
+    Args:
+        poem (str): Poem text.
+        style (str): Style name or 'auto' to pick one from the poem's emotion.
+        background (str, optional): Background type, 'auto' for the recommended one, or None for a gradient.
+        rng (random.Random): Random source for the background type, layout and style choices; each gets its
+            own generator seeded from rng, so the layout does not depend on the style or background asked for.
+    Returns:
+        tuple[dict, str, float, dict]: Visual plan, background type (or None), background opacity, and a
+        summary of the analysis and rendering choices.
+    """
+    if not poem or not isinstance(poem, str) or not poem.strip():
+        raise ValueError("Invalid poem text")
+    with span("analysis"):
+        analysis = get_default_cache().get_analysis(poem)
+        emotion = analysis.emotion
+        intensity = analysis.intensity
+        visual_keywords = analysis.visual_keywords(5)
+        theme_analysis = analysis.themes
+
+    background_rng, plan_rng, style_rng = (random.Random(rng.getrandbits(64)) for _ in range(3))
+    if background == "auto":
+        background_type = get_recommended_background_type(emotion, background_rng)
+    elif background in BACKGROUND_TYPES:
+        background_type = background
+    else:
+        background_type = None
+    background_opacity = max(0.2, 0.6 - (intensity * 0.3)) if background_type else 0.4
+
+    with span("plan"):
+        visual_plan = map_to_visuals(emotion, visual_keywords, plan_rng)
+    with span("style"):
+        selected_style = auto_select_style(emotion, visual_keywords) if style == "auto" else style
+        visual_plan = StylePresets().modify_visual_plan(visual_plan, selected_style, style_rng)
+    if theme_analysis["primary_theme"] == "nature":
+        visual_plan["fog"] = True
+
+    summary = {
+        "emotion": emotion,
+        "intensity": intensity,
+        "mood_keywords": analysis.mood_keywords,
+        "visual_keywords": visual_keywords,
+        "primary_theme": theme_analysis["primary_theme"],
+        "style": selected_style,
+        "background": background_type
+    }
+    return visual_plan, background_type, background_opacity, summary
+
+def render_poem_surface(poem: str, style: str = "auto", background: str = None, size: tuple[int, int] = (800, 800), seed: int = None) -> tuple:
+    """Analyze, plan and render a poem offscreen without saving anything.
+    Every random choice comes from one random.Random(seed), so equal inputs and seed give equal pixels
+    (given the same cached background images).
+    Args:
+        poem (str): Poem text.
+        style (str): Style name or 'auto' to pick one from the poem's emotion.
+        background (str, optional): Background type, 'auto' for the recommended one, or None for a gradient.
+        size (tuple[int, int]): Dimensions of the artwork.
+        seed (int, optional): Render seed; None draws a fresh one.
+    Returns:
+        tuple[pygame.Surface, dict]: Rendered surface and a summary of the analysis and rendering choices.
+    """
+    rng = random.Random(seed)
+    visual_plan, background_type, background_opacity, summary = plan_poem(poem, style, background, rng)
+    surface = render_art(visual_plan, background_type, background_opacity, size, rng=rng)
+    count("renders_total")
+    return surface, summary
+
+def render_poem(poem: str, output_path: str, style: str = "auto", background: str = None, size: tuple[int, int] = (800, 800), seed: int = None, renditions: list[str] = None) -> dict:
+    """Render a poem to an image file without user interaction.
+    Rendering is offscreen, so no Pygame display is needed. Canvases larger than TILED_MIN_PIXELS are
+    drawn and encoded strip by strip, keeping memory bounded for print sizes.
+    Args:
+        poem (str): Poem text.
+        output_path (str): Path of the final polished image.
+        style (str): Style name or 'auto' to pick one from the poem's emotion.
+        background (str, optional): Background type, 'auto' for the recommended one, or None for a gradient.
+        size (tuple[int, int]): Dimensions of the artwork.
+        seed (int, optional): Render seed for reproducible output.
+        renditions (list[str], optional): Names from image_renderer.RENDITIONS to export next to the output,
+            as '{output stem}_{name}.{ext}'. With a '.png' output_path, 'full' is the output file itself. Other
+            full-size renditions raise ValueError on tiled renders, which never hold the whole image in memory.
+    Returns:
+        dict: Summary of the analysis and the rendering choices, with 'renditions' (name mapped to path) if requested.
+    """
+    unknown = [name for name in renditions or [] if name not in RENDITIONS]
+    if unknown:
+        raise ValueError(f"Unknown renditions: {unknown}")
+    if size[0] * size[1] > TILED_MIN_PIXELS and output_path.lower().endswith(".png"):
+        full_size = [name for name in renditions or [] if not RENDITIONS[name]["max_side"] and name != "full"]
+        if full_size:
+            raise ValueError(f"Renditions {full_size} need the whole image, which a tiled {size[0]}x{size[1]} render never holds; "
+                             f"use a canvas of at most {TILED_MIN_PIXELS} pixels or drop them")
+        rng = random.Random(seed)
+        visual_plan, background_type, background_opacity, summary = plan_poem(poem, style, background, rng)
+        scaled = [name for name in renditions or [] if RENDITIONS[name]["max_side"]]
+        preview_side = max((RENDITIONS[name]["max_side"] for name in scaled), default=None)
+        _, preview = render_tiled(visual_plan, output_path, background_type, background_opacity, size, rng=rng, preview_side=preview_side)
+        count("renders_total")
+        if renditions:
+            exported = dict(export_renditions(preview, os.path.splitext(output_path)[0], scaled)) if scaled else {}
+            summary["renditions"] = {name: exported.get(name, output_path) for name in renditions}
+    else:
+        surface, summary = render_poem_surface(poem, style, background, size, seed)
+        if renditions:
+            exported = export_renditions(polish_image(surface), os.path.splitext(output_path)[0], renditions, output_path=output_path)
+            summary["renditions"] = dict(exported[1:])
+        else:
+            soften_image(surface, output_path)
+    summary["output"] = output_path
+    return summary
+
+def animate_poem(poem: str, output_path: str, style: str = "auto", background: str = None, size: tuple[int, int] = (800, 800), seed: int = None, frame_count: int = 60, fps: int = 30) -> dict:
+    """Render a poem as a looping animation of drifting particles and pulsing shapes.
+    The first frame is the still image render_poem_surface draws with the same seed.
+    Args:
+        poem (str): Poem text.
+        output_path (str): '.gif', '.png' (APNG), or a directory for numbered PNG frames.
+        style (str): Style name or 'auto' to pick one from the poem's emotion.
+        background (str, optional): Background type, 'auto' for the recommended one, or None for a gradient.
+        size (tuple[int, int]): Dimensions of the artwork.
+        seed (int, optional): Render seed for a reproducible animation.
+        frame_count (int): Frames in one loop.
+        fps (int): Playback rate.
+    Returns:
+        dict: Summary of the analysis and the rendering choices.
+    """
+    from animation import animate_art
+    rng = random.Random(seed)
+    visual_plan, background_type, background_opacity, summary = plan_poem(poem, style, background, rng)
+    animate_art(visual_plan, output_path, background_type, background_opacity, size, frame_count, fps, rng=rng)
+    count("renders_total")
+    summary["output"] = output_path
+    summary["frames"] = frame_count
+    return summary
+
+def render_poem_png(poem: str, style: str = "auto", background: str = None, size: tuple[int, int] = (800, 800), seed: int = None, cache: RenderCache = None) -> tuple[bytes, dict]:
+    """Render a poem to polished PNG bytes in memory.
+    Seeded renders are looked up in and stored to the cache, if one is given.
+    Args:
+        poem (str): Poem text.
+        style (str): Style name or 'auto' to pick one from the poem's emotion.
+        background (str, optional): Background type, 'auto' for the recommended one, or None for a gradient.
+        size (tuple[int, int]): Dimensions of the artwork.
+        seed (int, optional): Render seed; unseeded renders are never cached.
+        cache (RenderCache, optional): Store of previously rendered outputs.
+    Returns:
+        tuple[bytes, dict]: PNG data and a summary of the analysis and rendering choices.
+    """
+    key = render_key(poem, style, background, size, seed) if cache is not None and seed is not None else None
+    if key:
+        cached = cache.get(key)
+        count("cache_lookups_total", cache="render", result="hit" if cached else "miss")
+        if cached:
+            return cached
+    surface, summary = render_poem_surface(poem, style, background, size, seed)
+    image = polish_image(surface)
+    with span("encode"):
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        png = buffer.getvalue()
+    count("bytes_written_total", len(png), kind="response")
+    if key:
+        cache.put(key, png, summary)
+    return png, summary
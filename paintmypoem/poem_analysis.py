@@ -0,0 +1,266 @@
+"""
+Single-pass poem analysis for PaintMyPoem
+Tokenizes and scores a poem once and derives every emotion and keyword view from that shared data
+"""
+
+import re
+import string
+from collections import Counter
+from functools import cached_property, lru_cache
+from keyword_matcher import KeywordMatcher
+
+# Bump whenever vocabularies or scoring change so cached analyses are invalidated.
+ANALYZER_VERSION = "3"
+CACHED_KEYWORDS = 50
+
+EMOTION_CUES = {
+    "love": ["love", "heart", "dear"],
+    "anger": ["angry", "rage", "mad"],
+    "fear": ["scared", "afraid", "fear"]
+}
+
+MOOD_KEYWORDS = {
+    "joy": ["happy", "bright", "sun", "smile", "laugh", "dance", "celebration"],
+    "love": ["love", "heart", "dear", "beloved", "kiss", "embrace", "romance"],
+    "sadness": ["sad", "cry", "tear", "lonely", "dark", "rain", "sorrow"],
+    "anger": ["angry", "rage", "mad", "fury", "storm", "fire", "hate"],
+    "fear": ["fear", "scared", "afraid", "dark", "shadow", "nightmare", "worry"],
+    "neutral": []
+}
+
+VISUAL_WORD_CATEGORIES = {
+    'colors': ['red', 'blue', 'green', 'yellow', 'purple', 'orange', 'pink', 'black', 'white',
+               'gold', 'silver', 'crimson', 'azure', 'emerald', 'violet', 'amber'],
+    'nature': ['tree', 'flower', 'sun', 'moon', 'star', 'ocean', 'mountain', 'river', 'forest',
+               'sky', 'cloud', 'rain', 'snow', 'wind', 'fire', 'earth', 'water', 'light'],
+    'emotions': ['love', 'joy', 'happiness', 'sadness', 'anger', 'fear', 'hope', 'dream',
+                 'peace', 'harmony', 'chaos', 'passion', 'desire', 'longing'],
+    'shapes': ['circle', 'square', 'triangle', 'curve', 'line', 'spiral', 'wave', 'arrow'],
+    'textures': ['smooth', 'rough', 'soft', 'hard', 'flowing', 'sharp', 'gentle', 'strong']
+}
+
+THEMES = {
+    'nature': ['tree', 'flower', 'sun', 'moon', 'star', 'ocean', 'mountain', 'river', 'forest',
+               'sky', 'cloud', 'rain', 'snow', 'wind', 'fire', 'earth', 'water', 'light', 'dark'],
+    'love': ['love', 'heart', 'kiss', 'embrace', 'romance', 'passion', 'desire', 'beloved',
+             'dear', 'honey', 'sweet', 'tender', 'gentle'],
+    'time': ['time', 'moment', 'forever', 'eternal', 'always', 'never', 'yesterday', 'tomorrow',
+             'today', 'past', 'future', 'memory', 'remember'],
+    'journey': ['path', 'road', 'journey', 'travel', 'walk', 'run', 'fly', 'move', 'go',
+                'destination', 'home', 'away', 'distance'],
+    'conflict': ['war', 'battle', 'fight', 'struggle', 'conflict', 'oppose', 'against',
+                 'defeat', 'victory', 'loss', 'win']
+}
+
+MOOD_DESCRIPTORS = {
+    'bright': ['bright', 'brilliant', 'radiant', 'glowing', 'shining', 'luminous'],
+    'dark': ['dark', 'shadow', 'dim', 'gloomy', 'murky', 'obscure'],
+    'warm': ['warm', 'hot', 'cozy', 'comfortable', 'heated', 'tropical'],
+    'cool': ['cool', 'cold', 'icy', 'frozen', 'chilly', 'arctic'],
+    'peaceful': ['peaceful', 'calm', 'serene', 'tranquil', 'quiet', 'still'],
+    'energetic': ['energetic', 'vibrant', 'dynamic', 'active', 'lively', 'spirited']
+}
+
+STOP_WORDS = frozenset([
+    "the", "is", "in", "and", "to", "a", "of", "it", "i", "you", "we", "he", "she", "they",
+    "on", "for", "with", "as", "at", "by", "an", "this", "that", "but", "be", "was", "are",
+    "his", "her", "him", "them", "their", "its", "our", "my", "your", "me", "us", "had",
+    "have", "has", "will", "would", "could", "should", "may", "might", "can", "do", "did",
+    "does", "been", "being", "were", "am", "or", "so", "if", "than", "then", "now", "here",
+    "there", "where", "when", "why", "how", "what", "who", "which", "all", "any", "both",
+    "each", "few", "more", "most", "other", "some", "such", "no", "nor", "not", "only",
+    "own", "same", "too", "very", "just"
+])
+
+VOCABULARY = frozenset(
+    word
+    for vocabularies in (EMOTION_CUES, MOOD_KEYWORDS, VISUAL_WORD_CATEGORIES, THEMES, MOOD_DESCRIPTORS)
+    for words in vocabularies.values()
+    for word in words
+)
+
+MATCHER = KeywordMatcher(VOCABULARY)
+
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+@lru_cache(maxsize=1)
+def get_analyzer():
+    """VADER analyzer, built on first use because loading its lexicon is a noticeable share of startup.
+    Returns:
+        SentimentIntensityAnalyzer: Shared analyzer.
+    """
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+def __getattr__(name: str):
+    if name == "analyzer":
+        return get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class PoemAnalysis:
+    """Lazily computed, shared analysis of a single poem"""
+
+    def __init__(self, text: str):
+        if not text or not isinstance(text, str):
+            raise ValueError("Invalid poem text")
+        self.text = text
+        self._keywords_truncated = False
+
+    def snapshot(self) -> dict:
+        """Intermediate data every view is derived from, as a JSON-serializable dict.
+        Returns:
+            dict: Keys 'scores', 'hits' and 'ranked_keywords' (top CACHED_KEYWORDS only).
+        """
+        return {
+            "scores": dict(self.scores),
+            "hits": sorted(self.vocabulary_hits),
+            "ranked_keywords": self.ranked_keywords[:CACHED_KEYWORDS]
+        }
+
+    @classmethod
+    def from_snapshot(cls, text: str, snapshot: dict) -> "PoemAnalysis":
+        """Rebuild an analysis from a snapshot without running VADER or the keyword matcher.
+        Args:
+            text (str): Poem text the snapshot was taken from.
+            snapshot (dict): Result of snapshot().
+        Returns:
+            PoemAnalysis: Analysis with its intermediate data pre-filled.
+        """
+        analysis = cls(text)
+        analysis.scores = dict(snapshot["scores"])
+        analysis.vocabulary_hits = frozenset(snapshot["hits"])
+        analysis.ranked_keywords = list(snapshot["ranked_keywords"])
+        analysis._keywords_truncated = len(analysis.ranked_keywords) >= CACHED_KEYWORDS
+        return analysis
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def scores(self) -> dict:
+        """VADER polarity scores, computed once per poem."""
+        return get_analyzer().polarity_scores(self.text)
+
+    @cached_property
+    def vocabulary_hits(self) -> frozenset:
+        """Every word of the shared vocabularies that occurs in the poem as a whole word."""
+        return MATCHER.find(self.text_lower)
+
+    @cached_property
+    def ranked_keywords(self) -> list[str]:
+        """All meaningful words and two-word phrases, best scoring first."""
+        text = self.text_lower.translate(_PUNCTUATION_TABLE)
+        words = text.split()
+        phrases = re.findall(r'\w+\s\w+', text)
+        all_words = words + [phrase.replace(' ', '_') for phrase in phrases]
+        meaningful_words = [word for word in all_words if word not in STOP_WORDS and len(word) > 2]
+        word_counts = Counter(meaningful_words)
+        scored_words = [(word, count * (len(word.split('_')[0]) / 5.0)) for word, count in word_counts.items()]
+        scored_words.sort(key=lambda x: x[1], reverse=True)
+        return [word for word, _ in scored_words]
+
+    def _found(self, words: list[str]) -> list[str]:
+        return [word for word in words if word in self.vocabulary_hits]
+
+    @property
+    def emotion(self) -> str:
+        compound = self.scores["compound"]
+        if compound >= 0.6:
+            return "love" if self._found(EMOTION_CUES["love"]) else "joy"
+        elif compound >= 0.2:
+            return "joy"
+        elif compound <= -0.6:
+            if self._found(EMOTION_CUES["anger"]):
+                return "anger"
+            elif self._found(EMOTION_CUES["fear"]):
+                return "fear"
+            return "sadness"
+        elif compound <= -0.2:
+            return "sadness"
+        return "neutral"
+
+    @property
+    def intensity(self) -> float:
+        return abs(self.scores["compound"])
+
+    @property
+    def mood_keywords(self) -> list[str]:
+        return self._found(MOOD_KEYWORDS.get(self.emotion, []))
+
+    @cached_property
+    def themes(self) -> dict:
+        """Theme breakdown with keys 'primary_theme', 'all_themes', 'theme_strength'."""
+        found_themes = {}
+        for theme, keywords in THEMES.items():
+            count = len(self._found(keywords))
+            if count > 0:
+                found_themes[theme] = count
+        sorted_themes = sorted(found_themes.items(), key=lambda x: x[1], reverse=True)
+        return {
+            'primary_theme': sorted_themes[0][0] if sorted_themes else 'general',
+            'all_themes': dict(sorted_themes),
+            'theme_strength': sorted_themes[0][1] if sorted_themes else 0
+        }
+
+    @cached_property
+    def mood_descriptors(self) -> list[str]:
+        return [mood for mood, descriptors in MOOD_DESCRIPTORS.items() if self._found(descriptors)]
+
+    def keywords(self, max_keywords: int = 5) -> list[str]:
+        """Most meaningful words of the poem.
+        Args:
+            max_keywords (int): Maximum number of keywords to return.
+        Returns:
+            list[str]: List of keywords.
+        """
+        if self._keywords_truncated and max_keywords > len(self.ranked_keywords):
+            del self.ranked_keywords
+            self._keywords_truncated = False
+        return self.ranked_keywords[:max_keywords]
+
+    def visual_keywords(self, max_keywords: int = 5) -> list[str]:
+        """Keywords suited for visual representation, falling back to regular keywords.
+        Args:
+            max_keywords (int): Maximum number of keywords to return.
+        Returns:
+            list[str]: List of visual keywords.
+        """
+        visual = list(dict.fromkeys(word for words in VISUAL_WORD_CATEGORIES.values() for word in self._found(words)))
+        if visual:
+            regular_keywords = self.keywords(max_keywords * 2)
+            combined = visual + [k for k in regular_keywords if k not in visual]
+            return combined[:max_keywords]
+        return self.keywords(max_keywords)
+
+    def mood(self) -> dict:
+        """Mood summary with keys 'emotion', 'intensity', 'mood_keywords', 'raw_scores'."""
+        return {
+            "emotion": self.emotion,
+            "intensity": self.intensity,
+            "mood_keywords": self.mood_keywords,
+            "raw_scores": dict(self.scores)
+        }
+
+    def to_dict(self, max_keywords: int = 5) -> dict:
+        """Full analysis as a JSON-serializable record.
+        Args:
+            max_keywords (int): Maximum number of visual keywords to include.
+        Returns:
+            dict: Mood summary plus 'visual_keywords', 'themes' and 'mood_descriptors'.
+        """
+        record = self.mood()
+        record["visual_keywords"] = self.visual_keywords(max_keywords)
+        record["themes"] = {**self.themes, "all_themes": dict(self.themes["all_themes"])}
+        record["mood_descriptors"] = list(self.mood_descriptors)
+        return record
+
+@lru_cache(maxsize=32)
+def get_analysis(text: str) -> PoemAnalysis:
+    """Return the shared analysis for a poem, reusing it across calls on the same text.
+    Args:
+        text (str): Poem text.
+    Returns:
+        PoemAnalysis: Analysis object for the text.
+    """
+    return PoemAnalysis(text)
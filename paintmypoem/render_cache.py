@@ -0,0 +1,133 @@
+"""
+Rendered-output cache for PaintMyPoem
+Stores the PNG and summary of seeded renders in a size-capped SQLite store so repeat requests skip rendering
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from analysis_cache import CACHE_DIR, poem_hash
+
+DEFAULT_RENDER_CACHE_PATH = os.environ.get("PAINTMYPOEM_RENDER_CACHE") or os.path.join(CACHE_DIR, "render_cache.sqlite")
+
+# Bump whenever rendering output changes for the same inputs so cached images are invalidated.
+RENDER_VERSION = "4"
+
+def render_key(poem: str, style: str, background: str, size: tuple[int, int], seed: int) -> str:
+    """Cache key of a seeded render.
+    Args:
+        poem (str): Poem text.
+        style (str): Requested style name or 'auto'.
+        background (str, optional): Requested background type, 'auto', or None.
+        size (tuple[int, int]): Dimensions of the artwork.
+        seed (int): Render seed.
+    Returns:
+        str: Hex digest.
+    """
+    parts = [RENDER_VERSION, poem_hash(poem), style, background or "", f"{size[0]}x{size[1]}", str(seed)]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+class RenderCache:
+    """Size-capped SQLite store of rendered PNGs and their summaries, evicted least recently used first"""
+
+    def __init__(self, path: str = DEFAULT_RENDER_CACHE_PATH, max_bytes: int = 512 * 1024 * 1024):
+        """Open (or create) a cache.
+        Args:
+            path (str): SQLite file for the store. Its directory is created if needed.
+            max_bytes (int): Size budget of the store; oldest entries are evicted beyond it.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS renders (key TEXT PRIMARY KEY, png BLOB NOT NULL, summary TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS renders_last_used ON renders (last_used)")
+        self._db.commit()
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM renders").fetchone()[0]
+
+    def get(self, key: str) -> tuple:
+        """Look up a render.
+        Args:
+            key (str): Result of render_key().
+        Returns:
+            tuple[bytes, dict]: PNG data and summary, or None on a miss.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT png, summary FROM renders WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            self._db.execute("UPDATE renders SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return row[0], json.loads(row[1])
+
+    def put(self, key: str, png: bytes, summary: dict) -> None:
+        """Store a render, evicting old entries if the store grows past its budget.
+        Args:
+            key (str): Result of render_key().
+            png (bytes): PNG data.
+            summary (dict): JSON-serializable render summary.
+        """
+        data = json.dumps(summary)
+        size = len(png) + len(data)
+        with self._lock:
+            cursor = self._db.execute("INSERT OR IGNORE INTO renders (key, png, summary, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                                      (key, png, data, size, time.time()))
+            self._bytes += size if cursor.rowcount else 0
+            self._db.commit()
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used renders until the store is back under 90% of its budget."""
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM renders").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        while self._bytes > target:
+            rows = self._db.execute("SELECT key, size FROM renders ORDER BY last_used LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM renders WHERE key = ?", (key,))
+                self._bytes -= size
+                self._counters["evictions"] += 1
+                if self._bytes <= target:
+                    break
+        self._db.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size.
+        Returns:
+            dict: Counters, 'hit_rate' and 'bytes'.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+            stats["bytes"] = self._bytes
+            return stats
+
+    def close(self) -> None:
+        """Close the store."""
+        with self._lock:
+            self._db.close()
+
+_default_render_cache = None
+
+def get_default_render_cache() -> RenderCache:
+    """Process-wide render cache stored at DEFAULT_RENDER_CACHE_PATH.
+    Returns:
+        RenderCache: Shared cache instance.
+    """
+    global _default_render_cache
+    if _default_render_cache is None:
+        _default_render_cache = RenderCache()
+    return _default_render_cache
@@ -0,0 +1,334 @@
+"""
+Render service for PaintMyPoem
+Long-running local HTTP/JSON server that renders poems on a pool of pre-warmed worker processes
+
+Endpoints:
+    POST /render   {"poem": "...", "style": "auto", "background": "auto", "size": 800, "seed": 42}
+                   Seeded requests are reproducible and served from the render cache when repeated.
+                   Returns JSON with the analysis and a base64 PNG, or the raw PNG with ?format=png
+                   (the analysis is then sent in the X-PaintMyPoem-Analysis header).
+    GET  /health   Worker and queue status.
+    GET  /metrics  Request counters, latency percentiles and per-stage render timings;
+                   ?format=prometheus returns the Prometheus text exposition instead.
+
+Usage:
+    python service.py --port 8765 --workers 4 --queue 16
+"""
+
+import argparse
+import base64
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from styles import StylePresets
+from background_prefetch import BackgroundPrefetcher
+from metrics import REGISTRY, count, trace
+
+BACKGROUND_CHOICES = ["auto", "sky", "forest", "ocean", "mountains", "sunset"]
+MIN_SIZE, MAX_SIZE = 256, 2048
+MAX_BODY_BYTES = 1024 * 1024
+WARMUP_POEM = "The bright sun warms the quiet sky\nand love drifts on the gentle wind"
+
+def warm_worker() -> None:
+    """Load every heavy dependency and fill the render caches once, when a worker process starts."""
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+    import pygame
+    pygame.font.init()
+    from pipeline import render_poem_png
+    render_poem_png(WARMUP_POEM, "auto", None, (MIN_SIZE, MIN_SIZE))
+
+def render_job(poem: str, style: str, background: str, size: int, seed: int = None) -> dict:
+    """Render one request inside a worker process.
+    Args:
+        poem (str): Poem text.
+        style (str): Style name or 'auto'.
+        background (str, optional): Background type, 'auto', or None.
+        size (int): Square canvas size in pixels.
+        seed (int, optional): Render seed; seeded renders go through the render cache.
+    Returns:
+        dict: 'png' bytes, 'analysis' summary, 'render_ms' and the worker's 'trace', or 'error' for invalid input.
+    """
+    from pipeline import render_poem_png
+    from render_cache import get_default_render_cache
+    start = time.perf_counter()
+    try:
+        with trace() as current:
+            png, analysis = render_poem_png(poem, style, background, (size, size), seed, get_default_render_cache())
+    except ValueError as e:
+        return {"error": str(e)}
+    return {"png": png, "analysis": analysis, "render_ms": (time.perf_counter() - start) * 1000, "trace": current, "pid": os.getpid()}
+
+class LatencyWindow:
+    """Rolling window of recent latencies with percentile summaries"""
+
+    def __init__(self, size: int = 1024):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, milliseconds: float) -> None:
+        with self._lock:
+            self._samples.append(milliseconds)
+
+    def summary(self) -> dict:
+        """Percentiles of the window.
+        Returns:
+            dict: Keys 'count', 'p50', 'p95', 'p99' and 'max' in milliseconds.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+        pick = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))], 3)
+        return {"count": len(samples), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(samples[-1], 3)}
+
+class RenderService:
+    """Pre-warmed process pool plus admission control shared by all HTTP handler threads"""
+
+    def __init__(self, workers: int = None, queue_size: int = 16, timeout: float = 60):
+        """Start and warm the worker pool, and start fetching any missing backgrounds.
+        Args:
+            workers (int, optional): Worker processes, defaulting to the CPU count.
+            queue_size (int): Requests allowed to wait for a free worker before new ones get 503.
+            timeout (float): Seconds a request may take before it gets 504.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.styles = [style_id for style_id, _, _ in StylePresets().get_available_styles()] + ["auto"]
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.counters = {"requests": 0, "ok": 0, "bad_request": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+        self.latency = LatencyWindow()
+        self.queue_wait = LatencyWindow()
+        self.render_time = LatencyWindow()
+        start = time.perf_counter()
+        BackgroundPrefetcher().start()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        self.warmup_seconds = time.perf_counter() - start
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+        if counter != "requests":
+            count("service_requests_total", outcome=counter)
+
+    def validate(self, request: dict) -> tuple:
+        """Check a render request and fill in defaults.
+        Args:
+            request (dict): Decoded JSON body.
+        Returns:
+            tuple: (poem, style, background, size, seed).
+        """
+        poem = request.get("poem")
+        if not isinstance(poem, str) or not poem.strip():
+            raise ValueError("'poem' must be a non-empty string")
+        style = request.get("style", "auto")
+        if style not in self.styles:
+            raise ValueError(f"'style' must be one of {self.styles}")
+        background = request.get("background")
+        if background not in BACKGROUND_CHOICES + [None, "none"]:
+            raise ValueError(f"'background' must be one of {BACKGROUND_CHOICES} or null")
+        size = request.get("size", 800)
+        if not isinstance(size, int) or not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f"'size' must be an integer between {MIN_SIZE} and {MAX_SIZE}")
+        seed = request.get("seed")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise ValueError("'seed' must be an integer or null")
+        return poem, style, None if background == "none" else background, size, seed
+
+    def render(self, poem: str, style: str, background: str, size: int, seed: int = None) -> dict:
+        """Run a render on the pool, or return None at once when the queue is full.
+        A request that times out is cancelled if it has not started yet; otherwise it stays in flight and
+        holds its admission slot until its worker finishes it.
+        Args:
+            poem (str): Poem text.
+            style (str): Style name or 'auto'.
+            background (str, optional): Background type, 'auto', or None.
+            size (int): Square canvas size in pixels.
+            seed (int, optional): Render seed.
+        Returns:
+            dict: Result of render_job plus 'queue_ms', or None if the request was rejected.
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        submitted = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self.pool.submit(render_job, poem, style, background, size, seed)
+        except BaseException:
+            self._release()
+            raise
+        # A render that times out still occupies its worker, so it keeps its slot until it finishes.
+        future.add_done_callback(self._release)
+        try:
+            result = future.result(self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+        if "render_ms" in result:
+            result["queue_ms"] = max(0.0, (time.perf_counter() - submitted) * 1000 - result["render_ms"])
+        return result
+
+    def _release(self, future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def health(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight
+        return {"status": "ok", "workers": self.workers, "in_flight": in_flight,
+                "capacity": self.workers + self.queue_size, "warmup_seconds": round(self.warmup_seconds, 3)}
+
+    def metrics(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **self.health(),
+            "counters": counters,
+            "latency_ms": self.latency.summary(),
+            "queue_wait_ms": self.queue_wait.summary(),
+            "render_ms": self.render_time.summary(),
+            "pipeline": REGISTRY.to_json()
+        }
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = "PaintMyPoem"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> RenderService:
+        return self.server.service
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json", headers: dict = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), headers=headers)
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, self.service.health())
+        elif path == "/metrics" and parse_qs(urlparse(self.path).query).get("format") == ["prometheus"]:
+            self._send(200, REGISTRY.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        elif path == "/metrics":
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self._send_json(404, {"error": "not found"})
+            return
+        start = time.perf_counter()
+        service = self.service
+        service.count("requests")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BODY_BYTES:
+                raise ValueError("request body too large")
+            args = service.validate(json.loads(self.rfile.read(length) or b"{}"))
+        except (ValueError, AttributeError) as e:
+            service.count("bad_request")
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            result = service.render(*args)
+        except TimeoutError:
+            service.count("timeouts")
+            self._send_json(504, {"error": "render timed out"})
+            return
+        except Exception as e:
+            service.count("errors")
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        if result is None:
+            service.count("rejected")
+            self._send_json(503, {"error": "render queue is full"}, {"Retry-After": "1"})
+            return
+        if "error" in result:
+            service.count("bad_request")
+            self._send_json(400, {"error": result["error"]})
+            return
+
+        service.count("ok")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        service.latency.add(elapsed_ms)
+        service.queue_wait.add(result["queue_ms"])
+        service.render_time.add(result["render_ms"])
+        REGISTRY.merge(result["trace"])
+        REGISTRY.observe("request", elapsed_ms / 1000)
+        REGISTRY.observe("queue", result["queue_ms"] / 1000)
+        timing = {"total_ms": round(elapsed_ms, 3), "queue_ms": round(result["queue_ms"], 3), "render_ms": round(result["render_ms"], 3),
+                  **result["trace"].to_json()}
+        if parse_qs(url.query).get("format") == ["png"]:
+            headers = {"X-PaintMyPoem-Analysis": json.dumps(result["analysis"]), "X-PaintMyPoem-Timing": json.dumps(timing)}
+            self._send(200, result["png"], "image/png", headers)
+        else:
+            self._send_json(200, {"analysis": result["analysis"], "timing": timing, "image_base64": base64.b64encode(result["png"]).decode("ascii")})
+
+def create_server(host: str = "127.0.0.1", port: int = 8765, workers: int = None, queue_size: int = 16, timeout: float = 60) -> ThreadingHTTPServer:
+    """Build a server with a warm worker pool; call serve_forever() to start handling requests.
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind, or 0 for any free port.
+        workers (int, optional): Worker processes.
+        queue_size (int): Requests allowed to wait for a worker before 503s.
+        timeout (float): Per-request render timeout in seconds.
+    Returns:
+        ThreadingHTTPServer: Server with a 'service' attribute holding the RenderService.
+    """
+    server = ThreadingHTTPServer((host, port), RenderHandler)
+    server.daemon_threads = True
+    server.service = RenderService(workers, queue_size, timeout)
+    return server
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve poem renders over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--queue", type=int, default=16, help="Requests that may wait for a worker before 503s")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request render timeout in seconds")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.workers, args.queue, args.timeout)
+    service = server.service
+    print(f"🎨 PaintMyPoem service on http://{args.host}:{server.server_port} "
+          f"({service.workers} workers warmed in {service.warmup_seconds:.2f}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+Startup-time report and budget check for PaintMyPoem
+Imports entry-point modules in fresh interpreters with -X importtime and flags any that exceed their budget
+
+Usage:
+    python startup.py --timing           # per-entry-point cost and the heaviest imports
+    python startup.py main --budget 80   # exit code 1 if importing main takes longer than 80 ms
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cold-import budgets in milliseconds for entry points that must start fast. Rendering modules
+# (pipeline, art_generator) load pygame, NumPy and Pillow by design and are not budgeted.
+STARTUP_BUDGETS_MS = {
+    "main": 120,
+    "batch": 120,
+    "streaming": 120,
+    "analysis_cache": 100
+}
+
+def parse_importtime(stderr: str) -> list[tuple[str, float, float]]:
+    """Parse the output of python -X importtime.
+    Args:
+        stderr (str): Captured stderr of the interpreter.
+    Returns:
+        list[tuple[str, float, float]]: (module, self ms, cumulative ms) per imported module.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+def measure_startup(module: str, runs: int = 3) -> dict:
+    """Import a module in fresh interpreters and keep the fastest run.
+    Args:
+        module (str): Module to import, relative to the package directory.
+        runs (int): Number of fresh interpreters to start.
+    Returns:
+        dict: 'module', 'import_ms' (cumulative import time), 'wall_ms' (whole interpreter run) and
+        'heaviest' ((module, self ms) of the slowest imports).
+    """
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                cwd=MODULE_DIR, capture_output=True, text=True,
+                                env={**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "hide"})
+        wall_ms = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr.splitlines()[-1]}")
+        rows = parse_importtime(result.stderr)
+        import_ms = next(cumulative for name, _, cumulative in reversed(rows) if name == module)
+        if best is None or import_ms < best["import_ms"]:
+            heaviest = sorted(rows, key=lambda row: row[1], reverse=True)[:8]
+            best = {
+                "module": module,
+                "import_ms": round(import_ms, 2),
+                "wall_ms": round(wall_ms, 2),
+                "heaviest": [(name, round(self_ms, 2)) for name, self_ms, _ in heaviest]
+            }
+    return best
+
+def check_budgets(budgets: dict[str, float], runs: int = 3) -> list[dict]:
+    """Measure each module and compare it with its budget.
+    Args:
+        budgets (dict[str, float]): Module name mapped to its import budget in milliseconds.
+        runs (int): Fresh interpreters per module.
+    Returns:
+        list[dict]: measure_startup() results with 'budget_ms' and 'over_budget' added.
+    """
+    results = []
+    for module, budget_ms in budgets.items():
+        result = measure_startup(module, runs)
+        result["budget_ms"] = budget_ms
+        result["over_budget"] = result["import_ms"] > budget_ms
+        results.append(result)
+    return results
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report and enforce cold-start import times.")
+    parser.add_argument("modules", nargs="*", help="Modules to check (default: every budgeted entry point)")
+    parser.add_argument("--budget", type=float, default=None, help="Budget in ms for the given modules, overriding the defaults")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module (fastest is kept)")
+    parser.add_argument("--timing", action="store_true", help="Also list the heaviest imports of each module")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or list(STARTUP_BUDGETS_MS)
+    budgets = {module: args.budget or STARTUP_BUDGETS_MS.get(module, float("inf")) for module in modules}
+    results = check_budgets(budgets, args.runs)
+    for result in results:
+        status = "❌ over budget" if result["over_budget"] else "✅"
+        print(f"{result['module']:<16} import {result['import_ms']:8.2f} ms  "
+              f"(budget {result['budget_ms']:g} ms, interpreter total {result['wall_ms']:.0f} ms)  {status}")
+        if args.timing:
+            for name, self_ms in result["heaviest"]:
+                print(f"    {self_ms:8.2f} ms  {name}")
+    return 1 if any(result["over_budget"] for result in results) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,214 @@
+"""
+Streaming corpus analysis for PaintMyPoem
+Runs only the analysis half of the pipeline over very large corpora with bounded memory
+
+Poems are read lazily from a directory of .txt files, a JSONL file ({"id": ..., "text": ...} per line)
+or JSONL on stdin ("-"). Records are written as JSONL, and a checkpoint next to the output lets an
+interrupted job resume where it stopped.
+
+Usage:
+    python streaming.py corpus.jsonl --out analysis.jsonl --workers 8 --resume
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Iterable, Iterator
+
+from analysis_cache import AnalysisCache
+from poem_analysis import PoemAnalysis
+
+logger = logging.getLogger(__name__)
+
+_worker_cache = None
+
+def init_worker(cache_path: str = None) -> None:
+    """Open the analysis cache used by analyze_record in this process.
+    Args:
+        cache_path (str, optional): SQLite analysis cache, or None to always analyze.
+    """
+    global _worker_cache
+    _worker_cache = AnalysisCache(cache_path) if cache_path else None
+
+def _iter_directory(directory: str, skip: int) -> Iterator[tuple[str, str]]:
+    # scandir order is arbitrary, so sort by name to keep checkpoint offsets meaning the same poems.
+    with os.scandir(directory) as entries:
+        names = sorted(entry.name for entry in entries if entry.is_file() and entry.name.endswith(".txt"))
+    for name in itertools.islice(names, skip, None):
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            yield name, f.read()
+
+def _iter_jsonl(lines: Iterable[str], skip: int) -> Iterator[tuple[str, str]]:
+    for line_number, line in enumerate(itertools.islice(lines, skip, None), skip + 1):
+        line = line.strip()
+        if not line:
+            yield str(line_number), ""
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            yield str(line_number), ""
+            continue
+        if isinstance(item, str):
+            yield str(line_number), item
+        elif not isinstance(item, dict):
+            yield str(line_number), ""
+        else:
+            yield str(item.get("id", line_number)), item.get("text") or item.get("poem") or ""
+
+def iter_poems(source: str, skip: int = 0) -> Iterator[tuple[str, str]]:
+    """Lazily yield (poem_id, text) pairs from a directory, a JSONL file, or stdin.
+    Directory poems come in file name order. Skipped poems are not read or parsed. Blank or malformed
+    JSONL lines, including JSON values that are neither objects nor strings, are yielded with empty
+    text so positions stay stable for checkpoints.
+    Args:
+        source (str): Directory path, JSONL file path, or '-' for JSONL on stdin.
+        skip (int): Number of leading poems to skip.
+    Returns:
+        Iterator[tuple[str, str]]: Poem id and text.
+    """
+    if source == "-":
+        yield from _iter_jsonl(sys.stdin, skip)
+    elif os.path.isdir(source):
+        yield from _iter_directory(source, skip)
+    elif os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            yield from _iter_jsonl(f, skip)
+    else:
+        raise ValueError(f"Poem source not found: {source}")
+
+def analyze_record(item: tuple[str, str]) -> dict:
+    """Analyze one poem into a JSON-serializable record.
+    Args:
+        item (tuple[str, str]): Poem id and text.
+    Returns:
+        dict: Analysis record, or a record with an 'error' key.
+    """
+    poem_id, text = item
+    try:
+        analysis = _worker_cache.get_analysis(text) if _worker_cache else PoemAnalysis(text)
+        return {"id": poem_id, **analysis.to_dict()}
+    except ValueError as e:
+        return {"id": poem_id, "error": str(e)}
+
+def analyze_stream(poems: Iterable[tuple[str, str]], workers: int = 1, chunk_size: int = 256, cache_path: str = None) -> Iterator[dict]:
+    """Yield analysis records in input order, holding at most one batch of poems in memory.
+    Args:
+        poems (Iterable[tuple[str, str]]): Poem id and text pairs.
+        workers (int): Worker processes; 1 analyzes in this process.
+        chunk_size (int): Poems handed to a worker at a time.
+        cache_path (str, optional): SQLite analysis cache shared by all workers.
+    Returns:
+        Iterator[dict]: Analysis records.
+    """
+    poems = iter(poems)
+    if workers <= 1:
+        init_worker(cache_path)
+        for item in poems:
+            yield analyze_record(item)
+        return
+    batch_size = chunk_size * workers
+    with Pool(workers, initializer=init_worker, initargs=(cache_path,)) as pool:
+        while True:
+            batch = list(itertools.islice(poems, batch_size))
+            if not batch:
+                break
+            yield from pool.imap(analyze_record, batch, chunksize=chunk_size)
+
+def _load_checkpoint(checkpoint_path: str, source: str) -> dict:
+    if not os.path.exists(checkpoint_path):
+        return {"source": source, "offset": 0, "bytes": 0}
+    with open(checkpoint_path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("source") != source:
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to {checkpoint.get('source')}, not {source}")
+    return checkpoint
+
+def _save_checkpoint(checkpoint_path: str, checkpoint: dict) -> None:
+    temp_path = checkpoint_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, checkpoint_path)
+
+def run_stream(source: str, output_path: str, workers: int = 1, chunk_size: int = 256, resume: bool = False, cache_path: str = None) -> dict:
+    """Analyze a corpus into a JSONL file, checkpointing after every batch.
+    With resume=True the output is truncated to the last checkpoint and already analyzed poems are
+    skipped, so every poem appears exactly once in the output. A checkpoint whose output file is missing
+    or shorter than it records is ignored, and the job starts over.
+    Args:
+        source (str): Directory path, JSONL file path, or '-' for stdin.
+        output_path (str): JSONL output path, or '-' for stdout (no checkpoints).
+        workers (int): Worker processes.
+        chunk_size (int): Poems handed to a worker at a time.
+        resume (bool): Continue from the checkpoint next to the output.
+        cache_path (str, optional): SQLite analysis cache so repeated poems skip NLP.
+    Returns:
+        dict: Summary with counts, elapsed time and throughput.
+    """
+    start = time.perf_counter()
+    analyzed = failed = 0
+    if output_path == "-":
+        for record in analyze_stream(iter_poems(source), workers, chunk_size, cache_path):
+            sys.stdout.write(json.dumps(record) + "\n")
+            analyzed += 1
+            failed += "error" in record
+        checkpoint = {"offset": analyzed}
+    else:
+        checkpoint_path = output_path + ".checkpoint"
+        checkpoint = _load_checkpoint(checkpoint_path, source) if resume else {"source": source, "offset": 0, "bytes": 0}
+        output_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else -1
+        if output_bytes < checkpoint["bytes"]:
+            logger.warning("⚠️ %s has %s of the %d bytes its checkpoint records; starting over",
+                           output_path, "none" if output_bytes < 0 else output_bytes, checkpoint["bytes"])
+            checkpoint = {"source": source, "offset": 0, "bytes": 0}
+        checkpoint_every = chunk_size * max(workers, 1)
+        with open(output_path, "r+b" if checkpoint["bytes"] else "wb") as out:
+            out.truncate(checkpoint["bytes"])
+            out.seek(checkpoint["bytes"])
+            for record in analyze_stream(iter_poems(source, checkpoint["offset"]), workers, chunk_size, cache_path):
+                out.write((json.dumps(record) + "\n").encode("utf-8"))
+                analyzed += 1
+                failed += "error" in record
+                if analyzed % checkpoint_every == 0:
+                    out.flush()
+                    os.fsync(out.fileno())
+                    checkpoint["offset"] += checkpoint_every
+                    checkpoint["bytes"] = out.tell()
+                    _save_checkpoint(checkpoint_path, checkpoint)
+            out.flush()
+            checkpoint["offset"] += analyzed % checkpoint_every
+            checkpoint["bytes"] = out.tell()
+            _save_checkpoint(checkpoint_path, checkpoint)
+    elapsed = time.perf_counter() - start
+    return {
+        "analyzed": analyzed,
+        "failed": failed,
+        "total": checkpoint["offset"],
+        "seconds": round(elapsed, 3),
+        "poems_per_second": round(analyzed / elapsed, 3) if elapsed > 0 else 0.0
+    }
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream poem analysis records as JSONL.")
+    parser.add_argument("source", help="Directory of .txt poems, a JSONL file, or '-' for JSONL on stdin")
+    parser.add_argument("--out", default="-", help="JSONL output file, or '-' for stdout")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Poems handed to a worker at a time")
+    parser.add_argument("--resume", action="store_true", help="Resume from the checkpoint next to --out")
+    parser.add_argument("--cache", default=None, help="SQLite analysis cache so repeated poems skip NLP")
+    args = parser.parse_args(argv)
+    if args.resume and args.out == "-":
+        parser.error("--resume needs an output file")
+
+    summary = run_stream(args.source, args.out, args.workers, args.chunk_size, args.resume, args.cache)
+    print(f"📚 Analyzed {summary['analyzed']} poems ({summary['failed']} failed, {summary['total']} total) "
+          f"in {summary['seconds']:.2f}s ({summary['poems_per_second']:.1f} poems/sec)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
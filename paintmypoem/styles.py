@@ -4,11 +4,13 @@ Provides predefined visual styles that modify color palettes, shapes, and effect
 """
 
 import random
+from layout import normalize_point, normalize_length
 
 class StylePresets:
     """Manages different visual styles for poem artwork generation"""
     
     def __init__(self):
+        # size_range is in design-canvas pixels; plans store sizes normalized (see layout.py).
         self.styles = {
             "vibrant": {"name": "Vibrant", "description": "Bold colors, high contrast, energetic feel", "color_intensity": 1.2, "saturation_boost": 50, "num_elements_multiplier": 1.5, "shape_preferences": ["circle", "star", "hexagon"], "size_range": (40, 140), "alpha_range": (220, 255), "particle_count": 40, "fog_enabled": False, "gradient_complexity": 3},
             "minimalist": {"name": "Minimalist", "description": "Clean, simple shapes with limited color palette", "color_intensity": 0.8, "saturation_boost": -30, "num_elements_multiplier": 0.6, "shape_preferences": ["circle", "square"], "size_range": (60, 100), "alpha_range": (200, 240), "particle_count": 8, "fog_enabled": False, "gradient_complexity": 2},
@@ -70,11 +72,12 @@ class StylePresets:
         """
         return self.styles.get(style_name, self.styles["vibrant"])
     
-    def modify_visual_plan(self, visual_plan: dict, style_name: str) -> dict:
+    def modify_visual_plan(self, visual_plan: dict, style_name: str, rng=random) -> dict:
         """Apply style to a complete visual plan.
         Args:
             visual_plan (dict): Visual plan to modify.
             style_name (str): Name of the style to apply.
+            rng (random.Random): Random source for added elements, replacement shapes and alphas.
         Returns:
             dict: Modified visual plan.
         """
@@ -93,16 +96,16 @@ class StylePresets:
             base_elements = visual_plan["elements"].copy()
             for i in range(additional_needed):
                 if base_elements:
-                    base_element = random.choice(base_elements).copy()
-                    base_element["position"] = (random.randint(80, 720), random.randint(80, 600))
-                    base_element["size"] = random.randint(*style["size_range"])
-                    base_element["alpha"] = random.randint(*style["alpha_range"])
+                    base_element = rng.choice(base_elements).copy()
+                    base_element["position"] = normalize_point(rng.randint(80, 720), rng.randint(80, 600))
+                    base_element["size"] = normalize_length(rng.randint(*style["size_range"]))
+                    base_element["alpha"] = rng.randint(*style["alpha_range"])
                     visual_plan["elements"].append(base_element)
         for element in visual_plan["elements"]:
             if element["type"] not in style["shape_preferences"]:
-                element["type"] = random.choice(style["shape_preferences"])
-            element["size"] = max(style["size_range"][0], min(style["size_range"][1], element.get("size", 60)))
-            element["alpha"] = random.randint(*style["alpha_range"])
+                element["type"] = rng.choice(style["shape_preferences"])
+            element["size"] = max(normalize_length(style["size_range"][0]), min(normalize_length(style["size_range"][1]), element.get("size", normalize_length(60))))
+            element["alpha"] = rng.randint(*style["alpha_range"])
         visual_plan["fog"] = style["fog_enabled"]
         visual_plan["particle_count"] = style["particle_count"]
         visual_plan["gradient_complexity"] = style["gradient_complexity"]
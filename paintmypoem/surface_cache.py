@@ -0,0 +1,102 @@
+"""
+Bounded surface cache for PaintMyPoem
+An LRU of ready-to-blit pygame surfaces limited by entry count and pixel memory, with hit-rate stats
+"""
+
+import threading
+from collections import OrderedDict
+import pygame
+from metrics import count
+
+_caches = []
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Approximate pixel memory held by a surface (the whole parent for subsurfaces)."""
+    width, height = surface.get_abs_parent().get_size()
+    return width * height * surface.get_bytesize()
+
+class SurfaceCache:
+    """LRU cache of pygame surfaces keyed by the parameters they were rendered from"""
+
+    def __init__(self, name: str, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        """Create an empty cache.
+        Args:
+            name (str): Name used in stats output.
+            max_entries (int): Maximum number of cached surfaces.
+            max_bytes (int): Maximum total pixel memory of cached surfaces.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches.append(self)
+
+    def get(self, key, factory, *args) -> pygame.Surface:
+        """Return the cached surface for key, rendering it with factory(*args) on a miss.
+        Returned surfaces are shared; callers must only blit them, never draw on them.
+        Args:
+            key (hashable): Everything the rendered surface depends on.
+            factory (callable): Callable that renders the surface.
+            *args: Arguments passed to factory.
+        Returns:
+            pygame.Surface: Cached surface.
+        """
+        with self._lock:
+            surface = self._entries.get(key)
+            if surface is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        count("cache_lookups_total", cache=self.name, result="miss" if surface is None else "hit")
+        if surface is not None:
+            return surface
+        surface = factory(*args)
+        size = surface_bytes(surface)
+        if size > self.max_bytes:
+            return surface
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = surface
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= surface_bytes(evicted)
+                    self.evictions += 1
+        return surface
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size.
+        Returns:
+            dict: Keys 'name', 'hits', 'misses', 'evictions', 'hit_rate', 'entries', 'bytes'.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+    def clear(self) -> None:
+        """Drop every cached surface and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+def all_stats() -> list[dict]:
+    """Stats of every SurfaceCache created in this process.
+    Returns:
+        list[dict]: One stats() dict per cache, in creation order.
+    """
+    return [cache.stats() for cache in _caches]
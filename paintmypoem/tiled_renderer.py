@@ -0,0 +1,155 @@
+"""
+Tiled high-resolution rendering for PaintMyPoem
+Draws a composed scene in horizontal strips, polishes each strip and streams it into a PNG, so peak
+memory follows the canvas width instead of its area and 4K-8K prints fit in a small worker
+"""
+
+import random
+import struct
+import zlib
+
+import numpy as np
+import pygame
+from PIL import Image
+
+from art_generator import compose_scene, draw_scene
+from image_renderer import polish_image
+from metrics import span, count
+
+STRIP_HEIGHT = 256
+# SMOOTH_MORE is a 5x5 kernel, so each strip is drawn with this many extra rows above and below
+# and polished strips match a whole-image polish exactly.
+FILTER_HALO = 2
+# Canvases with more pixels than this are rendered in strips by the pipeline.
+TILED_MIN_PIXELS = 2048 * 2048
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    """One PNG chunk: length, type, data and CRC."""
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def filter_rows_up(rows: np.ndarray, previous: np.ndarray) -> bytes:
+    """Encode rows with the PNG 'Up' filter (difference from the row above).
+    Args:
+        rows (np.ndarray): uint8 array of shape (n, width * channels).
+        previous (np.ndarray): Row above the first one (zeros at the top of an image).
+    Returns:
+        bytes: Filtered scanlines, each prefixed with its filter type byte.
+    """
+    above = np.vstack([previous[None, :], rows[:-1]])
+    filtered = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    filtered[:, 1:] = rows - above
+    return filtered.tobytes()
+
+class PNGStreamWriter:
+    """Write an 8-bit RGB PNG row by row, compressing as rows arrive"""
+
+    def __init__(self, path: str, size: tuple[int, int], compress_level: int = 6):
+        """Open the file and write the PNG header.
+        Args:
+            path (str): Output file.
+            size (tuple[int, int]): Image dimensions.
+            compress_level (int): zlib level (0-9).
+        """
+        self.path = path
+        self.size = size
+        self.rows_written = 0
+        self.bytes_written = 0
+        self._file = open(path, "wb")
+        self._compressor = zlib.compressobj(compress_level)
+        self._previous = np.zeros(size[0] * 3, dtype=np.uint8)
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", size[0], size[1], 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind: bytes, data: bytes) -> None:
+        self._file.write(png_chunk(kind, data))
+
+    def write(self, rows: np.ndarray) -> None:
+        """Append rows, encoded with the PNG 'Up' filter (difference from the row above).
+        Args:
+            rows (np.ndarray): uint8 array of shape (n, width, 3).
+        """
+        rows = rows.reshape(len(rows), -1)
+        data = self._compressor.compress(filter_rows_up(rows, self._previous))
+        self._previous = rows[-1].copy()
+        self.rows_written += len(rows)
+        if data:
+            self._chunk(b"IDAT", data)
+
+    def close(self) -> None:
+        """Finish the zlib stream and the file; the image must be complete."""
+        if self.rows_written != self.size[1]:
+            self._file.close()
+            raise ValueError(f"PNG has {self.rows_written} of {self.size[1]} rows")
+        self._chunk(b"IDAT", self._compressor.flush())
+        self._chunk(b"IEND", b"")
+        self.bytes_written = self._file.tell()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+def preview_factor(size: tuple[int, int], preview_side: int, strip_height: int = STRIP_HEIGHT) -> int:
+    """Largest power-of-two reduction that divides the strip height and keeps the preview at least preview_side.
+    Args:
+        size (tuple[int, int]): Canvas dimensions.
+        preview_side (int): Smallest acceptable longest side of the preview.
+        strip_height (int): Canvas rows drawn per strip.
+    Returns:
+        int: Reduction factor.
+    """
+    factor = 1
+    while strip_height % (factor * 2) == 0 and max(size) // (factor * 2) >= preview_side:
+        factor *= 2
+    return factor
+
+def render_tiled(visual_plan: dict, output_path: str, background_type: str = None, background_opacity: float = 0.4, size: tuple[int, int] = (4096, 4096), strip_height: int = STRIP_HEIGHT, polish: bool = True, rng=random, preview_side: int = None) -> tuple:
+    """Render a plan strip by strip straight into a PNG file.
+    Output matches render_art followed by soften_image pixel for pixel, except that background photos
+    resampled by a non-integer factor can differ by a level or two, while only one strip is held in memory.
+    With preview_side, each strip is also box-reduced into an in-memory preview (equal to reducing the
+    whole image), which export_renditions can turn into smaller renditions without decoding the PNG.
+    Args:
+        visual_plan (dict): Dictionary containing art elements, colors, and style.
+        output_path (str): PNG file to write.
+        background_type (str, optional): Type of background to use.
+        background_opacity (float): Opacity level for background (0.0 to 1.0).
+        size (tuple[int, int]): Dimensions of the artwork.
+        strip_height (int): Canvas rows drawn per strip.
+        polish (bool): Apply the soften_image smoothing and color lift.
+        rng (random.Random): Random source, as for render_art.
+        preview_side (int, optional): Smallest longest side of the preview to keep, or None for no preview.
+    Returns:
+        tuple[str, Image.Image]: Path to the written image and the preview (None unless requested).
+    """
+    size = tuple(size)
+    scene = compose_scene(visual_plan, background_type, background_opacity, size, rng)
+    halo = FILTER_HALO if polish else 0
+    preview = factor = None
+    if preview_side:
+        factor = preview_factor(size, preview_side, strip_height)
+        preview = Image.new("RGB", (-(-size[0] // factor), -(-size[1] // factor)))
+    with PNGStreamWriter(output_path, size) as writer:
+        for top in range(0, size[1], strip_height):
+            bottom = min(top + strip_height, size[1])
+            draw_top, draw_bottom = max(0, top - halo), min(size[1], bottom + halo)
+            strip = pygame.Surface((size[0], draw_bottom - draw_top), 0, 32)
+            draw_scene(strip, scene, (0, draw_top))
+            if polish:
+                rows = np.asarray(polish_image(strip))[top - draw_top:bottom - draw_top]
+            else:
+                rows = pygame.surfarray.pixels3d(strip).transpose(1, 0, 2)
+            rows = np.ascontiguousarray(rows)
+            with span("encode"):
+                writer.write(rows)
+            if preview is not None:
+                preview.paste(Image.fromarray(rows).reduce(factor), (0, top // factor))
+            del rows, strip
+    count("bytes_written_total", writer.bytes_written, kind="image")
+    return output_path, preview
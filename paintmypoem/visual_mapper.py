@@ -1,4 +1,5 @@
 import random
+from layout import normalize_point, normalize_length
 
 def get_palette(emotion: str) -> list[tuple[int, int, int]]:
     """Enhanced color palettes with vibrant, saturated colors.
@@ -51,13 +52,15 @@ def get_accent_colors(emotion: str) -> list[tuple[int, int, int]]:
     }
     return accents.get(emotion, accents["neutral"])
 
-def map_to_visuals(emotion: str, keywords: list[str]) -> dict:
+def map_to_visuals(emotion: str, keywords: list[str], rng=random) -> dict:
     """Map emotion and keywords to visual elements.
     Args:
         emotion (str): Detected emotion.
         keywords (list[str]): Extracted keywords.
+        rng (random.Random): Random source for shapes, positions, sizes, colors and alphas.
     Returns:
-        dict: Visual plan with elements, colors, and settings.
+        dict: Visual plan with elements, colors, and settings. Element positions are fractions of the
+        canvas and sizes fractions of its shorter side (see layout.py).
     """
     palette = get_palette(emotion)
     accent_colors = get_accent_colors(emotion)
@@ -70,15 +73,13 @@ def map_to_visuals(emotion: str, keywords: list[str]) -> dict:
             word = keywords[i]
         else:
             word = f"element_{i}"
-        shape = random.choice(shape_options)
-        x = random.randint(80, 720)
-        y = random.randint(80, 600)
-        position = (x, y)
-        size = random.randint(25, 120)
-        if random.random() < 0.7:
-            color = random.choice(palette)
+        shape = rng.choice(shape_options)
+        position = normalize_point(rng.randint(80, 720), rng.randint(80, 600))
+        size = normalize_length(rng.randint(25, 120))
+        if rng.random() < 0.7:
+            color = rng.choice(palette)
         else:
-            color = random.choice(accent_colors)
-        visuals.append({"type": shape, "position": position, "size": size, "color": color, "label": word, "alpha": random.randint(200, 255)})
+            color = rng.choice(accent_colors)
+        visuals.append({"type": shape, "position": position, "size": size, "color": color, "label": word, "alpha": rng.randint(200, 255)})
     return {"background_color": background_color, "elements": visuals, "palette": palette, "accent_colors": accent_colors, "text": keywords, "fog": False, "emotion": emotion}
     
\ No newline at end of file
@@ -0,0 +1,44 @@
+import os
+import sqlite3
+
+import analysis_cache
+from analysis_cache import AnalysisCache, poem_hash
+
+POEM = "The bright sun warms the quiet sky"
+
+def last_used(path: str) -> float:
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT last_used FROM analyses WHERE key = ?", (poem_hash(POEM),)).fetchone()[0]
+
+def test_default_path_is_in_the_cache_dir():
+    if not os.environ.get("PAINTMYPOEM_ANALYSIS_CACHE"):
+        assert analysis_cache.DEFAULT_CACHE_PATH == os.path.join(analysis_cache.CACHE_DIR, "analysis_cache.sqlite")
+    assert os.path.isabs(analysis_cache.CACHE_DIR)
+
+def test_creates_missing_directory(tmp_path):
+    path = tmp_path / "nested" / "cache" / "analysis.sqlite"
+    cache = AnalysisCache(str(path))
+    cache.get_analysis(POEM)
+    cache.close()
+    assert path.exists()
+
+def test_disk_hit_access_times_are_written_in_batches(tmp_path, monkeypatch):
+    path = str(tmp_path / "analysis.sqlite")
+    cache = AnalysisCache(path)
+    cache.get_analysis(POEM)
+    cache.close()
+    stored = last_used(path)
+
+    cache = AnalysisCache(path)
+    assert cache.get_analysis(POEM).to_dict() == AnalysisCache(None).get_analysis(POEM).to_dict()
+    assert cache.stats()["disk_hits"] == 1
+    assert last_used(path) == stored
+    cache.close()
+    refreshed = last_used(path)
+    assert refreshed > stored
+
+    monkeypatch.setattr(analysis_cache, "TOUCH_BATCH", 1)
+    cache = AnalysisCache(path)
+    cache.get_analysis(POEM)
+    assert last_used(path) > refreshed
+    cache.close()
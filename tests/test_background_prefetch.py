@@ -0,0 +1,63 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from background_manager import BackgroundManager
+from background_prefetch import BackgroundPrefetcher
+
+IMAGES = {"sky.jpg": b"sky image " * 4096, "ocean.jpg": b"ocean image " * 4096}
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+@pytest.fixture
+def image_server(tmp_path, monkeypatch):
+    """Serve IMAGES from a local HTTP server and yield its base URL."""
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    served = tmp_path / "served"
+    served.mkdir()
+    for name, data in IMAGES.items():
+        (served / name).write_bytes(data)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(served)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def make_manager(directory, base_url: str) -> BackgroundManager:
+    return BackgroundManager(str(directory), {
+        "sky": {"urls": [f"{base_url}/sky.jpg"], "fallback_color": (135, 206, 235)},
+        "ocean": {"urls": [f"{base_url}/ocean.jpg"], "fallback_color": (0, 119, 190)},
+        "forest": {"urls": [f"{base_url}/missing.jpg"], "fallback_color": (34, 139, 34)}
+    })
+
+def test_prefetch_downloads_missing_types(tmp_path, image_server):
+    manager = make_manager(tmp_path / "backgrounds", image_server)
+    results = BackgroundPrefetcher(manager, max_workers=2, retries=1).prefetch()
+    assert results["forest"] is None
+    for bg_type in ("sky", "ocean"):
+        with open(results[bg_type], "rb") as f:
+            assert f.read() == IMAGES[f"{bg_type}.jpg"]
+        assert manager.cached_backgrounds(bg_type) == [results[bg_type]]
+    assert BackgroundPrefetcher(manager).missing_types() == ["forest"]
+
+def test_downloads_are_written_atomically(tmp_path, image_server, monkeypatch):
+    manager = make_manager(tmp_path / "backgrounds", image_server)
+    replaced = []
+    real_replace = os.replace
+
+    def recording_replace(src, dst):
+        with open(src, "rb") as f:
+            replaced.append((os.path.dirname(src), os.path.exists(dst), f.read(), dst))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", recording_replace)
+    path = BackgroundPrefetcher(manager, retries=1).prefetch(["sky"])["sky"]
+    # The image only appears under its final name once it is complete, by a rename within the directory.
+    assert replaced == [(manager.directory, False, IMAGES["sky.jpg"], path)]
+    assert [name for name in os.listdir(manager.directory) if name.endswith(".part")] == []
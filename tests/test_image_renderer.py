@@ -0,0 +1,29 @@
+from PIL import Image
+import pytest
+
+import image_renderer
+from image_renderer import export_renditions
+from pipeline import render_poem
+from tiled_renderer import TILED_MIN_PIXELS
+
+def test_png_output_is_the_full_rendition(tmp_path, monkeypatch):
+    encoded = []
+    real_encode = image_renderer._encode
+
+    def recording_encode(img, spec, path):
+        encoded.append(path)
+        return real_encode(img, spec, path)
+
+    monkeypatch.setattr(image_renderer, "_encode", recording_encode)
+    output = str(tmp_path / "art.png")
+    exported = dict(export_renditions(Image.new("RGB", (600, 400), (200, 80, 40)), str(tmp_path / "art"), ["full", "thumb_256"], output_path=output))
+    assert exported == {"output": output, "full": output, "thumb_256": str(tmp_path / "art_thumb_256.jpg")}
+    assert encoded == [exported["thumb_256"]]
+    assert Image.open(output).size == (600, 400)
+
+def test_tiled_render_rejects_full_size_renditions(tmp_path):
+    side = int(TILED_MIN_PIXELS ** 0.5) + 1
+    output = tmp_path / "print.png"
+    with pytest.raises(ValueError, match="webp"):
+        render_poem("The bright sun warms the quiet sky", str(output), size=(side, side), renditions=["full", "webp", "thumb_256"])
+    assert not output.exists()
@@ -0,0 +1,27 @@
+import pytest
+
+from keyword_matcher import KeywordMatcher, plural
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher(["sun", "win", "run", "past", "dim", "war", "sky", "kiss", "go"])
+
+def test_matches_words_and_their_plurals(matcher):
+    assert matcher.find("suns") == {"sun"}
+    assert matcher.find("the sun rises") == {"sun"}
+    assert matcher.find("grey skies") == {"sky"}
+    assert matcher.find("stolen kisses") == {"kiss"}
+    assert matcher.find("time goes by") == {"go"}
+
+def test_ignores_longer_words_and_other_plurals(matcher):
+    assert matcher.find("sunday") == frozenset()
+    assert matcher.find("sunlight") == frozenset()
+    assert matcher.find("good") == frozenset()
+    assert matcher.find("wines runes pastes dimes wares") == frozenset()
+
+@pytest.mark.parametrize("word, expected", [
+    ("star", "stars"), ("kiss", "kisses"), ("box", "boxes"), ("wish", "wishes"),
+    ("sky", "skies"), ("day", "days"), ("go", "goes"), ("shadow", "shadows")
+])
+def test_plural(word, expected):
+    assert plural(word) == expected
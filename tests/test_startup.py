@@ -0,0 +1,6 @@
+from startup import STARTUP_BUDGETS_MS, check_budgets
+
+def test_entry_points_start_within_budget():
+    over = [(result["module"], result["import_ms"], result["budget_ms"], result["heaviest"][:3])
+            for result in check_budgets(STARTUP_BUDGETS_MS, runs=3) if result["over_budget"]]
+    assert over == []
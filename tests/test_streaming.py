@@ -0,0 +1,38 @@
+import json
+import os
+
+from streaming import iter_poems, run_stream
+
+def test_non_object_json_lines_are_malformed(tmp_path):
+    source = tmp_path / "poems.jsonl"
+    source.write_text('{"id": "a", "text": "sun"}\n[1, 2]\n42\nnull\n"moon"\n', encoding="utf-8")
+    assert list(iter_poems(str(source))) == [("a", "sun"), ("2", ""), ("3", ""), ("4", ""), ("5", "moon")]
+
+def test_directory_poems_come_in_name_order(tmp_path):
+    for name in ["c.txt", "a.txt", "b.txt", "notes.md"]:
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    assert [poem_id for poem_id, _ in iter_poems(str(tmp_path))] == ["a.txt", "b.txt", "c.txt"]
+    assert [poem_id for poem_id, _ in iter_poems(str(tmp_path), skip=1)] == ["b.txt", "c.txt"]
+
+def test_resume_without_output_starts_over(tmp_path):
+    source = tmp_path / "poems.jsonl"
+    source.write_text("".join(json.dumps({"id": str(i), "text": "the bright sun"}) + "\n" for i in range(5)), encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+    run_stream(str(source), str(output), chunk_size=2)
+    os.remove(output)
+    summary = run_stream(str(source), str(output), chunk_size=2, resume=True)
+    data = output.read_bytes()
+    assert b"\0" not in data
+    assert [json.loads(line)["id"] for line in data.decode("utf-8").splitlines()] == ["0", "1", "2", "3", "4"]
+    assert summary["analyzed"] == summary["total"] == 5
+
+def test_resume_continues_after_checkpoint(tmp_path):
+    source = tmp_path / "poems.jsonl"
+    lines = [json.dumps({"id": str(i), "text": "the bright sun"}) + "\n" for i in range(5)]
+    source.write_text("".join(lines[:3]), encoding="utf-8")
+    output = tmp_path / "out.jsonl"
+    run_stream(str(source), str(output), chunk_size=2)
+    source.write_text("".join(lines), encoding="utf-8")
+    summary = run_stream(str(source), str(output), chunk_size=2, resume=True)
+    assert summary["analyzed"] == 2
+    assert [json.loads(line)["id"] for line in output.read_text(encoding="utf-8").splitlines()] == ["0", "1", "2", "3", "4"]